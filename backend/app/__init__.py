@@ -6,11 +6,20 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from config import Config
+from app.cache import ResponseCache
+from app.ratelimit import RateLimiter
+from app.json_provider import init_json_provider
+from app.database import prepare_engine_options, register_sqlite_pragmas
+from app.replicas import RoutingSession, init_replicas
+from app.metrics import init_metrics
 
 # Inicialización de extensiones
-db = SQLAlchemy()
+# La sesión enruta los SELECT de los GET a la réplica de lectura si está configurada
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
+response_cache = ResponseCache()
+rate_limiter = RateLimiter()
 
 def create_app(config_class=Config):
     """
@@ -18,6 +27,8 @@ def create_app(config_class=Config):
     """
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(config_class)
+    # Serialización JSON (orjson si está disponible, fechas en ISO 8601)
+    init_json_provider(app)
 
     # --- INICIO DE LA MODIFICACIÓN ---
     # Define los orígenes permitidos (tu frontend en producción y en desarrollo local)
@@ -28,17 +39,38 @@ def create_app(config_class=Config):
     ]
 
     # Configura CORS para permitir peticiones solo desde los orígenes definidos
-    CORS(app, resources={r"/api/*": {"origins": origins}})
+    # X-Next-Cursor y ETag se exponen para que el frontend pueda paginar y revalidar
+    CORS(app, resources={r"/api/*": {"origins": origins}}, expose_headers=["X-Next-Cursor", "ETag"])
     # --- FIN DE LA MODIFICACIÓN ---
 
     # Inicializar extensiones con la app
+    prepare_engine_options(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    # Autogenerate ignora las tablas FTS5 y los índices GIN de la búsqueda (app/search.py)
+    from app.search import include_object
+    migrate.init_app(app, db, include_object=include_object)
     jwt.init_app(app)
+    response_cache.init_app(app)
+    rate_limiter.init_app(app)
+    init_replicas(app, response_cache)
 
     with app.app_context():
+        for engine in db.engines.values():
+            register_sqlite_pragmas(app, engine)
+        # Latencia, consultas SQL y N+1 por endpoint (/api/_metrics)
+        init_metrics(app, db.engines.values())
+
         # Importar modelos para que Alembic (Migrate) los detecte
-        from .models import user, account, income, loan, service, service_payment, loan_payment, scheduled_income
+        from .models import user, account, income, loan, service, service_payment, loan_payment, scheduled_income, monthly_rollup, resource_version, revoked_token
+
+        # Usuario de cada petición (current_user) con caché y revocación de tokens
+        from .principal import init_principal
+        init_principal(app)
+        # Hash de contraseñas en un pool acotado y certificados de Google en caché
+        from .passwords import init_passwords
+        from .google_auth import init_google_auth
+        init_passwords(app)
+        init_google_auth(app)
 
         # --- Registrar Blueprints de la API ---
         # Importa todos los blueprints que has creado
@@ -50,6 +82,11 @@ def create_app(config_class=Config):
         from .routes.service_payments import service_payments_bp
         from .routes.loan_payments import loan_payments_bp
         from .routes.scheduled_incomes import scheduled_incomes_bp
+        from .routes.summary import summary_bp
+        from .routes.export import export_bp
+        from .routes.imports import import_bp
+        from .routes.forecast import forecast_bp
+        from .routes.monitoring import monitoring_bp
 
         # Registra cada blueprint con un prefijo de URL
         app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -60,5 +97,18 @@ def create_app(config_class=Config):
         app.register_blueprint(service_payments_bp, url_prefix='/api/service_payments')
         app.register_blueprint(loan_payments_bp, url_prefix='/api/loan_payments')
         app.register_blueprint(scheduled_incomes_bp, url_prefix='/api/scheduled_incomes')
+        app.register_blueprint(summary_bp, url_prefix='/api/summary')
+        app.register_blueprint(export_bp, url_prefix='/api/export')
+        app.register_blueprint(import_bp, url_prefix='/api/import')
+        app.register_blueprint(forecast_bp, url_prefix='/api/forecast')
+        app.register_blueprint(monitoring_bp, url_prefix='/api')
+
+        # Comandos de la CLI (flask rebuild-rollups, ...)
+        from .commands import register_commands
+        register_commands(app)
+
+    # Procesador de ingresos programados en segundo plano (desactivado con intervalo 0)
+    from .scheduler import start_scheduler
+    start_scheduler(app)
 
-        return app
\ No newline at end of file
+    return app
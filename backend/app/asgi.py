@@ -0,0 +1,302 @@
+# Modo ASGI opcional (asgi.py, GUNICORN_ASGI=1 con el worker 'asgi' de gunicorn).
+# Los GET de listados se atienden en el bucle de eventos con un motor asíncrono de SQLAlchemy
+# (aiosqlite / asyncpg) sobre las mismas tablas y la misma lógica que la app Flask: contexto de
+# petición de Flask, JWT, ETag y caché de respuestas, métricas y CORS. Mientras una petición
+# espera a la BD el worker atiende otras, sin un hilo por conexión. El resto de la API (escrituras,
+# auth, resumen, export...) sigue siendo la app Flask síncrona, ejecutada en un pool de hilos.
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app, jsonify, request
+from flask_jwt_extended import decode_token, get_jwt_identity, verify_jwt_in_request
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt import PyJWTError
+from sqlalchemy.engine import make_url
+from werkzeug.exceptions import ClientDisconnected
+
+from app.controllers import versions
+from app.database import register_sqlite_pragmas
+from app.metrics import instrument_engine
+from app.principal import user_query
+from app.replicas import REPLICA_BIND, use_replica
+from app.routes.caching import cached_lookup, store_response
+from app.routes.pagination import ListQuery
+from app.schemas import (ACCOUNT_SCHEMA, INCOME_SCHEMA, LOAN_PAYMENT_SCHEMA, LOAN_SCHEMA,
+                         SCHEDULED_INCOME_SCHEMA, SERVICE_PAYMENT_SCHEMA, SERVICE_SCHEMA)
+
+ASYNC_DRIVERS = {'sqlite': 'aiosqlite', 'postgresql': 'asyncpg'}
+
+# Listados servidos de forma asíncrona: endpoint de Flask -> (esquema, campo de fecha)
+ASYNC_LISTS = {
+    'accounts_bp.get_accounts': (ACCOUNT_SCHEMA, None),
+    'incomes_bp.get_incomes': (INCOME_SCHEMA, 'income_date'),
+    'services_bp.get_services': (SERVICE_SCHEMA, 'date'),
+    'loans_bp.get_loans': (LOAN_SCHEMA, 'date'),
+    'service_payments_bp.get_service_payments': (SERVICE_PAYMENT_SCHEMA, 'date'),
+    'loan_payments_bp.get_loan_payments': (LOAN_PAYMENT_SCHEMA, 'date'),
+    'scheduled_incomes_bp.get_scheduled_incomes': (SCHEDULED_INCOME_SCHEMA, 'income_date'),
+}
+
+
+def async_url(url):
+    """
+    'sqlite:///x.db' -> 'sqlite+aiosqlite:///x.db', 'postgresql+psycopg2://...' -> 'postgresql+asyncpg://...'.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'No hay driver asíncrono para {backend}: configurar ASYNC_DATABASE_URI')
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}')
+
+
+class AsyncDatabase:
+    """
+    Motores asíncronos equivalentes a los de Flask-SQLAlchemy: la primaria y, si está
+    configurada, la réplica de lectura. Mismas opciones de pool, pragmas y métricas.
+    """
+
+    def __init__(self, app):
+        try:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+            self.engine = create_async_engine(
+                app.config.get('ASYNC_DATABASE_URI') or async_url(app.config['SQLALCHEMY_DATABASE_URI']), **options
+            )
+            replica = (app.config.get('SQLALCHEMY_BINDS') or {}).get(REPLICA_BIND)
+            if isinstance(replica, dict):
+                replica = replica['url']
+            self.replica = create_async_engine(async_url(replica), **options) if replica else None
+        except ImportError as e:
+            raise RuntimeError(f'El modo ASGI requiere el driver asíncrono de la BD ({e.name})')
+        for engine in (self.engine, self.replica):
+            if engine is not None:
+                register_sqlite_pragmas(app, engine.sync_engine)
+                if 'metrics' in app.extensions:
+                    instrument_engine(engine.sync_engine)
+
+    def for_request(self):
+        # Mismo criterio que RoutingSession: GET a la réplica salvo tras una escritura del usuario
+        return self.replica if self.replica is not None and use_replica() else self.engine
+
+    async def fetch_all(self, stmt):
+        async with self.engine.connect() as conn:
+            return (await conn.execute(stmt)).all()
+
+    async def dispose(self):
+        for engine in (self.engine, self.replica):
+            if engine is not None:
+                await engine.dispose()
+
+
+class AsyncReadApp:
+    """
+    Aplicación ASGI sobre la app Flask: los GET de ASYNC_LISTS van por la ruta asíncrona
+    y todo lo demás a la app WSGI en un pool de ASGI_SYNC_THREADS hilos.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.db = AsyncDatabase(flask_app)
+        self._executor = ThreadPoolExecutor(flask_app.config.get('ASGI_SYNC_THREADS', 4), thread_name_prefix='asgi-wsgi')
+        # Ruta exacta -> listado (una URL sin la barra final la redirige Flask)
+        self._routes = {
+            rule.rule: ASYNC_LISTS[rule.endpoint]
+            for rule in flask_app.url_map.iter_rules() if rule.endpoint in ASYNC_LISTS
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            route = self._routes.get(scope['path']) if scope['method'] == 'GET' else None
+            if route is None:
+                await self._call_wsgi(scope, receive, send)
+            else:
+                await self._call_async(scope, send, *route)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.db.dispose()
+                self._executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _call_async(self, scope, send, schema, date_field):
+        # Mismo ciclo que Flask.full_dispatch_request, con la vista esperada en el bucle. El
+        # contexto de Flask vive en contextvars, así que cada tarea tiene el suyo
+        app = self.flask_app
+        ctx = app.request_context(_environ(scope, io.BytesIO()))
+        error = None
+        ctx.push()
+        try:
+            try:
+                try:
+                    rv = app.preprocess_request()
+                    if rv is None:
+                        rv = await self._list(schema, date_field)
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+                response = app.finalize_request(rv)
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            await send({'type': 'http.response.start', 'status': response.status_code,
+                        'headers': _encode_headers(response.headers.items())})
+            await send({'type': 'http.response.body', 'body': response.get_data()})
+        finally:
+            ctx.pop(error)
+
+    async def _list(self, schema, date_field):
+        # Equivalente asíncrono de @jwt_required + list_response
+        await self._authenticate()
+        user_id = get_jwt_identity()
+        resource = schema.model.__tablename__
+        async with self.db.for_request().connect() as conn:
+            version = (await conn.execute(versions.current_query(user_id, resource))).scalar() or 0
+            response = cached_lookup(user_id, resource, version)
+            if response is not None:
+                return response
+            try:
+                query = ListQuery(schema, user_id, date_field)
+            except ValueError as e:
+                return jsonify({'msg': str(e)}), 400
+            rows = (await conn.execute(query.statement)).all()
+        return store_response(query.response(rows), user_id, resource, version)
+
+    async def _authenticate(self):
+        # verify_jwt_in_request consulta la BD al sincronizar las revocaciones y con el usuario
+        # fuera de la caché: se precargan aquí con el motor asíncrono y la verificación es la misma
+        revoked = current_app.extensions['revoked_tokens']
+        if revoked.stale():
+            revoked.apply(await self.db.fetch_all(revoked.pending_query()))
+        users = current_app.extensions['user_cache']
+        identity = _token_identity()
+        if identity is not None and users.cached(identity) is None:
+            rows = await self.db.fetch_all(user_query(identity))
+            users.store(identity, rows[0] if rows else None)
+        verify_jwt_in_request()
+
+    async def _call_wsgi(self, scope, receive, send):
+        # El cuerpo no se junta antes: la app lo lee del stream a medida que lo necesita (el import
+        # de CSV procesa el archivo por lotes con memoria acotada)
+        loop = asyncio.get_running_loop()
+        body = io.BufferedReader(_ReceiveStream(receive, loop))
+        await loop.run_in_executor(self._executor, self._run_wsgi, _environ(scope, body), send, loop)
+
+    def _run_wsgi(self, environ, send, loop):
+        # En un hilo del pool: las respuestas en streaming (export) se envían trozo a trozo
+        start = {}
+
+        def start_response(status, headers, exc_info=None):
+            start.update(type='http.response.start', status=int(status.split(' ', 1)[0]),
+                         headers=_encode_headers(headers))
+
+        def emit(message):
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        result = self.flask_app(environ, start_response)
+        try:
+            started = False
+            for chunk in result:
+                if not chunk:
+                    continue
+                if not started:
+                    emit(start)
+                    started = True
+                emit({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            if not started:
+                emit(start)
+            emit({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+class _ReceiveStream(io.RawIOBase):
+    """
+    wsgi.input que pide los mensajes http.request del cuerpo al bucle de eventos desde el hilo
+    del pool que ejecuta la app WSGI, solo cuando esta lee.
+    """
+
+    def __init__(self, receive, loop):
+        self._receive = receive
+        self._loop = loop
+        self._chunk = memoryview(b'')
+        self._done = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._chunk and not self._done:
+            message = asyncio.run_coroutine_threadsafe(self._receive(), self._loop).result()
+            if message['type'] == 'http.disconnect':
+                self._done = True
+                raise ClientDisconnected()
+            self._chunk = memoryview(message.get('body', b''))
+            self._done = not message.get('more_body', False)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+def _token_identity():
+    # Solo para precargar el usuario: si falta el token o no es válido, verify_jwt_in_request da el error
+    header = request.headers.get(current_app.config['JWT_HEADER_NAME'], '')
+    try:
+        return decode_token(header.split()[-1])[current_app.config['JWT_IDENTITY_CLAIM']]
+    except (IndexError, KeyError, PyJWTError, JWTExtendedException):
+        return None
+
+
+def _encode_headers(headers):
+    return [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers]
+
+
+def _environ(scope, body):
+    """
+    Entorno WSGI a partir del scope HTTP de ASGI; `body` es el stream del cuerpo.
+    """
+    root_path = scope.get('root_path', '')
+    path = scope['path']
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': root_path.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        # El stream termina con el último mensaje del cuerpo: werkzeug puede leerlo aunque no
+        # venga Content-Length (cuerpo chunked)
+        'wsgi.input_terminated': True,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = scope['client'][0], str(scope['client'][1])
+    for raw_name, raw_value in scope['headers']:
+        name, value = raw_name.decode('latin-1'), raw_value.decode('latin-1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
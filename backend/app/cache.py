@@ -0,0 +1,184 @@
+# Caché de respuestas JSON por usuario con backends intercambiables.
+# Las entradas se agrupan por "<user_id>:<recurso>" para invalidar exactamente las
+# respuestas afectadas por una escritura.
+import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+
+class MemoryCacheBackend:
+    """
+    LRU en memoria del proceso con TTL, número máximo de entradas y tamaño total máximo
+    (suma de los tamaños que indica `set`).
+    """
+
+    def __init__(self, max_entries=2048, ttl=300, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict()  # key -> (expira, grupo, valor, tamaño)
+        self._groups = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        _, group, _, size = self._entries.pop(key)
+        self.bytes -= size
+        keys = self._groups.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, group, size=0):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, group, value, size)
+            self.bytes += size
+            self._groups[group].add(key)
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, group):
+        with self._lock:
+            keys = self._groups.pop(group, set())
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self.bytes -= entry[3]
+            return len(keys)
+
+    def size(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Backend para un servidor compatible con Redis (cualquier cliente con la API de redis-py).
+    Cada grupo es un SET con sus claves; el TTL lo aplica el servidor.
+    """
+    evictions = 0
+
+    def __init__(self, client, ttl=300, prefix='rc:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, group, size=0):
+        group_key = self.prefix + 'group:' + group
+        pipe = self.client.pipeline()
+        pipe.setex(self.prefix + key, self.ttl, json.dumps(value))
+        pipe.sadd(group_key, key)
+        pipe.expire(group_key, self.ttl)
+        pipe.execute()
+
+    def invalidate(self, group):
+        group_key = self.prefix + 'group:' + group
+        keys = self.client.smembers(group_key)
+        names = [self.prefix + (k.decode() if isinstance(k, bytes) else k) for k in keys]
+        self.client.delete(group_key, *names)
+        return len(names)
+
+    def size(self):
+        return None
+
+
+class ResponseCache:
+    """
+    Extensión de Flask (init_app) con contadores de aciertos, fallos, desalojos e invalidaciones.
+    RESPONSE_CACHE_BACKEND: 'memory' (por defecto), 'redis' (RESPONSE_CACHE_URL) o 'none'.
+    Los cuerpos de más de RESPONSE_CACHE_MAX_ENTRY_BYTES (p. ej. un listado sin limit con todo
+    el historial) no se guardan; en memoria el total se limita a RESPONSE_CACHE_MAX_BYTES.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.max_entry_bytes = None
+        self.too_large = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        kind = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        ttl = app.config.get('RESPONSE_CACHE_TTL', 300)
+        if kind == 'memory':
+            self.backend = MemoryCacheBackend(app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 2048), ttl,
+                                              app.config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        elif kind == 'redis':
+            # RESPONSE_CACHE_CLIENT permite inyectar un cliente compatible (p. ej. fakeredis en local)
+            client = app.config.get('RESPONSE_CACHE_CLIENT')
+            if client is None:
+                try:
+                    import redis
+                except ImportError:
+                    raise RuntimeError("RESPONSE_CACHE_BACKEND='redis' requiere el paquete redis")
+                client = redis.Redis.from_url(app.config['RESPONSE_CACHE_URL'])
+            self.backend = RedisCacheBackend(client, ttl)
+        elif kind == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f'RESPONSE_CACHE_BACKEND desconocido: {kind}')
+        self.max_entry_bytes = app.config.get('RESPONSE_CACHE_MAX_ENTRY_BYTES', 1024 * 1024)
+        app.extensions['response_cache'] = self
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def get(self, key, version):
+        """
+        Devuelve (cuerpo, cabeceras) si hay una entrada generada con `version`, si no None.
+        """
+        entry = self.backend.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def set(self, key, version, body, headers, group):
+        size = len(body)
+        if self.max_entry_bytes is not None and size > self.max_entry_bytes:
+            self.too_large += 1
+            return
+        self.backend.set(key, (version, body, headers), group, size)
+
+    def invalidate(self, groups):
+        if self.enabled:
+            for group in groups:
+                self.invalidations += self.backend.invalidate(group)
+
+    def stats(self):
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.backend.evictions if self.backend else 0,
+            'invalidations': self.invalidations,
+            'size': self.backend.size() if self.backend else 0,
+            'bytes': getattr(self.backend, 'bytes', None),
+            'too_large': self.too_large,
+        }
@@ -0,0 +1,75 @@
+# Comandos de la CLI de Flask (`flask <comando>`)
+import click
+
+from app import db
+
+
+@click.command('rebuild-rollups')
+@click.option('--user-id', type=int, default=None, help='Solo este usuario (por defecto todos).')
+def rebuild_rollups_command(user_id):
+    """Reconstruye la tabla monthly_rollups desde ingresos y pagos."""
+    from app.controllers import rollups
+
+    rollups.rebuild(user_id)
+    db.session.commit()
+    click.echo('Rollups reconstruidos' + (f' para el usuario {user_id}' if user_id else ''))
+
+
+@click.command('process-scheduled')
+@click.option('--batch-size', type=int, default=None, help='Filas por transacción (por defecto SCHEDULED_BATCH_SIZE).')
+@click.option('--now', 'now', type=click.DateTime(), default=None, help='Fecha de corte (por defecto ahora).')
+def process_scheduled_command(batch_size, now):
+    """Registra los ingresos programados vencidos y avanza su próxima fecha."""
+    from flask import current_app
+    from app.controllers.scheduled import process_due
+
+    config = current_app.config
+    stats = process_due(now, batch_size or config['SCHEDULED_BATCH_SIZE'], config['SCHEDULED_LEASE_SECONDS'])
+    click.echo(f"{stats['incomes']} ingresos creados desde {stats['scheduled']} programados en {stats['batches']} lotes")
+
+
+@click.command('sync-replica')
+def sync_replica_command():
+    """Copia la BD primaria sobre la réplica (solo SQLite, para probar la réplica en local)."""
+    from app.replicas import REPLICA_BIND
+
+    if REPLICA_BIND not in db.engines:
+        raise click.ClickException('No hay réplica configurada (DATABASE_REPLICA_URL)')
+    primary, replica = db.engines[None], db.engines[REPLICA_BIND]
+    if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+        raise click.ClickException('sync-replica solo copia bases SQLite; en PostgreSQL usar la replicación del servidor')
+    with primary.raw_connection() as source, replica.raw_connection() as target:
+        source.driver_connection.backup(target.driver_connection)
+    click.echo('Réplica sincronizada')
+
+
+@click.command('seed')
+@click.option('--users', type=int, default=100, show_default=True, help='Usuarios a crear.')
+@click.option('--years', type=int, default=3, show_default=True, help='Años de movimientos por usuario.')
+@click.option('--seed', 'seed_value', type=int, default=42, show_default=True, help='Semilla (misma semilla = mismos datos).')
+@click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Último día de los datos (por defecto hoy; fijarlo para datos idénticos entre días).')
+@click.option('--batch-rows', type=int, default=100_000, show_default=True, help='Filas por lote y commit.')
+@click.option('--password', default='password', show_default=True, help='Contraseña de todos los usuarios.')
+def seed_command(users, years, seed_value, end, batch_rows, password):
+    """Genera usuarios con cuentas, ingresos, servicios, préstamos, pagos e ingresos programados."""
+    import time
+    from app.controllers.synthetic import generate
+
+    started = time.perf_counter()
+
+    def progress(done, rows):
+        elapsed = time.perf_counter() - started
+        click.echo(f'{done}/{users} usuarios, {rows} filas ({rows / elapsed:,.0f} filas/s)')
+
+    totals = generate(users, years, seed_value, end.date() if end else None, batch_rows, password, progress)
+    for table, count in totals.items():
+        click.echo(f'  {table}: {count}')
+    click.echo(f'{sum(totals.values())} filas en {time.perf_counter() - started:.1f} s')
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_rollups_command)
+    app.cli.add_command(process_scheduled_command)
+    app.cli.add_command(sync_replica_command)
+    app.cli.add_command(seed_command)
@@ -0,0 +1,207 @@
+# Motor de amortización (sistema francés: cuota constante) para los préstamos.
+# La tasa mensual sale de la TEA (en %, como la carga el frontend) y el número de cuotas de
+# `quota` o, si no está, de los meses entre `date` y `expiration_date`.
+# Con NumPy todos los préstamos se calculan a la vez sobre una matriz préstamos x períodos;
+# sin NumPy se usa el mismo cálculo período a período en Python.
+from datetime import date, timedelta
+
+from app import db
+from app.controllers.scheduled import add_months
+from app.models import LoanPayment
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional
+    np = None
+
+# Tolerancia para considerar una cuota pagada (redondeo a centavos)
+EPSILON = 0.005
+
+# Tope de cuotas por préstamo (100 años): acota la matriz ante un `quota` mal cargado
+MAX_INSTALLMENTS = 1200
+
+SCHEDULE_FIELDS = ['period', 'due_date', 'payment', 'interest', 'principal', 'balance', 'paid', 'status']
+
+
+def monthly_rate(tea):
+    # El esquema rechaza TEA negativas; las guardadas antes se tratan como 0 (con tea <= -100
+    # la tasa sería -1 o un número complejo)
+    return (1 + max(tea or 0, 0) / 100) ** (1 / 12) - 1
+
+
+def installments(loan):
+    if loan.quota and loan.quota > 0:
+        return min(loan.quota, MAX_INSTALLMENTS)
+    months = (loan.expiration_date.year - loan.date.year) * 12 + loan.expiration_date.month - loan.date.month
+    return min(max(months, 1), MAX_INSTALLMENTS)
+
+
+def paid_by_loan(loan_ids, as_of):
+    """
+    Suma de los LoanPayment de cada préstamo hasta `as_of` (usa el índice de loan_id).
+    """
+    if not loan_ids:
+        return {}
+    rows = db.session.execute(
+        db.select(LoanPayment.loan_id, db.func.sum(LoanPayment.amount))
+        .where(LoanPayment.loan_id.in_(loan_ids), LoanPayment.date < as_of + timedelta(days=1))
+        .group_by(LoanPayment.loan_id)
+    )
+    return {loan_id: total or 0 for loan_id, total in rows}
+
+
+def _status(due, paid, payment, as_of):
+    if paid >= payment - EPSILON:
+        return 'pagada'
+    if due <= as_of:
+        return 'vencida'
+    return 'parcial' if paid > 0 else 'pendiente'
+
+
+def _compute_python(loans, paid, as_of, include_schedule):
+    results = []
+    for loan in loans:
+        principal, rate, periods = float(loan.price), monthly_rate(loan.tea), installments(loan)
+        payment = principal * rate / (1 - (1 + rate) ** -periods) if rate > 0 else principal / periods
+        balance, remaining_paid = principal, float(paid.get(loan.id, 0))
+        columns = {f: [] for f in SCHEDULE_FIELDS}
+        for period in range(1, periods + 1):
+            interest = balance * rate
+            balance = 0.0 if period == periods else balance - (payment - interest)
+            covered = min(max(remaining_paid, 0.0), payment)
+            remaining_paid -= payment
+            due = add_months(loan.date, period, loan.date.day)
+            values = (period, due, payment, interest, payment - interest, balance, covered, _status(due, covered, payment, as_of))
+            for field, value in zip(SCHEDULE_FIELDS, values):
+                columns[field].append(value)
+        statuses = columns['status']
+        stats = {
+            'rate': rate,
+            'payment': payment,
+            'total_interest': sum(columns['interest']),
+            'expected': sum(p for p, d in zip(columns['payment'], columns['due_date']) if d <= as_of),
+            'overdue': statuses.count('vencida'),
+            'next_due': next((d for d, st in zip(columns['due_date'], statuses) if st != 'pagada'), None),
+        }
+        results.append((loan, stats, columns if include_schedule else None))
+    return results
+
+
+def _compute_numpy(loans, paid, as_of, include_schedule):
+    principal = np.array([loan.price for loan in loans], dtype=float)
+    rate = np.array([monthly_rate(loan.tea) for loan in loans])
+    periods = np.array([installments(loan) for loan in loans])
+    start = np.array([loan.date for loan in loans], dtype='datetime64[M]')
+    anchor = np.array([loan.date.day for loan in loans])
+    paid_total = np.array([float(paid.get(loan.id, 0)) for loan in loans])
+
+    k = np.arange(1, periods.max() + 1)
+    mask = k <= periods[:, None]
+    growth = (1 + rate[:, None]) ** k
+    interest_free = rate == 0
+    safe_rate = np.where(interest_free, 1.0, rate)
+    payment = np.where(interest_free, principal / periods, principal * safe_rate / (1 - (1 + safe_rate) ** -periods))
+
+    # Saldo tras cada cuota: P(1+r)^k - C((1+r)^k - 1)/r, o P - Ck sin interés
+    balance = np.where(
+        interest_free[:, None],
+        principal[:, None] - payment[:, None] * k,
+        principal[:, None] * growth - payment[:, None] * (growth - 1) / safe_rate[:, None],
+    )
+    balance[k >= periods[:, None]] = 0.0
+    previous = np.hstack([principal[:, None], balance[:, :-1]])
+    interest = np.where(mask, previous * rate[:, None], 0.0)
+    payments = np.where(mask, payment[:, None], 0.0)
+
+    # Los pagos registrados cubren las cuotas en orden
+    due_before = np.cumsum(payments, axis=1) - payments
+    covered = np.where(mask, np.clip(paid_total[:, None] - due_before, 0, payments), 0.0)
+
+    months = start[:, None] + k
+    days_in_month = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(int)
+    due = months.astype('datetime64[D]') + (np.minimum(anchor[:, None], days_in_month) - 1)
+    settled = covered >= payments - EPSILON
+    is_due = mask & (due <= np.datetime64(as_of))
+    overdue = ~settled & is_due
+    open_installments = mask & ~settled
+    next_index = np.argmax(open_installments, axis=1)
+    has_next = open_installments.any(axis=1)
+
+    expected = np.where(is_due, payments, 0.0).sum(axis=1)
+    total_interest = interest.sum(axis=1)
+    overdue_count = overdue.sum(axis=1)
+    if include_schedule:
+        status = np.where(settled, 'pagada', np.where(overdue, 'vencida', np.where(covered > 0, 'parcial', 'pendiente')))
+
+    results = []
+    for i, loan in enumerate(loans):
+        stats = {
+            'rate': rate[i],
+            'payment': payment[i],
+            'total_interest': total_interest[i],
+            'expected': expected[i],
+            'overdue': int(overdue_count[i]),
+            'next_due': due[i, next_index[i]].item() if has_next[i] else None,
+        }
+        columns = None
+        if include_schedule:
+            n = periods[i]
+            columns = {
+                'period': k[:n].tolist(),
+                'due_date': due[i, :n].tolist(),
+                'payment': payments[i, :n].tolist(),
+                'interest': interest[i, :n].tolist(),
+                'principal': (payments[i, :n] - interest[i, :n]).tolist(),
+                'balance': balance[i, :n].tolist(),
+                'paid': covered[i, :n].tolist(),
+                'status': status[i, :n].tolist(),
+            }
+        results.append((loan, stats, columns))
+    return results
+
+
+def _summary(loan, stats, paid):
+    total_paid = float(paid.get(loan.id, 0))
+    return {
+        'loan_id': loan.id,
+        'loan_name': loan.loan_name,
+        'installments': installments(loan),
+        'monthly_rate': round(float(stats['rate']), 6),
+        'payment': round(float(stats['payment']), 2),
+        'total_interest': round(float(stats['total_interest']), 2),
+        'paid': round(total_paid, 2),
+        'expected_to_date': round(float(stats['expected']), 2),
+        'arrears': round(max(float(stats['expected']) - total_paid, 0.0), 2),
+        'overdue_installments': stats['overdue'],
+        'next_due_date': stats['next_due'],
+    }
+
+
+def _rows(columns):
+    rows = []
+    for values in zip(*(columns[f] for f in SCHEDULE_FIELDS)):
+        row = dict(zip(SCHEDULE_FIELDS, values))
+        for field in ('payment', 'interest', 'principal', 'balance', 'paid'):
+            row[field] = round(row[field], 2)
+        rows.append(row)
+    return rows
+
+
+def schedules(loans, as_of=None, include_schedule=True):
+    """
+    Calcula en un solo lote el cronograma de `loans` y lo concilia con sus LoanPayment hasta
+    `as_of` (hoy por defecto): cuotas pagadas, vencidas sin cubrir y monto en mora.
+    """
+    as_of = as_of or date.today()
+    loans = list(loans)
+    if not loans:
+        return []
+    paid = paid_by_loan([loan.id for loan in loans], as_of)
+    compute = _compute_numpy if np is not None else _compute_python
+    results = []
+    for loan, stats, columns in compute(loans, paid, as_of, include_schedule):
+        result = _summary(loan, stats, paid)
+        if include_schedule:
+            result['schedule'] = _rows(columns)
+        results.append(result)
+    return results
@@ -0,0 +1,47 @@
+# Lectura por lotes del libro completo del usuario (ingresos, pagos de servicios y de préstamos)
+from datetime import timedelta
+
+from app import db
+from app.models import Income, Loan, LoanPayment, Service, ServicePayment
+
+EXPORT_FIELDS = ['kind', 'id', 'date', 'name', 'category', 'description', 'amount', 'account_id', 'parent_id']
+
+
+def _statement(kind):
+    """
+    SELECT con las columnas de EXPORT_FIELDS para cada tipo, más la columna de fecha,
+    la de cuenta y la de usuario para poder filtrar.
+    """
+    if kind == 'incomes':
+        columns = (Income.id, Income.income_date, Income.income_name, Income.category, Income.description,
+                   Income.amount, Income.account_id, db.null())
+        return db.select(*columns), Income.income_date, Income.account_id, Income.user_id
+    if kind == 'service_payments':
+        columns = (ServicePayment.id, ServicePayment.date, Service.service_name, Service.category,
+                   ServicePayment.description, ServicePayment.amount, Service.account_id, ServicePayment.service_id)
+        stmt = db.select(*columns).join(Service, ServicePayment.service_id == Service.id)
+        return stmt, ServicePayment.date, Service.account_id, ServicePayment.user_id
+    columns = (LoanPayment.id, LoanPayment.date, Loan.loan_name, db.null(), LoanPayment.description,
+               LoanPayment.amount, Loan.account_id, LoanPayment.loan_id)
+    stmt = db.select(*columns).join(Loan, LoanPayment.loan_id == Loan.id)
+    return stmt, LoanPayment.date, Loan.account_id, LoanPayment.user_id
+
+
+def iter_ledger(user_id, date_from=None, date_to=None, account_id=None, batch_size=1000):
+    """
+    Genera lotes de tuplas (en el orden de EXPORT_FIELDS) con `yield_per`, de modo que la
+    memoria no depende del número de filas. Cada tipo se recorre por (fecha, id).
+    """
+    for kind in ('incomes', 'service_payments', 'loan_payments'):
+        stmt, date_column, account_column, owner = _statement(kind)
+        stmt = stmt.where(owner == user_id)
+        if date_from:
+            stmt = stmt.where(date_column >= date_from)
+        if date_to:
+            stmt = stmt.where(date_column < date_to + timedelta(days=1))
+        if account_id is not None:
+            stmt = stmt.where(account_column == account_id)
+        stmt = stmt.order_by(date_column, stmt.selected_columns[0]).execution_options(yield_per=batch_size)
+
+        for partition in db.session.execute(stmt).partitions():
+            yield [(kind, *row) for row in partition]
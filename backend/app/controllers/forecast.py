@@ -0,0 +1,147 @@
+# Proyección de saldos por cuenta: parte del balance actual y suma los movimientos futuros
+# conocidos (vencimientos de ingresos programados, saldo pendiente de los servicios a su
+# vencimiento y cuotas impagas de los préstamos). Los movimientos se agrupan por día o mes
+# con índices sobre arrays (np.add.at + cumsum), sin recorrer el horizonte día por día.
+from datetime import date, datetime, timedelta
+
+from app import db
+from app.controllers import amortization
+from app.controllers.scheduled import add_months
+from app.models import Account, Loan, ScheduledIncome, Service
+
+try:
+    import numpy as np
+except ImportError:  # dependencia opcional
+    np = None
+
+GRANULARITIES = ('month', 'day')
+
+
+def _scheduled_events(user_id, today, end):
+    rows = db.session.scalars(db.select(ScheduledIncome).where(
+        ScheduledIncome.user_id == user_id,
+        ScheduledIncome.pending_amount > 0,
+        ScheduledIncome.next_income < datetime.combine(end, datetime.min.time()) + timedelta(days=1),
+    ))
+    for scheduled in rows:
+        # Mismo criterio que el procesador (controllers/scheduled.py)
+        interval = max(scheduled.interval_months or 1, 1)
+        installment = scheduled.installment_amount if (scheduled.installment_amount or 0) > 0 else None
+        pending, due = scheduled.pending_amount, scheduled.next_income.date()
+        while pending > 0 and due <= end:
+            amount = min(installment or pending, pending)
+            yield scheduled.account_id, max(due, today), amount
+            pending -= amount
+            due = add_months(due, interval, scheduled.income_date.day)
+
+
+def _service_events(user_id, today, end):
+    rows = db.session.execute(db.select(Service.account_id, Service.expiration_date, Service.remaining_price).where(
+        Service.user_id == user_id, Service.remaining_price > 0, Service.expiration_date <= end,
+    ))
+    for account_id, expiration_date, remaining in rows:
+        yield account_id, max(expiration_date, today), -remaining
+
+
+def _loan_events(user_id, today, end):
+    loans = db.session.scalars(db.select(Loan).where(Loan.user_id == user_id, Loan.remaining_price > 0)).all()
+    for loan, result in zip(loans, amortization.schedules(loans, today)):
+        for row in result['schedule']:
+            if row['status'] != 'pagada' and row['due_date'] <= end:
+                yield loan.account_id, max(row['due_date'], today), -(row['payment'] - row['paid'])
+
+
+def events(user_id, today, end):
+    """
+    (account_id, fecha, monto) de cada movimiento previsto entre hoy y `end`. Lo vencido y no
+    cobrado/pagado se proyecta para hoy.
+    """
+    for source in (_scheduled_events, _service_events, _loan_events):
+        yield from source(user_id, today, end)
+
+
+def _bucket_python(flows, n_accounts, n_buckets, account_index, bucket_index):
+    by_account = [[0.0] * n_buckets for _ in range(n_accounts)]
+    inflows, outflows = [0.0] * n_buckets, [0.0] * n_buckets
+    for account_id, day, amount in flows:
+        bucket = bucket_index(day)
+        by_account[account_index[account_id]][bucket] += amount
+        (inflows if amount > 0 else outflows)[bucket] += amount
+    return by_account, inflows, outflows
+
+
+def _bucket_numpy(flows, n_accounts, n_buckets, account_index, today, granularity):
+    if not flows:
+        return np.zeros((n_accounts, n_buckets)), np.zeros(n_buckets), np.zeros(n_buckets)
+    accounts, days, amounts = zip(*flows)
+    days = np.array(days, dtype='datetime64[D]')
+    amounts = np.array(amounts, dtype=float)
+    if granularity == 'day':
+        buckets = (days - np.datetime64(today, 'D')).astype(int)
+    else:
+        buckets = (days.astype('datetime64[M]') - np.datetime64(today, 'M')).astype(int)
+    rows = np.array([account_index[a] for a in accounts])
+    by_account = np.zeros((n_accounts, n_buckets))
+    np.add.at(by_account, (rows, buckets), amounts)
+    inflows = np.bincount(buckets, weights=np.where(amounts > 0, amounts, 0), minlength=n_buckets)
+    outflows = np.bincount(buckets, weights=np.where(amounts < 0, amounts, 0), minlength=n_buckets)
+    return by_account, inflows, outflows
+
+
+def project(user_id, months, granularity='month', today=None):
+    """
+    Saldos proyectados al cierre de cada día o mes de los próximos `months` meses, por cuenta
+    y en total, con las entradas y salidas previstas de cada período.
+    """
+    today = today or date.today()
+    end = add_months(today, months, today.day)
+    accounts = db.session.execute(
+        db.select(Account.id, Account.account_name, Account.balance).where(Account.user_id == user_id).order_by(Account.id)
+    ).all()
+    account_index = {account.id: i for i, account in enumerate(accounts)}
+    # Los movimientos sin cuenta del usuario (o de una cuenta borrada) no afectan saldos
+    flows = [f for f in events(user_id, today, end) if f[0] in account_index and today <= f[1] <= end]
+
+    if granularity == 'day':
+        n_buckets = (end - today).days + 1
+        periods = [today + timedelta(days=i) for i in range(n_buckets)]
+    else:
+        n_buckets = months + 1
+        periods = [f'{m.year:04d}-{m.month:02d}' for m in (add_months(today.replace(day=1), i, 1) for i in range(n_buckets))]
+
+    start = [float(account.balance or 0) for account in accounts]
+    if np is not None:
+        by_account, inflows, outflows = _bucket_numpy(flows, len(accounts), n_buckets, account_index, today, granularity)
+        balances = np.array(start).reshape(-1, 1) + np.cumsum(by_account, axis=1)
+        balances = np.round(balances, 2)
+        total = balances.sum(axis=0).round(2).tolist()
+        balances, inflows, outflows = balances.tolist(), np.round(inflows, 2).tolist(), np.round(outflows, 2).tolist()
+    else:
+        if granularity == 'day':
+            bucket_index = lambda day: (day - today).days
+        else:
+            bucket_index = lambda day: (day.year - today.year) * 12 + day.month - today.month
+        by_account, inflows, outflows = _bucket_python(flows, len(accounts), n_buckets, account_index, bucket_index)
+        balances = []
+        for balance, deltas in zip(start, by_account):
+            series = []
+            for delta in deltas:
+                balance += delta
+                series.append(round(balance, 2))
+            balances.append(series)
+        total = [round(sum(column), 2) for column in zip(*balances)] if balances else [0.0] * n_buckets
+        inflows, outflows = [round(v, 2) for v in inflows], [round(v, 2) for v in outflows]
+
+    return {
+        'granularity': granularity,
+        'from': today,
+        'to': end,
+        'periods': periods,
+        'accounts': [
+            {'account_id': account.id, 'account_name': account.account_name, 'balances': series}
+            for account, series in zip(accounts, balances)
+        ],
+        'total': total,
+        'inflows': inflows,
+        'outflows': outflows,
+    }
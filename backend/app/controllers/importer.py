@@ -0,0 +1,156 @@
+# Importación de extractos: registros ya parseados -> lotes deduplicados e insertados con commit por lote
+import math
+import time
+from datetime import datetime, timedelta
+
+from app import db
+from app.controllers import rollups, ledger
+from app.controllers.ownership import foreign_parents
+from app.models import Income, LoanPayment, ServicePayment
+
+# Columnas canónicas del CSV (las mismas que genera /api/export)
+IMPORT_FIELDS = ['kind', 'date', 'name', 'category', 'description', 'amount', 'account_id', 'parent_id']
+
+# kind -> (modelo, campo de fecha, campo de la clave de deduplicación junto a fecha/monto/descripción)
+IMPORT_KINDS = {
+    'incomes': (Income, 'income_date', 'account_id'),
+    'service_payments': (ServicePayment, 'date', 'service_id'),
+    'loan_payments': (LoanPayment, 'date', 'loan_id'),
+}
+
+MAX_ERROR_SAMPLES = 20
+
+
+def _number(value):
+    if value in (None, ''):
+        return None
+    # Las columnas son enteras: un decimal, inf o nan es un error de la fila, no se redondea
+    number = float(str(value).strip())
+    if not math.isfinite(number) or not number.is_integer():
+        raise ValueError(value)
+    return int(number)
+
+
+def to_payload(kind, record):
+    """
+    Convierte un registro canónico (strings del CSV) en el JSON que espera el `parse_create` del esquema.
+    Lanza ValueError si un número no es válido.
+    """
+    if kind == 'incomes':
+        return {
+            'income_name': record.get('name'),
+            'income_date': record.get('date'),
+            'description': record.get('description') or None,
+            'category': record.get('category'),
+            'amount': _number(record.get('amount')),
+            'account_id': _number(record.get('account_id')),
+        }
+    parent_field = IMPORT_KINDS[kind][2]
+    return {
+        'amount': _number(record.get('amount')),
+        'date': record.get('date'),
+        'description': record.get('description') or None,
+        parent_field: _number(record.get('parent_id')),
+    }
+
+
+def _day(value):
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _dedup_key(kind, values):
+    _, date_field, key_field = IMPORT_KINDS[kind]
+    return _day(values[date_field]), values['amount'], values.get('description') or None, values[key_field]
+
+
+def _existing_keys(kind, user_id, rows):
+    """
+    Claves de los movimientos ya guardados en el rango de fechas del lote con alguno de sus
+    montos (usa el índice (user_id, fecha)).
+    """
+    model, date_field, key_field = IMPORT_KINDS[kind]
+    date_column = getattr(model, date_field)
+    days = [_day(row[date_field]) for row in rows]
+    amounts = {row['amount'] for row in rows}
+    stmt = db.select(date_column, model.amount, model.description, getattr(model, key_field)).where(
+        model.user_id == user_id,
+        date_column >= min(days),
+        date_column < max(days) + timedelta(days=1),
+        model.amount.in_(amounts),
+    )
+    return {(_day(d), amount, description or None, key) for d, amount, description, key in db.session.execute(stmt)}
+
+
+def _flush(kind, rows, user_id, stats):
+    existing = _existing_keys(kind, user_id, rows)
+    fresh = []
+    for values in rows:
+        key = _dedup_key(kind, values)
+        if key in existing:
+            stats['duplicates'] += 1
+            continue
+        existing.add(key)
+        fresh.append(values)
+    if fresh:
+        db.session.execute(db.insert(IMPORT_KINDS[kind][0]), fresh)
+        rollups.add_rows(kind, fresh)
+        ledger.post_rows(kind, fresh, user_id)
+        stats['inserted'] += len(fresh)
+    db.session.commit()
+    stats['batches'] += 1
+
+
+def import_records(records, user_id, parsers, batch_size=1000):
+    """
+    Consume `records` (iterable de (línea, kind, registro canónico)) validando cada fila con
+    `parsers[kind]` y que su cuenta/servicio/préstamo sea del usuario, e insertando lotes de `batch_size` filas con un commit por lote. Las filas
+    iguales en (fecha, monto, descripción, cuenta/padre) a otra ya guardada o ya importada se
+    omiten. La memoria depende del tamaño del lote, no del archivo.
+    """
+    stats = {'rows': 0, 'inserted': 0, 'duplicates': 0, 'errors': 0, 'batches': 0}
+    error_samples = []
+    pending = {kind: [] for kind in IMPORT_KINDS}
+    started = time.perf_counter()
+
+    def reject(line, error):
+        stats['errors'] += 1
+        if len(error_samples) < MAX_ERROR_SAMPLES:
+            error_samples.append({'line': line, 'msg': error})
+
+    def flush(kind, batch):
+        # batch: [(línea, valores)]. Los padres se comprueban con una consulta por lote
+        rows = [values for _, values in batch]
+        foreign = foreign_parents(rows, user_id)
+        for position, error in foreign.items():
+            reject(batch[position][0], error)
+        rows = [values for position, values in enumerate(rows) if position not in foreign]
+        if rows:
+            _flush(kind, rows, user_id, stats)
+
+    for line, kind, record in records:
+        stats['rows'] += 1
+        if kind not in IMPORT_KINDS:
+            values, error = None, f'Tipo no válido: {kind}'
+        else:
+            try:
+                values, error = parsers[kind](to_payload(kind, record), user_id)
+            except (ValueError, OverflowError):
+                values, error = None, 'Número inválido en amount, account_id o parent_id'
+        if error:
+            reject(line, error)
+            continue
+
+        pending[kind].append((line, values))
+        if len(pending[kind]) >= batch_size:
+            flush(kind, pending[kind])
+            pending[kind] = []
+
+    for kind, batch in pending.items():
+        if batch:
+            flush(kind, batch)
+
+    elapsed = time.perf_counter() - started
+    stats['seconds'] = round(elapsed, 3)
+    stats['rows_per_second'] = round(stats['rows'] / elapsed) if elapsed > 0 else stats['rows']
+    stats['error_samples'] = error_samples
+    return stats
@@ -0,0 +1,67 @@
+# Asientos de los pagos: cada pago descuenta su importe del saldo pendiente del servicio/préstamo
+# y del balance de la cuenta de ese servicio/préstamo, dentro de la transacción del handler.
+# Se usan UPDATE atómicos (x = x - :monto) para no perder actualizaciones concurrentes.
+from collections import defaultdict
+from types import SimpleNamespace
+
+from app import db
+from app.models import Account, Loan, Service
+
+# kind -> (modelo padre, campo FK del pago)
+PARENTS = {
+    'service_payments': (Service, 'service_id'),
+    'loan_payments': (Loan, 'loan_id'),
+}
+
+
+def post_rows(kind, rows, user_id, sign=1):
+    """
+    Aplica los pagos `rows` (modelos o dicts) de `user_id`. Con sign=-1 revierte el asiento.
+    Agrupa por padre: un UPDATE por servicio/préstamo y uno por cuenta afectada, ambos
+    limitados a los del usuario (un padre ajeno no se toca). Los ingresos y demás tipos
+    no generan asientos.
+    """
+    if kind not in PARENTS:
+        return
+    parent_model, parent_field = PARENTS[kind]
+    user_id = int(user_id)
+
+    by_parent = defaultdict(int)
+    for row in rows:
+        if isinstance(row, dict):
+            row = SimpleNamespace(**row)
+        parent_id = getattr(row, parent_field)
+        if parent_id and row.amount:
+            by_parent[int(parent_id)] += sign * row.amount
+
+    by_account = defaultdict(int)
+    for parent_id, amount in by_parent.items():
+        account_id = db.session.execute(
+            db.update(parent_model)
+            .where(parent_model.id == parent_id, parent_model.user_id == user_id)
+            .values(remaining_price=parent_model.remaining_price - amount)
+            .returning(parent_model.account_id)
+        ).scalar()
+        if account_id is not None:
+            by_account[account_id] += amount
+
+    for account_id, amount in by_account.items():
+        db.session.execute(
+            db.update(Account).where(Account.id == account_id, Account.user_id == user_id).values(balance=Account.balance - amount)
+        )
+
+
+def reverse_rows(kind, rows, user_id):
+    post_rows(kind, rows, user_id, -1)
+
+
+def post_payment(kind, payment, user_id):
+    post_rows(kind, [payment], user_id)
+
+
+def reverse_payment(kind, payment, user_id):
+    """
+    Revierte el asiento de un pago. En un PUT se llama antes de modificar los campos y
+    `post_payment` después, de modo que un cambio de monto o de padre queda bien reflejado.
+    """
+    post_rows(kind, [payment], user_id, -1)
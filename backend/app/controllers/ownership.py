@@ -0,0 +1,28 @@
+# Pertenencia de los padres referenciados por un alta (cuenta, servicio, préstamo): un usuario
+# no puede asentar movimientos contra los de otro. Para los caminos por lotes (bulk, import).
+from app import db
+from app.models import Account, Loan, Service
+
+# Campo FK -> (modelo padre, mensaje si no es del usuario)
+PARENT_FIELDS = {
+    'account_id': (Account, 'Cuenta no encontrada'),
+    'service_id': (Service, 'Servicio no encontrado'),
+    'loan_id': (Loan, 'Préstamo no encontrado'),
+}
+
+
+def foreign_parents(rows, user_id):
+    """
+    Filas de `rows` (dicts ya validados) cuyo account_id / service_id / loan_id no existe o es
+    de otro usuario: {índice: mensaje}. Una consulta IN (...) por campo presente.
+    """
+    errors = {}
+    for field, (model, msg) in PARENT_FIELDS.items():
+        ids = {row[field] for row in rows if row.get(field) is not None}
+        if not ids:
+            continue
+        owned = set(db.session.scalars(db.select(model.id).where(model.id.in_(ids), model.user_id == user_id)))
+        for index, row in enumerate(rows):
+            if row.get(field) is not None and row[field] not in owned:
+                errors.setdefault(index, msg)
+    return errors
@@ -0,0 +1,173 @@
+# Totales mensuales materializados por (user_id, kind, year_month, account_id, category).
+# Los handlers de ingresos y pagos aplican deltas dentro de su propia transacción;
+# los cambios en servicios, préstamos y cuentas reconstruyen los totales del usuario.
+from collections import defaultdict
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import Income, Loan, LoanPayment, MonthlyRollup, Service, ServicePayment
+
+KINDS = ('incomes', 'service_payments', 'loan_payments')
+
+
+def source(kind):
+    """
+    Devuelve (from, monto, fecha, categoría, cuenta, user_id) para cada tipo de movimiento.
+    Los pagos toman la categoría y la cuenta de su servicio/préstamo (solo si es del mismo
+    usuario); en los préstamos la "categoría" es el nombre del préstamo.
+    """
+    if kind == 'incomes':
+        return Income, Income.amount, Income.income_date, Income.category, Income.account_id, Income.user_id
+    if kind == 'service_payments':
+        join = db.join(ServicePayment, Service, db.and_(ServicePayment.service_id == Service.id,
+                                                 Service.user_id == ServicePayment.user_id))
+        return join, ServicePayment.amount, ServicePayment.date, Service.category, Service.account_id, ServicePayment.user_id
+    join = db.join(LoanPayment, Loan, db.and_(LoanPayment.loan_id == Loan.id, Loan.user_id == LoanPayment.user_id))
+    return join, LoanPayment.amount, LoanPayment.date, Loan.loan_name, Loan.account_id, LoanPayment.user_id
+
+
+def year_month(value):
+    return f'{value.year:04d}-{value.month:02d}'
+
+
+def _row_key(kind, row):
+    """
+    (account_id, category, year_month, amount) de un ingreso/pago, o None si no cuenta
+    en los totales (pago sin servicio/préstamo del usuario, igual que el INNER JOIN de `source`).
+    """
+    if kind == 'incomes':
+        return row.account_id, row.category, year_month(row.income_date), row.amount
+    if kind == 'service_payments':
+        parent = _owned_parent(Service, row.service_id, row.user_id)
+        if parent is None:
+            return None
+        return parent.account_id, parent.category, year_month(row.date), row.amount
+    parent = _owned_parent(Loan, row.loan_id, row.user_id)
+    if parent is None:
+        return None
+    return parent.account_id, parent.loan_name, year_month(row.date), row.amount
+
+
+def _owned_parent(model, parent_id, user_id):
+    # session.get usa el mapa de identidad: en un lote con el mismo padre no repite la consulta
+    parent = db.session.get(model, int(parent_id)) if parent_id else None
+    if parent is None or parent.user_id != int(user_id):
+        return None
+    return parent
+
+
+def apply_delta(user_id, kind, month, account_id, category, amount, count):
+    """
+    Suma `amount`/`count` a la fila del rollup con un UPSERT atómico (total = total + :delta).
+    """
+    table = MonthlyRollup.__table__
+    values = {'user_id': user_id, 'kind': kind, 'year_month': month, 'account_id': account_id,
+              'category': category, 'total': amount, 'count': count}
+    dialect = db.session.get_bind().dialect.name
+
+    key = db.and_(
+        table.c.user_id == user_id, table.c.kind == kind, table.c.year_month == month,
+        table.c.account_id.is_(None) if account_id is None else table.c.account_id == account_id,
+        table.c.category == category,
+    )
+
+    # Con account_id NULL la restricción única no aplica: se usa UPDATE y luego INSERT
+    if account_id is not None and dialect in ('sqlite', 'postgresql'):
+        insert = (sqlite if dialect == 'sqlite' else postgresql).insert(table).values(**values)
+        db.session.execute(insert.on_conflict_do_update(
+            index_elements=['user_id', 'kind', 'year_month', 'account_id', 'category'],
+            set_={'total': table.c.total + amount, 'count': table.c.count + count},
+        ))
+    else:
+        result = db.session.execute(
+            db.update(table).where(key).values(total=table.c.total + amount, count=table.c.count + count)
+        )
+        if result.rowcount == 0:
+            db.session.execute(db.insert(table).values(**values))
+
+    # Un mes/categoría sin movimientos no debe aparecer en los totales
+    if count < 0:
+        db.session.execute(db.delete(table).where(key, table.c.count <= 0))
+
+
+def add_rows(kind, rows, sign=1):
+    """
+    Aplica varios ingresos/pagos (modelos o dicts) agrupando los deltas por clave,
+    con un UPSERT por mes/categoría en lugar de uno por fila.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for row in rows:
+        if isinstance(row, dict):
+            row = SimpleNamespace(**row)
+        key = _row_key(kind, row)
+        if key is None:
+            continue
+        account_id, category, month, amount = key
+        delta = deltas[(int(row.user_id), month, account_id, category)]
+        delta[0] += sign * (amount or 0)
+        delta[1] += sign
+    for (user_id, month, account_id, category), (amount, count) in deltas.items():
+        apply_delta(user_id, kind, month, account_id, category, amount, count)
+
+
+def remove_rows(kind, rows):
+    add_rows(kind, rows, -1)
+
+
+def add_row(kind, row):
+    """
+    Suma un ingreso/pago nuevo (o recién actualizado) a su mes y categoría.
+    """
+    add_rows(kind, [row])
+
+
+def remove_row(kind, row):
+    """
+    Resta un ingreso/pago. En un PUT se llama antes de modificar los campos y `add_row`
+    después, de modo que un cambio de mes, categoría o padre mueve el importe.
+    """
+    add_rows(kind, [row], -1)
+
+
+def rebuild(user_id=None, kinds=KINDS):
+    """
+    Recalcula los rollups desde las tablas de movimientos (todos los usuarios si user_id es None).
+    No hace commit.
+    """
+    table = MonthlyRollup.__table__
+    for kind in kinds:
+        delete = db.delete(table).where(table.c.kind == kind)
+        if user_id is not None:
+            delete = delete.where(table.c.user_id == user_id)
+        db.session.execute(delete)
+
+        join, amount, date_column, category, account_id, owner = source(kind)
+        year = db.extract('year', date_column)
+        month = db.extract('month', date_column)
+        keys = (owner, account_id, category, year, month)
+        stmt = db.select(*keys, db.func.sum(amount), db.func.count()).select_from(join).where(owner.is_not(None))
+        if user_id is not None:
+            stmt = stmt.where(owner == user_id)
+        rows = [
+            {'user_id': u, 'kind': kind, 'year_month': f'{int(y):04d}-{int(m):02d}', 'account_id': a,
+             'category': c, 'total': t or 0, 'count': n}
+            for u, a, c, y, m, t, n in db.session.execute(stmt.group_by(*keys))
+        ]
+        if rows:
+            db.session.execute(db.insert(table), rows)
+
+
+def read_grouped(user_id, kind, month_from, month_to, *keys):
+    """
+    Agrupa los rollups del usuario por `keys` entre dos meses 'YYYY-MM' (inclusive).
+    """
+    stmt = db.select(*keys, db.func.sum(MonthlyRollup.total)).where(
+        MonthlyRollup.user_id == user_id, MonthlyRollup.kind == kind
+    )
+    if month_from:
+        stmt = stmt.where(MonthlyRollup.year_month >= month_from)
+    if month_to:
+        stmt = stmt.where(MonthlyRollup.year_month <= month_to)
+    return db.session.execute(stmt.group_by(*keys).order_by(*keys)).all()
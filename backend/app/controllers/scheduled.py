@@ -0,0 +1,156 @@
+# Procesador de ingresos programados: registra como Income cada vencimiento (next_income <= ahora)
+# de todos los usuarios, avanza la fila programada y suma el monto al balance de la cuenta.
+# Varios procesos pueden ejecutarlo a la vez: cada lote se reserva con un UPDATE atómico sobre
+# lease_token/lease_until (y FOR UPDATE SKIP LOCKED en PostgreSQL) y se procesa en una transacción
+# que solo se confirma si la reserva sigue siendo suya.
+import calendar
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from app import db, response_cache
+from app.controllers import rollups, versions
+from app.models import Account, Income, ScheduledIncome
+from app.routes.caching import cache_group
+
+# Vencimientos atrasados que se registran como máximo por fila en una ejecución
+MAX_OCCURRENCES = 120
+
+RESOURCES = ('incomes', 'scheduled_incomes', 'accounts')
+
+
+def add_months(value, months, day):
+    """
+    Suma `months` meses a `value` conservando el día `day` (el de income_date) si el mes lo tiene.
+    """
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    return value.replace(year=year, month=month, day=min(day, calendar.monthrange(year, month)[1]))
+
+
+def _due(now):
+    return db.and_(
+        ScheduledIncome.next_income <= now,
+        ScheduledIncome.pending_amount > 0,
+        db.or_(ScheduledIncome.lease_until.is_(None), ScheduledIncome.lease_until < now),
+    )
+
+
+def claim_batch(now, batch_size, lease_seconds):
+    """
+    Reserva hasta `batch_size` filas vencidas (por el índice de next_income) y las devuelve.
+    La condición se repite en el UPDATE: si otro proceso reservó una fila entre la subconsulta
+    y la escritura, no se toma.
+    """
+    token = uuid.uuid4().hex
+    ids = db.select(ScheduledIncome.id).where(_due(now)).order_by(ScheduledIncome.next_income).limit(batch_size)
+    if db.session.get_bind().dialect.name == 'postgresql':
+        ids = ids.with_for_update(skip_locked=True)
+    db.session.execute(
+        db.update(ScheduledIncome)
+        .where(ScheduledIncome.id.in_(ids), _due(now))
+        .values(lease_token=token, lease_until=now + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return db.session.scalars(db.select(ScheduledIncome).where(ScheduledIncome.lease_token == token)).all()
+
+
+def _occurrences(scheduled, now):
+    """
+    Genera (fecha, monto) de cada vencimiento pendiente hasta `now` y avanza la fila.
+    """
+    interval = max(scheduled.interval_months or 1, 1)
+    installment = scheduled.installment_amount if (scheduled.installment_amount or 0) > 0 else None
+    anchor_day = scheduled.income_date.day
+    for _ in range(MAX_OCCURRENCES):
+        if scheduled.next_income > now or scheduled.pending_amount <= 0:
+            return
+        amount = min(installment or scheduled.pending_amount, scheduled.pending_amount)
+        yield scheduled.next_income, amount
+        scheduled.received_amount += amount
+        scheduled.pending_amount -= amount
+        scheduled.next_income = add_months(scheduled.next_income, interval, anchor_day)
+
+
+class LeaseLost(Exception):
+    """
+    La reserva del lote venció y otro proceso tomó alguna de sus filas: el lote se descarta.
+    """
+
+
+def process_batch(batch, now):
+    """
+    Registra los vencimientos del lote, libera la reserva y actualiza rollups, balances y
+    versiones en una sola transacción. Devuelve (ingresos creados, usuarios afectados).
+    Lanza LeaseLost (sin commit) si la reserva ya no es de este proceso.
+    """
+    token = batch[0].lease_token
+    incomes = []
+    by_account = defaultdict(int)
+    for scheduled in batch:
+        for income_date, amount in _occurrences(scheduled, now):
+            incomes.append({
+                'income_name': scheduled.income_name,
+                'income_date': income_date,
+                'description': scheduled.description,
+                'category': scheduled.category,
+                'amount': amount,
+                'user_id': scheduled.user_id,
+                'account_id': scheduled.account_id,
+            })
+            if scheduled.account_id is not None:
+                by_account[(scheduled.user_id, scheduled.account_id)] += amount
+
+    if incomes:
+        db.session.execute(db.insert(Income), incomes)
+        rollups.add_rows('incomes', incomes)
+    # Solo se acredita en una cuenta del dueño de la fila programada
+    for (user_id, account_id), amount in by_account.items():
+        db.session.execute(
+            db.update(Account)
+            .where(Account.id == account_id, Account.user_id == user_id)
+            .values(balance=Account.balance + amount)
+        )
+    users = {row['user_id'] for row in incomes}
+    for user_id in users:
+        versions.bump(user_id, RESOURCES)
+
+    # Si el lote tardó más que la reserva, otro proceso pudo reservar las mismas filas: solo se
+    # confirma si todas siguen con nuestro token (el UPDATE las bloquea hasta el commit)
+    released = db.session.execute(
+        db.update(ScheduledIncome)
+        .where(ScheduledIncome.id.in_([scheduled.id for scheduled in batch]), ScheduledIncome.lease_token == token)
+        .values(lease_token=None, lease_until=None)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if released != len(batch):
+        raise LeaseLost(f'{len(batch) - released} filas del lote reservadas por otro proceso')
+    db.session.commit()
+    return len(incomes), users
+
+
+def process_due(now=None, batch_size=500, lease_seconds=300):
+    """
+    Procesa todos los ingresos programados vencidos en lotes hasta que no quede ninguno libre.
+    """
+    now = now or datetime.now()
+    stats = {'batches': 0, 'scheduled': 0, 'incomes': 0}
+    while True:
+        batch = claim_batch(now, batch_size, lease_seconds)
+        if not batch:
+            return stats
+        try:
+            created, users = process_batch(batch, now)
+        except LeaseLost:
+            # Las filas las procesa quien las reservó después; no se registra nada dos veces
+            db.session.rollback()
+            continue
+        except Exception:
+            # La reserva vence sola en lease_seconds y el lote se reintenta entero
+            db.session.rollback()
+            raise
+        response_cache.invalidate(cache_group(u, r) for u in users for r in versions.affected(RESOURCES))
+        stats['batches'] += 1
+        stats['scheduled'] += len(batch)
+        stats['incomes'] += created
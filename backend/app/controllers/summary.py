@@ -0,0 +1,67 @@
+# Totales del dashboard. Se leen de los rollups mensuales cuando el rango de fechas
+# cubre meses completos; si no, se calculan con GROUP BY sobre los movimientos.
+import calendar
+from datetime import timedelta
+
+from flask import current_app
+from app import db
+from app.controllers import rollups
+from app.controllers.rollups import KINDS, source
+from app.models import MonthlyRollup
+
+
+def _grouped(kind, user_id, date_from, date_to, *keys):
+    join, amount, date_column, _, _, owner = source(kind)
+    stmt = db.select(*keys, db.func.sum(amount)).select_from(join).where(owner == user_id)
+    if date_from:
+        stmt = stmt.where(date_column >= date_from)
+    if date_to:
+        # `to` es inclusivo; las columnas de pagos/ingresos son DateTime
+        stmt = stmt.where(date_column < date_to + timedelta(days=1))
+    return db.session.execute(stmt.group_by(*keys).order_by(*keys)).all()
+
+
+def _raw_summary(kind, user_id, date_from, date_to):
+    _, _, date_column, category, account_id, _ = source(kind)
+    year = db.extract('year', date_column)
+    month = db.extract('month', date_column)
+    by_category = _grouped(kind, user_id, date_from, date_to, category)
+    by_account = _grouped(kind, user_id, date_from, date_to, account_id)
+    by_month = [(f'{int(y):04d}-{int(m):02d}', t) for y, m, t in _grouped(kind, user_id, date_from, date_to, year, month)]
+    return by_category, by_account, by_month
+
+
+def _rollup_summary(kind, user_id, date_from, date_to):
+    month_from = rollups.year_month(date_from) if date_from else None
+    month_to = rollups.year_month(date_to) if date_to else None
+    by_category = rollups.read_grouped(user_id, kind, month_from, month_to, MonthlyRollup.category)
+    by_account = rollups.read_grouped(user_id, kind, month_from, month_to, MonthlyRollup.account_id)
+    by_month = rollups.read_grouped(user_id, kind, month_from, month_to, MonthlyRollup.year_month)
+    return by_category, by_account, by_month
+
+
+def covers_whole_months(date_from, date_to):
+    if date_from and date_from.day != 1:
+        return False
+    if date_to and date_to.day != calendar.monthrange(date_to.year, date_to.month)[1]:
+        return False
+    return True
+
+
+def kind_summary(kind, user_id, date_from=None, date_to=None):
+    if current_app.config['SUMMARY_USE_ROLLUPS'] and covers_whole_months(date_from, date_to):
+        by_category, by_account, by_month = _rollup_summary(kind, user_id, date_from, date_to)
+    else:
+        by_category, by_account, by_month = _raw_summary(kind, user_id, date_from, date_to)
+
+    by_category = [{'category': c, 'total': t or 0} for c, t in by_category]
+    return {
+        'total': sum(row['total'] for row in by_category),
+        'by_category': by_category,
+        'by_account': [{'account_id': a, 'total': t or 0} for a, t in by_account],
+        'by_month': [{'month': m, 'total': t or 0} for m, t in by_month],
+    }
+
+
+def dashboard_summary(user_id, date_from=None, date_to=None, kinds=KINDS):
+    return {kind: kind_summary(kind, user_id, date_from, date_to) for kind in kinds}
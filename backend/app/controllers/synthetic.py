@@ -0,0 +1,391 @@
+# Generador de datos sintéticos para benchmarks (`flask seed`): usuarios con cuentas, sueldo
+# mensual e ingresos extra, cuentas de servicios con sus pagos, préstamos con sus cuotas e
+# ingresos programados, repartidos en los últimos `years` años.
+# Cada usuario usa su propio Random(f'{seed}:{n}'), así que el resultado depende solo de la
+# semilla, la fecha final y el número de usuario (no del tamaño de lote). Los saldos quedan
+# como los dejarían los handlers (remaining_price = precio - pagos) y los monthly_rollups se
+# escriben ya agregados; el balance de cada cuenta es un saldo actual plausible.
+# Las filas se insertan por lotes con el executemany del driver o, en PostgreSQL, con COPY.
+import csv
+import io
+import math
+import random
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from app import db
+from app.controllers.amortization import monthly_rate
+from app.controllers.rollups import year_month
+from app.controllers.scheduled import add_months
+from app.passwords import hasher
+from app.models import (Account, Income, Loan, LoanPayment, MonthlyRollup, ScheduledIncome, Service,
+                        ServicePayment, User)
+
+# Orden de inserción (respeta las FK)
+TABLES = (User, Account, Loan, Service, ScheduledIncome, Income, LoanPayment, ServicePayment, MonthlyRollup)
+
+# (nombre, tarjeta, probabilidad de que el usuario la tenga)
+ACCOUNTS = (
+    ('Cuenta corriente', 'Débito', 1.0),
+    ('Tarjeta de crédito', 'Crédito', 0.6),
+    ('Cuenta de ahorro', 'N/A', 0.4),
+    ('Efectivo', 'N/A', 0.5),
+)
+
+# (nombre, categoría, probabilidad mensual, monto como fracción del sueldo)
+EXTRA_INCOMES = (
+    ('Proyecto freelance', 'Freelance', 0.25, 0.30),
+    ('Venta', 'Venta', 0.12, 0.10),
+    ('Reembolso', 'Reembolso', 0.10, 0.05),
+    ('Dividendos', 'Inversiones', 0.08, 0.08),
+    ('Regalo', 'Regalo', 0.04, 0.10),
+    ('Otros ingresos', 'Otros', 0.10, 0.04),
+)
+
+# (nombre, categoría, probabilidad de tenerlo, monto base en pesos)
+SERVICES = (
+    ('Arriendo', 'Hogar', 0.45, 450_000),
+    ('Gastos comunes', 'Hogar', 0.35, 80_000),
+    ('Luz', 'Servicios básicos', 0.95, 35_000),
+    ('Agua', 'Servicios básicos', 0.90, 18_000),
+    ('Gas', 'Servicios básicos', 0.70, 25_000),
+    ('Internet', 'Telecomunicaciones', 0.90, 25_000),
+    ('Plan celular', 'Telecomunicaciones', 0.85, 15_000),
+    ('Streaming', 'Entretenimiento', 0.60, 9_000),
+    ('Gimnasio', 'Salud', 0.25, 30_000),
+    ('Seguro de salud', 'Salud', 0.35, 60_000),
+    ('Colegio', 'Educación', 0.20, 180_000),
+    ('Transporte', 'Transporte', 0.50, 40_000),
+)
+
+# (nombre, acreedor, monto mínimo, monto máximo, cuotas posibles, TEA mínima, TEA máxima)
+LOANS = (
+    ('Crédito de consumo', 'Banco Estado', 500_000, 8_000_000, (12, 24, 36, 48), 12.0, 35.0),
+    ('Crédito automotriz', 'Banco de Chile', 4_000_000, 20_000_000, (24, 36, 48, 60), 9.0, 20.0),
+    ('Avance en efectivo', 'Tarjeta de crédito', 100_000, 1_500_000, (6, 12, 18), 25.0, 55.0),
+    ('Crédito hipotecario', 'Santander', 40_000_000, 150_000_000, (240, 300, 360), 4.0, 7.0),
+)
+LOAN_WEIGHTS = (0.5, 0.2, 0.25, 0.05)
+
+SCHEDULED = (
+    ('Arriendo de estacionamiento', 'Arriendo', 60_000),
+    ('Préstamo a familiar', 'Devolución', 150_000),
+    ('Bono anual', 'Sueldo', 600_000),
+)
+
+
+def _round(value, step=100):
+    return max(int(round(value / step)) * step, step)
+
+
+def _below(rng, n):
+    # Como rng.randrange(n) pero más barato (se llama millones de veces)
+    return int(rng.random() * n)
+
+
+def _at(day, rng):
+    return datetime.combine(day, time(8 + _below(rng, 14), _below(rng, 60)))
+
+
+class IdAllocator:
+    """
+    Ids explícitos a partir del máximo actual de cada tabla (para enlazar las FK sin leer de vuelta).
+    """
+
+    def __init__(self):
+        self.next = {}
+        for model in TABLES:
+            self.next[model] = (db.session.scalar(db.select(db.func.max(model.id))) or 0) + 1
+
+    def take(self, model):
+        value = self.next[model]
+        self.next[model] += 1
+        return value
+
+
+class UserGenerator:
+    """
+    Filas de un usuario. `rows` acumula dicts por modelo; `rollups` los totales mensuales.
+    """
+
+    def __init__(self, rows, ids, start, end, password_hash):
+        self.rows = rows
+        self.ids = ids
+        self.start = start
+        self.end = end
+        self.password_hash = password_hash
+
+    def generate(self, number, rng):
+        self.rng = rng
+        self.rollups = defaultdict(lambda: [0, 0])
+        user_id = self.ids.take(User)
+        self.user_id = user_id
+        self.rows[User].append({'id': user_id, 'username': f'usuario{number}', 'email': f'usuario{user_id}@seed.local',
+                                'password_hash': self.password_hash, 'balance': 0, 'email_conf': True})
+
+        self.accounts = []
+        for name, card, probability in ACCOUNTS:
+            if not self.accounts or rng.random() < probability:
+                account_id = self.ids.take(Account)
+                balance = float(_round(rng.lognormvariate(math.log(400_000), 1.0), 1000))
+                self.accounts.append({'id': account_id, 'account_name': name, 'card': card, 'user_id': user_id,
+                                      'balance': balance})
+        self.main_account = self.accounts[0]['id']
+
+        # Cada usuario "empieza" en una fecha distinta dentro del período
+        first = self.start + timedelta(days=int(rng.random() ** 3 * (self.end - self.start).days * 0.5))
+        months = []
+        month = first.replace(day=1)
+        while month <= self.end:
+            months.append(month)
+            month = add_months(month, 1, 1)
+
+        self._incomes(months, first)
+        self._services(months)
+        self._loans(first)
+        self._scheduled()
+
+        self.rows[Account].extend(self.accounts)
+        for (kind, month_key, account_id, category), (total, count) in self.rollups.items():
+            self.rows[MonthlyRollup].append({'id': self.ids.take(MonthlyRollup), 'user_id': user_id, 'kind': kind,
+                                             'year_month': month_key, 'account_id': account_id, 'category': category,
+                                             'total': total, 'count': count})
+
+    def _account(self):
+        # La cuenta principal recibe/paga la mayoría de los movimientos
+        return self.main_account if self.rng.random() < 0.7 else self.rng.choice(self.accounts)['id']
+
+    def _income(self, name, category, when, amount, account_id, description=None):
+        self.rows[Income].append({'id': self.ids.take(Income), 'income_name': name, 'income_date': when,
+                                  'description': description, 'category': category, 'amount': amount,
+                                  'user_id': self.user_id, 'account_id': account_id})
+        self._rollup('incomes', when, account_id, category, amount)
+
+    def _rollup(self, kind, when, account_id, category, amount):
+        entry = self.rollups[(kind, year_month(when), account_id, category)]
+        entry[0] += amount
+        entry[1] += 1
+
+    def _incomes(self, months, first):
+        rng = self.rng
+        salary = rng.lognormvariate(math.log(900_000), 0.5)
+        payday = rng.choice((1, 5, 15, 25, 31))
+        for month in months:
+            if month.month == 1 and month > first:
+                salary *= 1 + rng.uniform(0.02, 0.08)  # reajuste anual
+            day = add_months(month, 0, payday)
+            if first <= day <= self.end:
+                self._income('Sueldo', 'Sueldo', _at(day, rng), _round(salary, 1000), self.main_account)
+            for name, category, probability, share in EXTRA_INCOMES:
+                if category == 'Regalo' and month.month == 12:
+                    probability *= 5
+                if rng.random() < probability:
+                    day = month + timedelta(days=_below(rng, 28))
+                    if first <= day <= self.end:
+                        amount = _round(salary * share * rng.lognormvariate(0, 0.6))
+                        self._income(name, category, _at(day, rng), amount, self._account())
+
+    def _services(self, months):
+        rng = self.rng
+        chosen = [s for s in SERVICES if rng.random() < s[2]]
+        for name, category, _, base in chosen:
+            base = base * rng.lognormvariate(0, 0.3)
+            account_id = self._account()
+            bill_day = rng.randrange(1, 26)
+            for month in months:
+                issued = month + timedelta(days=bill_day - 1)
+                if issued > self.end:
+                    continue
+                price = _round(base * rng.uniform(0.85, 1.15))
+                expiration = issued + timedelta(days=10 + _below(rng, 11))
+                service_id = self.ids.take(Service)
+                paid = self._service_payments(service_id, issued, expiration, price, category, account_id)
+                self.rows[Service].append({'id': service_id, 'service_name': name, 'description': None, 'date': issued,
+                                           'category': category, 'price': price, 'remaining_price': price - paid,
+                                           'user_id': self.user_id, 'account_id': account_id,
+                                           'expiration_date': expiration})
+
+    def _service_payments(self, service_id, issued, expiration, price, category, account_id):
+        rng = self.rng
+        roll = rng.random()
+        if expiration > self.end and roll < 0.6:
+            return 0  # boleta del mes en curso, todavía sin pagar
+        if roll < 0.04:
+            parts = []  # impaga
+        elif roll < 0.10:
+            first = _round(price * rng.uniform(0.3, 0.7))
+            parts = [first] if roll < 0.07 else [first, price - first]  # abono parcial o en dos pagos
+        else:
+            parts = [price]
+        paid = 0
+        for amount in parts:
+            day = min(issued + timedelta(days=_below(rng, (expiration - issued).days + 6)), self.end)
+            when = _at(day, rng)
+            self.rows[ServicePayment].append({'id': self.ids.take(ServicePayment), 'amount': amount, 'date': when,
+                                              'description': None, 'service_id': service_id, 'user_id': self.user_id})
+            self._rollup('service_payments', when, account_id, category, amount)
+            paid += amount
+        return paid
+
+    def _loans(self, first):
+        rng = self.rng
+        years = max((self.end - first).days / 365, 0.1)
+        count = sum(rng.random() < 0.3 for _ in range(math.ceil(years)))
+        for _ in range(count):
+            name, holder, low, high, quotas, tea_low, tea_high = rng.choices(LOANS, LOAN_WEIGHTS)[0]
+            start = first + timedelta(days=rng.randrange(max((self.end - first).days, 1)))
+            price = _round(rng.uniform(low, high), 10_000)
+            quota = rng.choice(quotas)
+            tea = round(rng.uniform(tea_low, tea_high), 1)
+            rate = monthly_rate(tea)
+            payment = price * rate / (1 - (1 + rate) ** -quota) if rate > 0 else price / quota
+            loan_id = self.ids.take(Loan)
+            account_id = self.main_account
+            # Mismo criterio que rollups.source: la "categoría" de un préstamo es su nombre
+            paid = 0
+            for period in range(1, quota + 1):
+                due = add_months(start, period, start.day)
+                if due > self.end:
+                    break
+                if rng.random() < 0.04:
+                    continue  # cuota impaga
+                amount = _round(payment, 1)
+                when = _at(max(min(due + timedelta(days=rng.randrange(-5, 4)), self.end), start), rng)
+                self.rows[LoanPayment].append({'id': self.ids.take(LoanPayment), 'amount': amount, 'date': when,
+                                               'description': None, 'loan_id': loan_id, 'user_id': self.user_id})
+                self._rollup('loan_payments', when, account_id, name, amount)
+                paid += amount
+            self.rows[Loan].append({'id': loan_id, 'loan_name': name, 'holder': holder, 'price': price,
+                                    'description': None, 'date': start, 'quota': quota, 'tea': tea,
+                                    'remaining_price': price - paid, 'user_id': self.user_id, 'account_id': account_id,
+                                    'expiration_date': add_months(start, quota, start.day)})
+
+    def _scheduled(self):
+        rng = self.rng
+        if rng.random() >= 0.3:
+            return
+        name, category, base = rng.choice(SCHEDULED)
+        installment = _round(base * rng.lognormvariate(0, 0.3), 1000)
+        installments = rng.choice((6, 12, 24))
+        interval = 12 if category == 'Sueldo' else 1
+        available = ((self.end.year - self.start.year) * 12 + self.end.month - self.start.month) // interval
+        received = rng.randrange(min(installments, available + 1))
+        started = add_months(self.end, -received * interval, self.end.day)
+        account_id = self._account()
+        # Las cuotas ya recibidas son los ingresos que habría creado el procesador
+        for k in range(received):
+            when = _at(add_months(started, k * interval, started.day), rng)
+            self._income(name, category, when, installment, account_id, 'Ingreso programado')
+        self.rows[ScheduledIncome].append({
+            'id': self.ids.take(ScheduledIncome), 'income_name': name, 'income_date': _at(started, rng),
+            'description': 'Ingreso programado', 'category': category,
+            'next_income': _at(add_months(started, received * interval, started.day), rng),
+            'amount': installment * installments, 'received_amount': installment * received,
+            'pending_amount': installment * (installments - received), 'user_id': self.user_id,
+            'account_id': account_id, 'installment_amount': installment, 'interval_months': interval,
+            'lease_token': None, 'lease_until': None,
+        })
+
+
+def _copy_rows(table, rows):
+    """
+    COPY ... FROM STDIN (psycopg2 o psycopg 3). Devuelve False si el driver no lo soporta.
+    """
+    driver = db.session.get_bind().dialect.driver
+    if driver not in ('psycopg2', 'psycopg'):
+        return False
+    columns = list(rows[0])
+    copy_sql = f'COPY {table.name} ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)'
+    cursor = db.session.connection().connection.driver_connection.cursor()
+    if driver == 'psycopg2':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([row[c] for c in columns] for row in rows)
+        buffer.seek(0)
+        cursor.copy_expert(copy_sql, buffer)
+    else:
+        with cursor.copy(copy_sql.replace(' WITH (FORMAT csv)', '')) as copy:
+            for row in rows:
+                copy.write_row([row[c] for c in columns])
+    cursor.close()
+    return True
+
+
+def _executemany_rows(table, rows, chunk):
+    """
+    INSERT con executemany del driver sobre tuplas: aplica una vez por columna el procesador
+    de tipos de SQLAlchemy en lugar de compilar los parámetros fila por fila.
+    """
+    connection = db.session.connection()
+    dialect = connection.dialect
+    columns = list(rows[0])
+    processors = [table.c[c].type.dialect_impl(dialect).bind_processor(dialect) for c in columns]
+    marker = {'qmark': '?', 'numeric': None, 'named': None}.get(dialect.paramstyle, '%s')
+    if marker is None:
+        placeholders = ', '.join(f':{c}' for c in columns)
+    else:
+        placeholders = ', '.join([marker] * len(columns))
+    sql = f'INSERT INTO {table.name} ({", ".join(columns)}) VALUES ({placeholders})'
+    for start in range(0, len(rows), chunk):
+        values = [[row[c] for c in columns] for row in rows[start:start + chunk]]
+        for i, processor in enumerate(processors):
+            if processor is not None:
+                for row in values:
+                    if row[i] is not None:
+                        row[i] = processor(row[i])
+        if marker is None:
+            values = [dict(zip(columns, row)) for row in values]
+        connection.exec_driver_sql(sql, [tuple(row) for row in values] if marker else values)
+
+
+def write_rows(model, rows, chunk=10_000):
+    if not rows:
+        return
+    table = model.__table__
+    if db.session.get_bind().dialect.name == 'postgresql' and _copy_rows(table, rows):
+        return
+    _executemany_rows(table, rows, chunk)
+
+
+def _reset_sequences():
+    # Tras insertar ids explícitos, las secuencias de PostgreSQL deben seguir desde el máximo
+    if db.session.get_bind().dialect.name != 'postgresql':
+        return
+    for model in TABLES:
+        name = model.__table__.name
+        db.session.execute(db.text(
+            f"SELECT setval(pg_get_serial_sequence('{name}', 'id'), COALESCE((SELECT MAX(id) FROM {name}), 1))"
+        ))
+
+
+def generate(users, years, seed=42, end=None, batch_rows=100_000, password='password', progress=None):
+    """
+    Inserta `users` usuarios con `years` años de movimientos hasta `end` (hoy por defecto).
+    Hace commit cada ~`batch_rows` filas; `progress(usuarios, filas)` se llama tras cada lote.
+    Devuelve las filas insertadas por tabla.
+    """
+    end = end or date.today()
+    start = add_months(end, -12 * years, end.day)
+    ids = IdAllocator()
+    rows = {model: [] for model in TABLES}
+    totals = defaultdict(int)
+    generator = UserGenerator(rows, ids, start, end, hasher().hash(password))
+
+    def flush(done):
+        for model in TABLES:
+            write_rows(model, rows[model])
+            totals[model.__tablename__] += len(rows[model])
+            rows[model].clear()
+        db.session.commit()
+        if progress:
+            progress(done, sum(totals.values()))
+
+    pending = 0
+    for number in range(1, users + 1):
+        generator.generate(number, random.Random(f'{seed}:{number}'))
+        pending = sum(len(r) for r in rows.values())
+        if pending >= batch_rows:
+            flush(number)
+    flush(users)
+    _reset_sequences()
+    db.session.commit()
+    return dict(totals)
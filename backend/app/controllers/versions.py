@@ -0,0 +1,58 @@
+# Versiones por (usuario, recurso) para ETags: cada escritura incrementa la versión del
+# recurso escrito y la de los recursos cuyas respuestas dependen de él.
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import db
+from app.models import ResourceVersion
+
+# recurso escrito -> recursos cuyas respuestas cambian. Borrar un padre borra en cascada
+# sus hijos (pagos; en las cuentas, todo lo que cuelga de ellas): sus listados también cambian
+DEPENDENTS = {
+    'accounts': ('accounts', 'incomes', 'services', 'loans', 'service_payments', 'loan_payments',
+                 'scheduled_incomes', 'summary', 'forecast'),
+    'incomes': ('incomes', 'summary'),
+    'services': ('services', 'service_payments', 'summary', 'forecast'),
+    'loans': ('loans', 'loan_payments', 'summary', 'forecast'),
+    # Los pagos mueven remaining_price del padre y el balance de la cuenta
+    'service_payments': ('service_payments', 'services', 'accounts', 'summary', 'forecast'),
+    'loan_payments': ('loan_payments', 'loans', 'accounts', 'summary', 'forecast'),
+    'scheduled_incomes': ('scheduled_incomes', 'forecast'),
+}
+
+
+def affected(resources):
+    return sorted({dependent for resource in resources for dependent in DEPENDENTS.get(resource, (resource,))})
+
+
+def current_query(user_id, resource):
+    return db.select(ResourceVersion.version).where(
+        ResourceVersion.user_id == user_id, ResourceVersion.resource == resource
+    )
+
+
+def current(user_id, resource):
+    return db.session.execute(current_query(user_id, resource)).scalar() or 0
+
+
+def bump(user_id, resources):
+    """
+    Incrementa la versión de `resources` y de sus dependientes. No hace commit.
+    """
+    table = ResourceVersion.__table__
+    dialect = db.session.get_bind().dialect.name
+    for resource in affected(resources):
+        if dialect in ('sqlite', 'postgresql'):
+            insert = (sqlite if dialect == 'sqlite' else postgresql).insert(table).values(
+                user_id=user_id, resource=resource, version=1
+            )
+            db.session.execute(insert.on_conflict_do_update(
+                index_elements=['user_id', 'resource'], set_={'version': table.c.version + 1}
+            ))
+            continue
+        result = db.session.execute(
+            db.update(table)
+            .where(table.c.user_id == user_id, table.c.resource == resource)
+            .values(version=table.c.version + 1)
+        )
+        if result.rowcount == 0:
+            db.session.execute(db.insert(table).values(user_id=user_id, resource=resource, version=1))
@@ -0,0 +1,42 @@
+# Ajustes del motor de SQLAlchemy según la base de datos configurada.
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Opciones que solo acepta el QueuePool (SQLite en memoria usa otro pool)
+QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+
+
+def prepare_engine_options(app):
+    """
+    Quita de SQLALCHEMY_ENGINE_OPTIONS lo que el motor no admite. Se llama antes de db.init_app.
+    """
+    url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        for option in QUEUE_POOL_OPTIONS:
+            options.pop(option, None)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def register_sqlite_pragmas(app, engine):
+    """
+    Aplica journal_mode=WAL, synchronous=NORMAL y busy_timeout a cada conexión SQLite nueva.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    wal = app.config.get('SQLITE_WAL', True) and engine.url.database not in (None, '', ':memory:')
+    busy_timeout = app.config.get('SQLITE_BUSY_TIMEOUT', 5000)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        # Con aiosqlite (modo ASGI) la conexión es el adaptador de SQLAlchemy, con la misma API
+        if not isinstance(dbapi_connection, sqlite3.Connection) and engine.dialect.driver != 'aiosqlite':
+            return
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f'PRAGMA busy_timeout = {int(busy_timeout)}')
+        if wal:
+            cursor.execute('PRAGMA journal_mode = WAL')
+            cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.close()
@@ -0,0 +1,96 @@
+# Verificación de los id_token de Google OAuth con certificados en caché.
+# id_token.verify_oauth2_token descarga los certificados de Google en cada llamada; aquí se
+# le pasa un transporte que los guarda según el Cache-Control de la respuesta y que reutiliza
+# una sola sesión HTTP (pool de conexiones) para todo el proceso. Con GOOGLE_CERTS_FILE los
+# certificados se leen de un archivo local (para pruebas con tokens firmados localmente).
+import json
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from google.auth import transport
+from google.auth.transport import requests as google_requests
+from google.oauth2 import id_token
+
+from flask import current_app
+
+# Pool de conexiones compartido por la verificación de tokens y el intercambio del código OAuth
+http_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+http_session = requests.Session()
+http_session.mount('https://', http_adapter)
+
+
+class CachedCertsRequest(google_requests.Request):
+    """
+    Transporte de google-auth que cachea los GET (los certificados) hasta su max-age.
+    """
+
+    def __init__(self, session=http_session, default_ttl=3600):
+        super().__init__(session=session)
+        self.default_ttl = default_ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url, method='GET', body=None, headers=None, timeout=120, **kwargs):
+        if method != 'GET' or body is not None:
+            return super().__call__(url, method=method, body=body, headers=headers, timeout=timeout, **kwargs)
+        cached = self._cache.get(url)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        response = super().__call__(url, method=method, headers=headers, timeout=timeout, **kwargs)
+        if response.status == 200:
+            match = re.search(r'max-age=(\d+)', response.headers.get('Cache-Control', ''))
+            ttl = int(match.group(1)) if match else self.default_ttl
+            with self._lock:
+                self._cache[url] = (time.monotonic() + ttl, response)
+        return response
+
+
+class _LocalResponse(transport.Response):
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def status(self):
+        return 200
+
+    @property
+    def headers(self):
+        return {'Content-Type': 'application/json'}
+
+    @property
+    def data(self):
+        return self._data
+
+
+class LocalCertsRequest(transport.Request):
+    """
+    Sustituto local: responde cualquier GET con el JSON de certificados de `path`
+    ({kid: certificado PEM} o un JWK Set, como el endpoint de Google).
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._data = f.read()
+        json.loads(self._data)  # falla al iniciar si el archivo no es JSON
+
+    def __call__(self, url, method='GET', body=None, headers=None, timeout=None, **kwargs):
+        return _LocalResponse(self._data)
+
+
+def init_google_auth(app):
+    certs_file = app.config.get('GOOGLE_CERTS_FILE')
+    app.extensions['google_certs'] = LocalCertsRequest(certs_file) if certs_file else CachedCertsRequest()
+
+
+def verify_google_id_token(token):
+    """
+    Valida firma, emisor, vencimiento y audiencia (GOOGLE_CLIENT_ID). Lanza ValueError si no es válido.
+    """
+    return id_token.verify_oauth2_token(
+        id_token=token,
+        request=current_app.extensions['google_certs'],
+        audience=current_app.config['GOOGLE_CLIENT_ID'],
+    )
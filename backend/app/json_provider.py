@@ -0,0 +1,67 @@
+# Proveedores JSON de la app. Los dos serializan date/datetime en ISO 8601 (el formato que
+# ya usaba la API), así que los handlers pueden devolver filas con fechas sin convertirlas.
+# JSON_PROVIDER: 'auto' (orjson si está instalado), 'orjson' o 'std'.
+from datetime import date
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider, _default
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+
+def _fallback(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return _default(value)
+
+
+class StdJSONProvider(DefaultJSONProvider):
+    """
+    json de la biblioteca estándar con fechas en ISO 8601, sin ordenar claves ni escapar no-ASCII.
+    """
+    default = staticmethod(_fallback)
+    ensure_ascii = False
+    sort_keys = False
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    orjson: serializa date/datetime de forma nativa y escribe bytes directamente en la respuesta.
+    Lo que orjson no conoce (Decimal, dataclasses, Markup...) pasa por `_fallback`.
+    """
+    option = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_fallback, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.option
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=_fallback, option=option | orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype,
+        )
+
+
+def init_json_provider(app):
+    kind = app.config.get('JSON_PROVIDER', 'auto')
+    if kind == 'auto':
+        kind = 'orjson' if orjson is not None else 'std'
+    if kind == 'orjson':
+        if orjson is None:
+            raise RuntimeError("JSON_PROVIDER='orjson' requiere el paquete orjson")
+        app.json = OrjsonProvider(app)
+    elif kind == 'std':
+        app.json = StdJSONProvider(app)
+    else:
+        raise ValueError(f'JSON_PROVIDER desconocido: {kind}')
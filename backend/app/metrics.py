@@ -0,0 +1,182 @@
+# Métricas de las peticiones HTTP del proceso: latencia por endpoint, cantidad y tiempo de las
+# consultas SQL de cada petición (eventos before/after_cursor_execute del motor), tamaño de la
+# respuesta y detección de N+1 (la misma sentencia ejecutada más de K veces en una petición).
+# Se exponen en /api/_metrics en el formato de texto de Prometheus; cada worker tiene las suyas.
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """
+    Histograma acumulable con límites fijos (le inclusivo, como Prometheus).
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield bound, total
+
+
+class RequestStats:
+    __slots__ = ('start', 'queries', 'sql_time', 'statements')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+
+
+class Metrics:
+    def __init__(self, n_plus_one_threshold=10):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))  # (endpoint, method)
+        self.queries = defaultdict(lambda: Histogram(QUERY_BUCKETS))  # endpoint
+        self.sql_time = defaultdict(lambda: Histogram(LATENCY_BUCKETS))  # endpoint
+        self.size = defaultdict(lambda: Histogram(SIZE_BUCKETS))  # endpoint
+        self.responses = Counter()  # (endpoint, method, status)
+        self.n_plus_one = Counter()  # endpoint
+        self.rate_limited = Counter()  # (ruta, ip|email)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, method, status, stats, elapsed, size):
+        repeated = [(s, n) for s, n in stats.statements.items() if n > self.n_plus_one_threshold]
+        with self._lock:
+            self.latency[(endpoint, method)].observe(elapsed)
+            self.queries[endpoint].observe(stats.queries)
+            self.sql_time[endpoint].observe(stats.sql_time)
+            if size is not None:
+                self.size[endpoint].observe(size)
+            self.responses[(endpoint, method, status)] += 1
+            if repeated:
+                self.n_plus_one[endpoint] += 1
+        for statement, count in repeated:
+            logger.warning('Posible N+1 en %s: %d ejecuciones de %s', endpoint, count, ' '.join(statement.split())[:200])
+
+    def count_rate_limited(self, route, scope):
+        with self._lock:
+            self.rate_limited[(route, scope)] += 1
+
+    def render(self):
+        """
+        Texto en el formato de exposición de Prometheus (text/plain; version=0.0.4).
+        """
+        lines = []
+        with self._lock:
+            _histogram(lines, 'http_request_duration_seconds', 'Latencia de las peticiones', self.latency, ('endpoint', 'method'))
+            _histogram(lines, 'http_request_sql_queries', 'Consultas SQL por petición', self.queries, ('endpoint',))
+            _histogram(lines, 'http_request_sql_duration_seconds', 'Tiempo en SQL por petición', self.sql_time, ('endpoint',))
+            _histogram(lines, 'http_response_size_bytes', 'Tamaño del cuerpo de la respuesta', self.size, ('endpoint',))
+            _counter(lines, 'http_responses_total', 'Respuestas por código de estado', self.responses, ('endpoint', 'method', 'status'))
+            _counter(lines, 'http_n_plus_one_total', 'Peticiones con una sentencia repetida más del umbral',
+                     {(k,): v for k, v in self.n_plus_one.items()}, ('endpoint',))
+            _counter(lines, 'http_rate_limited_total', 'Peticiones rechazadas por el límite de intentos',
+                     self.rate_limited, ('route', 'scope'))
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(names, values, le=None):
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+def _histogram(lines, name, help_text, histograms, label_names):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for key, histogram in sorted(histograms.items()):
+        values = key if isinstance(key, tuple) else (key,)
+        for bound, total in histogram.cumulative():
+            lines.append(f'{name}_bucket{_labels(label_names, values, le=bound)} {total}')
+        lines.append(f'{name}_sum{_labels(label_names, values)} {histogram.sum:.6f}')
+        lines.append(f'{name}_count{_labels(label_names, values)} {histogram.count}')
+
+
+def _counter(lines, name, help_text, counts, label_names):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} counter')
+    for key, value in sorted(counts.items()):
+        lines.append(f'{name}{_labels(label_names, key)} {value}')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'request_stats' in g:
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not (has_request_context() and 'request_stats' in g):
+        return
+    starts = conn.info.get('query_start')
+    if not starts:
+        return
+    stats = g.request_stats
+    stats.queries += 1
+    stats.sql_time += time.perf_counter() - starts.pop()
+    stats.statements[statement] += 1
+
+
+def instrument_engine(engine):
+    """
+    Cuenta las consultas de `engine` en la petición actual (con un motor asíncrono, su sync_engine).
+    """
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def init_metrics(app, engines):
+    """
+    Registra los hooks de la petición y los eventos SQL de `engines`. Con METRICS_ENABLED=0 no
+    hace nada; en modo debug añade la cabecera Server-Timing a cada respuesta.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    metrics = Metrics(app.config.get('METRICS_N_PLUS_ONE_THRESHOLD', 10))
+    app.extensions['metrics'] = metrics
+
+    for engine in engines:
+        instrument_engine(engine)
+
+    @app.before_request
+    def start_request_stats():
+        g.request_stats = RequestStats()
+
+    @app.after_request
+    def record_request_stats(response):
+        stats = g.pop('request_stats', None)
+        if stats is None:
+            return response
+        elapsed = time.perf_counter() - stats.start
+        # Las respuestas en streaming (export) no tienen tamaño conocido
+        size = None if response.is_streamed else response.content_length
+        metrics.record(request.endpoint or 'not_found', request.method, response.status_code, stats, elapsed, size)
+        if app.debug:
+            response.headers['Server-Timing'] = (
+                f'app;dur={elapsed * 1000:.1f}, db;dur={stats.sql_time * 1000:.1f};desc="{stats.queries} queries"'
+            )
+        return response
@@ -7,3 +7,6 @@ from .service import Service
 from .scheduled_income import ScheduledIncome
 from .loan_payment import LoanPayment
 from .service_payment import ServicePayment
+from .monthly_rollup import MonthlyRollup
+from .resource_version import ResourceVersion
+from .revoked_token import RevokedToken
@@ -2,6 +2,9 @@ from app import db
 
 class Account(db.Model):
     __tablename__ = 'accounts'
+    __table_args__ = (
+        db.Index('ix_accounts_user_id', 'user_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     account_name = db.Column(db.String(50), nullable=False)
     card = db.Column(db.String(50), nullable=False)
@@ -2,6 +2,13 @@ from app import db
 
 class Income(db.Model):
     __tablename__ = 'incomes'
+    __table_args__ = (
+        db.Index('ix_incomes_user_id_income_date', 'user_id', 'income_date'),
+        db.Index('ix_incomes_account_id', 'account_id'),
+        # Listados filtrados por ?account_id= o ?category= en orden de fecha
+        db.Index('ix_incomes_user_id_account_id_income_date', 'user_id', 'account_id', 'income_date'),
+        db.Index('ix_incomes_user_id_category_income_date', 'user_id', 'category', 'income_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     income_name = db.Column(db.String(50), nullable=False)
     income_date = db.Column(db.DateTime, nullable=False)
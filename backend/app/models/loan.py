@@ -2,6 +2,10 @@ from app import db
 
 class Loan(db.Model):
     __tablename__ = 'loans'
+    __table_args__ = (
+        db.Index('ix_loans_user_id_date', 'user_id', 'date'),
+        db.Index('ix_loans_account_id', 'account_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     loan_name = db.Column(db.String(50), nullable=False)
     holder = db.Column(db.String(50), nullable=False)
@@ -2,6 +2,10 @@ from app import db
 
 class LoanPayment(db.Model):
     __tablename__ = 'loan_payments'
+    __table_args__ = (
+        db.Index('ix_loan_payments_user_id_date', 'user_id', 'date'),
+        db.Index('ix_loan_payments_loan_id', 'loan_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Integer, nullable=False)
     date = db.Column(db.DateTime, nullable=False)
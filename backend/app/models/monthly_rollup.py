@@ -0,0 +1,17 @@
+from app import db
+
+class MonthlyRollup(db.Model):
+    __tablename__ = 'monthly_rollups'
+    # La clave única también sirve de índice para las lecturas por (user_id, kind, rango de meses)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'kind', 'year_month', 'account_id', 'category', name='uq_monthly_rollups_key'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    year_month = db.Column(db.String(7), nullable=False)
+    # Sin FK: es un agregado desnormalizado que se reconstruye con `flask rebuild-rollups`
+    account_id = db.Column(db.Integer, nullable=True)
+    category = db.Column(db.String(100), nullable=False)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,8 @@
+from app import db
+
+class ResourceVersion(db.Model):
+    __tablename__ = 'resource_versions'
+    # Contador por usuario y recurso ('incomes', 'summary', ...) que se incrementa en cada escritura
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    resource = db.Column(db.String(30), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
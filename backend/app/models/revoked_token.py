@@ -0,0 +1,10 @@
+from app import db
+
+class RevokedToken(db.Model):
+    __tablename__ = 'revoked_tokens'
+    # Tokens invalidados con /api/auth/logout; cada worker los copia en memoria (app/principal.py)
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    # Vencimiento del token: después ya no hace falta recordarlo (NULL si el token no vence)
+    expires_at = db.Column(db.DateTime, nullable=True, index=True)
@@ -2,6 +2,11 @@ from app import db
 
 class ScheduledIncome(db.Model):
     __tablename__ = 'scheduled_incomes'
+    __table_args__ = (
+        db.Index('ix_scheduled_incomes_user_id_income_date', 'user_id', 'income_date'),
+        db.Index('ix_scheduled_incomes_next_income', 'next_income'),
+        db.Index('ix_scheduled_incomes_account_id', 'account_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     income_name = db.Column(db.String(50), nullable=False)
     income_date = db.Column(db.DateTime, nullable=False)
@@ -13,3 +18,9 @@ class ScheduledIncome(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'))
     pending_amount = db.Column(db.Integer, nullable=False)
     account_id = db.Column(db.Integer, db.ForeignKey('accounts.id', ondelete='CASCADE'))
+    # Cuota que se registra en cada vencimiento (None = todo lo pendiente) y meses entre vencimientos (None = 1)
+    installment_amount = db.Column(db.Integer, nullable=True)
+    interval_months = db.Column(db.Integer, nullable=True)
+    # Reserva del procesador (`flask process-scheduled`): quién tiene la fila y hasta cuándo
+    lease_token = db.Column(db.String(32), nullable=True)
+    lease_until = db.Column(db.DateTime, nullable=True)
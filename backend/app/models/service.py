@@ -2,6 +2,11 @@ from app import db
 
 class Service(db.Model):
     __tablename__ = 'services'
+    __table_args__ = (
+        db.Index('ix_services_user_id_date', 'user_id', 'date'),
+        db.Index('ix_services_account_id', 'account_id'),
+        db.Index('ix_services_user_id_category_date', 'user_id', 'category', 'date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     service_name = db.Column(db.String(60), nullable=False)
     description = db.Column(db.String(160), nullable=True)
@@ -2,6 +2,10 @@ from app import db
 
 class ServicePayment(db.Model):
     __tablename__ = 'service_payments'
+    __table_args__ = (
+        db.Index('ix_service_payments_user_id_date', 'user_id', 'date'),
+        db.Index('ix_service_payments_service_id', 'service_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Integer, nullable=False)
     date = db.Column(db.DateTime, nullable=False)
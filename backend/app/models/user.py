@@ -1,5 +1,5 @@
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.passwords import hasher
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -14,8 +14,11 @@ class User(db.Model):
     # Esto crea la relación inversa para poder usar `user.accounts`
     accounts = db.relationship('Account', back_populates='user', cascade="all, delete-orphan")
 
+    # El hash corre en el pool de app/passwords.py (PASSWORD_HASH_METHOD, PASSWORD_HASH_WORKERS)
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hasher().hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
\ No newline at end of file
+        if not self.password_hash:  # usuarios creados con Google
+            return False
+        return hasher().verify(self.password_hash, password)
\ No newline at end of file
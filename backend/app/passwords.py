@@ -0,0 +1,56 @@
+# Hash de contraseñas en un pool de hilos acotado.
+# scrypt/pbkdf2 de hashlib liberan el GIL, así que los hilos del pool calculan en paralelo en
+# todos los núcleos; el pool limita cuántos hashes corren a la vez y una ráfaga de logins
+# espera su turno (o recibe 503) en lugar de ocupar todos los hilos de los workers.
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HasherBusy(Exception):
+    """El pool de hash tiene la cola llena: el handler responde 503."""
+
+
+class PasswordHasher:
+    def __init__(self, method='scrypt', workers=None, max_pending=None, queue_timeout=5):
+        self.method = method
+        workers = workers or os.cpu_count() or 1
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_pending or workers * 8)
+        # Prefijo con los parámetros completos ('scrypt' -> 'scrypt:32768:8:1') para needs_rehash
+        self.prefix = generate_password_hash('', method).split('$', 1)[0]
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise HasherBusy()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        # Hash hecho con otro método o factor de trabajo: se rehace en el próximo login
+        return password_hash.split('$', 1)[0] != self.prefix
+
+
+def init_passwords(app):
+    app.extensions['password_hasher'] = PasswordHasher(
+        app.config.get('PASSWORD_HASH_METHOD', 'scrypt'),
+        app.config.get('PASSWORD_HASH_WORKERS'),
+        app.config.get('PASSWORD_HASH_MAX_PENDING'),
+        app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5),
+    )
+
+
+def hasher():
+    return current_app.extensions['password_hasher']
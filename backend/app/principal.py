@@ -0,0 +1,156 @@
+# Usuario autenticado de cada petición y revocación de tokens.
+# flask_jwt_extended resuelve el usuario una sola vez por petición (user_lookup_loader) y lo
+# deja en `current_user`; aquí se sirve desde una caché en memoria con TTL, así que /me y los
+# demás endpoints no consultan la tabla users en cada llamada. Los tokens cerrados con
+# /api/auth/logout se guardan en revoked_tokens y cada worker mantiene una copia en memoria
+# que sincroniza como mucho cada TOKEN_REVOCATION_SYNC_SECONDS (sin consulta por petición).
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timezone
+
+from flask import current_app, has_app_context
+from flask_jwt_extended import current_user  # noqa: F401  (accesor para los blueprints)
+from sqlalchemy import event
+
+from app import db, jwt
+from app.models import RevokedToken, User
+
+CurrentUser = namedtuple('CurrentUser', ('id', 'username', 'email', 'email_conf'))
+
+
+def user_query(user_id):
+    return db.select(User.id, User.username, User.email, User.email_conf).where(User.id == int(user_id))
+
+
+class UserCache:
+    """
+    LRU de usuarios por id con TTL. Guarda tuplas inmutables, no instancias del ORM.
+    """
+
+    def __init__(self, ttl=60, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # id -> (expira, CurrentUser)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        user = self.cached(user_id)
+        if user is not None:
+            return user
+        # Siempre de la primaria: un usuario recién registrado puede no estar aún en la réplica
+        row = db.session.execute(user_query(user_id), bind_arguments={'bind': db.engine}).first()
+        return self.store(user_id, row)
+
+    def cached(self, user_id):
+        user_id = int(user_id)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        return None
+
+    def store(self, user_id, row):
+        """
+        Guarda la fila leída con `user_query` (None si el usuario no existe) y la devuelve.
+        """
+        if row is None:
+            return None
+        user_id = int(user_id)
+        user = CurrentUser(*row)
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(int(user_id), None)
+
+
+class RevokedTokens:
+    """
+    Copia en memoria de revoked_tokens (jti -> vencimiento). Cada sincronización vuelve a leer
+    todas las revocaciones sin vencer (pocas: la tabla se purga al revocar). Una marca de "último
+    id visto" perdería las filas que se confirman fuera de orden con escrituras concurrentes.
+    """
+
+    def __init__(self, sync_seconds=5):
+        self.sync_seconds = sync_seconds
+        self._expires = {}
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti):
+        if self.stale():
+            self.sync()
+        return jti in self._expires
+
+    def stale(self):
+        return time.monotonic() >= self._next_sync
+
+    def sync(self):
+        with self._lock:
+            self.apply(db.session.execute(self.pending_query(), bind_arguments={'bind': db.engine}).all())
+
+    def pending_query(self):
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return db.select(RevokedToken.jti, RevokedToken.expires_at).where(
+            db.or_(RevokedToken.expires_at.is_(None), RevokedToken.expires_at > now),
+        )
+
+    def apply(self, rows):
+        """
+        Incorpora las filas leídas con `pending_query` y programa la próxima sincronización.
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        # Se suma a lo que ya había: una revocación de este worker aún sin commit no se pierde
+        for jti, expires_at in rows:
+            self._expires[jti] = expires_at
+        # Los tokens vencidos ya los rechaza la verificación del JWT
+        self._expires = {j: e for j, e in self._expires.items() if e is None or e > now}
+        self._next_sync = time.monotonic() + self.sync_seconds
+
+    def revoke(self, jti, user_id, expires_at):
+        """
+        Registra el token en la BD (el llamador hace commit) y en la copia de este worker.
+        """
+        db.session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        db.session.execute(db.delete(RevokedToken).where(RevokedToken.expires_at < now))
+        with self._lock:
+            self._expires[jti] = expires_at
+
+
+@jwt.user_lookup_loader
+def _load_user(jwt_header, jwt_data):
+    return current_app.extensions['user_cache'].get(jwt_data[current_app.config['JWT_IDENTITY_CLAIM']])
+
+
+@jwt.token_in_blocklist_loader
+def _token_revoked(jwt_header, jwt_data):
+    return current_app.extensions['revoked_tokens'].is_revoked(jwt_data['jti'])
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_user(mapper, connection, target):
+    # En este worker al instante; en los demás al vencer el TTL
+    if has_app_context() and 'user_cache' in current_app.extensions:
+        current_app.extensions['user_cache'].invalidate(target.id)
+
+
+def init_principal(app):
+    app.extensions['user_cache'] = UserCache(app.config.get('USER_CACHE_TTL', 60),
+                                             app.config.get('USER_CACHE_MAX_ENTRIES', 10000))
+    app.extensions['revoked_tokens'] = RevokedTokens(app.config.get('TOKEN_REVOCATION_SYNC_SECONDS', 5))
+
+
+def revoke_token(jwt_data):
+    expires_at = None
+    if 'exp' in jwt_data:
+        expires_at = datetime.fromtimestamp(jwt_data['exp'], timezone.utc).replace(tzinfo=None)
+    current_app.extensions['revoked_tokens'].revoke(jwt_data['jti'], int(jwt_data[current_app.config['JWT_IDENTITY_CLAIM']]), expires_at)
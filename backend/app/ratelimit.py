@@ -0,0 +1,169 @@
+# Límite de intentos (token bucket) para los endpoints de auth: cada intento de login o
+# registro cuesta un hash de contraseña, así que se limitan por IP y por email antes de
+# llegar al handler. Backends intercambiables como los de la caché de respuestas: en memoria
+# del proceso (por defecto) o Redis, compartido entre workers.
+import re
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+# Script atómico del token bucket en Redis: devuelve {permitido, segundos hasta el próximo token}
+_REDIS_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(retry)}
+"""
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_rule(rule):
+    """
+    '5/minute' -> (capacidad 5, 5/60 tokens por segundo). También '10/15minute'.
+    """
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(\d*)\s*(second|minute|hour|day)s?\s*', rule)
+    if not match:
+        raise ValueError(f'Regla de rate limit inválida: {rule!r}')
+    amount, multiplier, period = int(match.group(1)), int(match.group(2) or 1), match.group(3)
+    return amount, amount / (multiplier * PERIODS[period])
+
+
+class MemoryRateLimitBackend:
+    """
+    Buckets en memoria del proceso (cada worker cuenta por separado).
+    """
+
+    def __init__(self, max_entries=100_000):
+        self.max_entries = max_entries
+        self._buckets = {}  # key -> (tokens, ts)
+        self._lock = threading.Lock()
+
+    def hit(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                allowed, retry = True, 0.0
+            else:
+                self._buckets[key] = (tokens, now)
+                allowed, retry = False, (1 - tokens) / rate
+            if len(self._buckets) > self.max_entries:
+                self._prune(now)
+        return allowed, retry
+
+    def _prune(self, now):
+        # Descarta la mitad menos usada recientemente (lo más probable es que ya estén llenos)
+        for key, _ in sorted(self._buckets.items(), key=lambda item: item[1][1])[:len(self._buckets) // 2]:
+            del self._buckets[key]
+
+
+class RedisRateLimitBackend:
+    def __init__(self, client, prefix='rl:'):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key, capacity, rate):
+        allowed, retry = self.client.eval(_REDIS_BUCKET, 1, self.prefix + key, capacity, rate, time.time())
+        return bool(int(allowed)), float(retry)
+
+
+class RateLimiter:
+    """
+    Extensión (init_app). RATE_LIMIT_BACKEND: 'memory' (por defecto), 'redis' (RATE_LIMIT_URL o
+    RESPONSE_CACHE_URL) o 'none'. Las reglas de cada ruta salen de RATE_LIMITS.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        kind = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+        if kind == 'memory':
+            self.backend = MemoryRateLimitBackend(app.config.get('RATE_LIMIT_MAX_ENTRIES', 100_000))
+        elif kind == 'redis':
+            client = app.config.get('RATE_LIMIT_CLIENT')
+            if client is None:
+                try:
+                    import redis
+                except ImportError:
+                    raise RuntimeError("RATE_LIMIT_BACKEND='redis' requiere el paquete redis")
+                client = redis.Redis.from_url(app.config.get('RATE_LIMIT_URL') or app.config['RESPONSE_CACHE_URL'])
+            self.backend = RedisRateLimitBackend(client)
+        elif kind == 'none':
+            self.backend = None
+        else:
+            raise ValueError(f'RATE_LIMIT_BACKEND desconocido: {kind}')
+        # Valida las reglas al iniciar en lugar de en la primera petición
+        for rules in app.config.get('RATE_LIMITS', {}).values():
+            for rule in rules.values():
+                parse_rule(rule)
+        app.extensions['rate_limiter'] = self
+
+    def check(self, name, keys):
+        """
+        Consume un token de cada bucket (scope -> valor) de la ruta `name`. Devuelve None si se
+        permite o (scope, segundos de espera) del primer límite superado.
+        """
+        rules = current_app.config.get('RATE_LIMITS', {}).get(name, {})
+        for scope, value in keys.items():
+            if value is None or scope not in rules:
+                continue
+            capacity, rate = parse_rule(rules[scope])
+            allowed, retry = self.backend.hit(f'{name}:{scope}:{value}', capacity, rate)
+            if not allowed:
+                metrics = current_app.extensions.get('metrics')
+                if metrics is not None:
+                    metrics.count_rate_limited(name, scope)
+                return scope, retry
+        return None
+
+
+def client_ip():
+    # Detrás de un proxy (RATE_LIMIT_PROXY_HOPS > 0) la IP real viene en X-Forwarded-For
+    hops = current_app.config.get('RATE_LIMIT_PROXY_HOPS', 0)
+    forwarded = [ip.strip() for ip in request.headers.get('X-Forwarded-For', '').split(',') if ip.strip()]
+    if hops > 0 and len(forwarded) >= hops:
+        return forwarded[-hops]
+    return request.remote_addr
+
+
+def rate_limit(name):
+    """
+    Decorador: aplica RATE_LIMITS[name] por IP ('ip') y por el email del cuerpo ('email').
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            limiter = current_app.extensions.get('rate_limiter')
+            if limiter is not None and limiter.backend is not None:
+                data = request.get_json(silent=True)
+                email = data.get('email') if isinstance(data, dict) else None
+                keys = {'ip': client_ip(), 'email': email.strip().lower() if isinstance(email, str) else None}
+                exceeded = limiter.check(name, keys)
+                if exceeded is not None:
+                    retry_after = max(int(exceeded[1] + 0.999), 1)
+                    return jsonify({'msg': 'Demasiados intentos, intenta de nuevo más tarde'}), 429, {'Retry-After': str(retry_after)}
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
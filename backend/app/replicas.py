@@ -0,0 +1,98 @@
+# Réplica de lectura opcional (SQLALCHEMY_BINDS['replica']).
+# Los SELECT de las peticiones GET van a la réplica y todo lo demás (flush, UPDATE/INSERT/DELETE,
+# peticiones que escriben) a la primaria. Tras una escritura, el mismo usuario sigue leyendo de la
+# primaria durante REPLICA_READ_YOUR_WRITES_SECONDS para no ver datos atrasados por el retraso
+# de la replicación.
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = 'replica'
+# Blueprints que leen siempre de la primaria (el login crea usuarios desde un GET de OAuth)
+PRIMARY_BLUEPRINTS = ('auth_bp',)
+
+
+class RoutingSession(Session):
+    """
+    Sesión que devuelve el motor de la réplica para los SELECT cuando la petición actual lo permite.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and getattr(clause, 'is_select', False) and use_replica():
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _current_user():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:  # endpoint sin @jwt_required
+        return None
+
+
+def use_replica():
+    if not has_request_context():
+        return False
+    decision = g.get('use_replica')
+    if decision is None:
+        tracker = current_app.extensions.get('replica_writes')
+        decision = (
+            tracker is not None
+            and request.method == 'GET'
+            and request.blueprint not in PRIMARY_BLUEPRINTS
+            and not tracker.recent(_current_user())
+        )
+        g.use_replica = decision
+    return decision
+
+
+class RecentWrites:
+    """
+    Usuarios que escribieron hace menos de `window` segundos. En memoria del proceso o, si la
+    caché de respuestas usa Redis, en el mismo servidor (compartido entre workers).
+    """
+
+    def __init__(self, window, client=None, prefix='rw:'):
+        self.window = window
+        self.client = client
+        self.prefix = prefix
+        self._until = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id):
+        if user_id is None or self.window <= 0:
+            return
+        if self.client is not None:
+            self.client.set(self.prefix + str(user_id), 1, px=int(self.window * 1000))
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._until[str(user_id)] = now + self.window
+            if len(self._until) > 10000:
+                self._until = {k: v for k, v in self._until.items() if v > now}
+
+    def recent(self, user_id):
+        if user_id is None or self.window <= 0:
+            return False
+        if self.client is not None:
+            return bool(self.client.exists(self.prefix + str(user_id)))
+        return self._until.get(str(user_id), 0) > time.monotonic()
+
+
+def init_replicas(app, response_cache):
+    """
+    Activa el enrutado si hay un bind 'replica'. Se llama después de db.init_app.
+    """
+    if REPLICA_BIND not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        return
+    client = getattr(response_cache.backend, 'client', None)
+    app.extensions['replica_writes'] = RecentWrites(app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 5), client)
+
+
+def mark_write(user_id):
+    tracker = current_app.extensions.get('replica_writes')
+    if tracker is not None:
+        tracker.mark(user_id)
@@ -1,25 +1,30 @@
 from flask import Blueprint, request, jsonify
 from app.models.account import Account
 from app import db
+from app.schemas import ACCOUNT_SCHEMA
+from app.routes.pagination import list_response
+from app.routes.caching import track_writes
+from app.controllers import rollups
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
-accounts_bp = Blueprint('accounts_bp', __name__)
+accounts_bp = track_writes(Blueprint('accounts_bp', __name__), 'accounts')
+
 
 @accounts_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_accounts():
     user_id = get_jwt_identity()
-    accounts = Account.query.filter_by(user_id=user_id).all()
-    return jsonify([{'id': a.id, 'account_name': a.account_name, 'card': a.card, 'balance': a.balance} for a in accounts])
+    return list_response(ACCOUNT_SCHEMA, user_id)
 
 @accounts_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_account():
     user_id = get_jwt_identity()
-    data = request.get_json()
-    if not data or not all(k in data for k in ('account_name', 'card', 'balance')):
-        return jsonify({'msg': 'Faltan datos'}), 400
-    account = Account(account_name=data['account_name'], card=data['card'], balance=data['balance'], user_id=user_id)
+    values, error = ACCOUNT_SCHEMA.parse_create(request.get_json(), user_id)
+    if error:
+        return jsonify({'msg': error}), 400
+
+    account = Account(**values)
     db.session.add(account)
     db.session.commit()
     return jsonify({'msg': 'Cuenta creada', 'id': account.id}), 201
@@ -31,10 +36,11 @@ def update_account(account_id):
     account = Account.query.filter_by(id=account_id, user_id=user_id).first()
     if not account:
         return jsonify({'msg': 'Cuenta no encontrada'}), 404
-    data = request.get_json()
-    for field in ['account_name', 'card', 'balance']:
-        if field in data:
-            setattr(account, field, data[field])
+    values, error = ACCOUNT_SCHEMA.parse_update(request.get_json())
+    if error:
+        return jsonify({'msg': error}), 400
+    for field, value in values.items():
+        setattr(account, field, value)
     db.session.commit()
     return jsonify({'msg': 'Cuenta actualizada'})
 
@@ -46,5 +52,6 @@ def delete_account(account_id):
     if not account:
         return jsonify({'msg': 'Cuenta no encontrada'}), 404
     db.session.delete(account)
+    rollups.rebuild(user_id)
     db.session.commit()
     return jsonify({'msg': 'Cuenta eliminada'})
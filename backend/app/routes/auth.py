@@ -1,12 +1,14 @@
 import os
-from flask import Blueprint, request, jsonify, redirect, url_for, current_app, session
+from flask import Blueprint, request, jsonify, redirect, url_for, session
 from app.models.user import User
 from app.models.account import Account
 from app import db
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt
+from app.principal import current_user, revoke_token
 from google_auth_oauthlib.flow import Flow
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+from app.google_auth import http_adapter, verify_google_id_token
+from app.passwords import HasherBusy, hasher
+from app.ratelimit import rate_limit
 
 auth_bp = Blueprint('auth_bp', __name__)
 
@@ -28,7 +30,7 @@ def get_google_flow():
         }
     }
 
-    return Flow.from_client_config(
+    flow = Flow.from_client_config(
         client_config=client_config,
         scopes=[
             "https://www.googleapis.com/auth/userinfo.profile",
@@ -36,6 +38,14 @@ def get_google_flow():
             "openid"
         ]
     )
+    # Reutiliza el pool de conexiones del proceso para el intercambio del código
+    flow.oauth2session.mount('https://', http_adapter)
+    return flow
+
+@auth_bp.errorhandler(HasherBusy)
+def hasher_busy(error):
+    # Ráfaga de logins/registros: el pool de hash tiene la cola llena
+    return jsonify({'msg': 'Servidor ocupado, intenta de nuevo en unos segundos'}), 503, {'Retry-After': '1'}
 
 @auth_bp.route('/google/login')
 def google_login():
@@ -61,11 +71,8 @@ def google_callback():
     flow.fetch_token(authorization_response=request.url)
 
     credentials = flow.credentials
-    id_info = id_token.verify_oauth2_token(
-        id_token=credentials.id_token,
-        request=google_requests.Request(),
-        audience=current_app.config['GOOGLE_CLIENT_ID']
-    )
+    # Certificados de Google en caché (app/google_auth.py)
+    id_info = verify_google_id_token(credentials.id_token)
 
     # Lógica para encontrar o crear el usuario
     user = User.query.filter_by(email=id_info.get('email')).first()
@@ -91,6 +98,7 @@ def google_callback():
 # --- FIN DE LA IMPLEMENTACIÓN DE GOOGLE OAUTH ---
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit('register')
 def register():
     data = request.get_json()
     if not data or not all(k in data for k in ('username', 'email', 'password')):
@@ -118,12 +126,17 @@ def register():
     return jsonify({'msg': 'Usuario registrado correctamente'}), 201
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit('login')
 def login():
     data = request.get_json()
     if not data or not all(k in data for k in ('email', 'password')):
         return jsonify({'msg': 'Faltan datos'}), 400
     user = User.query.filter_by(email=data['email']).first()
     if user and user.check_password(data['password']):
+        if hasher().needs_rehash(user.password_hash):
+            # Cambió PASSWORD_HASH_METHOD: se actualiza el hash con la contraseña ya verificada
+            user.set_password(data['password'])
+            db.session.commit()
         access_token = create_access_token(identity=str(user.id))
         return jsonify({'access_token': access_token, 'user': {'id': user.id, 'username': user.username, 'email': user.email}})
     return jsonify({'msg': 'Credenciales incorrectas'}), 401
@@ -131,8 +144,12 @@ def login():
 @auth_bp.route('/me', methods=['GET'])
 @jwt_required()
 def me():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'Usuario no encontrado'}), 404
-    return jsonify({'id': user.id, 'username': user.username, 'email': user.email})
+    # current_user viene de la caché de usuarios (sin consulta a la BD en cada navegación)
+    return jsonify({'id': current_user.id, 'username': current_user.username, 'email': current_user.email})
+
+@auth_bp.route('/logout', methods=['POST'])
+@jwt_required()
+def logout():
+    revoke_token(get_jwt())
+    db.session.commit()
+    return jsonify({'msg': 'Sesión cerrada'})
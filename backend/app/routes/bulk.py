@@ -0,0 +1,73 @@
+# Helper compartido por los endpoints /bulk: alta y baja de muchos elementos en una transacción.
+from flask import request, jsonify, current_app
+from app import db
+from app.controllers import rollups, ledger
+from app.controllers.ownership import foreign_parents
+
+
+def _check_size(items):
+    max_items = current_app.config['BULK_MAX_ITEMS']
+    if len(items) > max_items:
+        return jsonify({'msg': f'Máximo {max_items} elementos por petición'}), 413
+    return None
+
+
+def bulk_create(model, parse, user_id, kind=None):
+    """
+    Valida todos los elementos con `parse` (la misma función que usa el POST individual) y que
+    su cuenta/servicio/préstamo sea del usuario y, si son válidos, los inserta con un único INSERT multi-fila. Si alguno es inválido no se
+    inserta ninguno y se devuelven los errores por índice.
+    """
+    data = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else data
+    if not isinstance(items, list) or not items:
+        return jsonify({'msg': 'Se esperaba una lista de elementos'}), 400
+    too_large = _check_size(items)
+    if too_large:
+        return too_large
+
+    rows, indexes, errors = [], [], []
+    for index, item in enumerate(items):
+        values, error = parse(item, user_id)
+        if error:
+            errors.append({'index': index, 'msg': error})
+        else:
+            rows.append(values)
+            indexes.append(index)
+    foreign = foreign_parents(rows, user_id)
+    if foreign:
+        errors += [{'index': indexes[position], 'msg': msg} for position, msg in foreign.items()]
+        errors.sort(key=lambda error: error['index'])
+    if errors:
+        return jsonify({'msg': 'Hay elementos inválidos, no se creó ninguno', 'errors': errors}), 400
+
+    ids = db.session.scalars(db.insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+    if kind:
+        rollups.add_rows(kind, rows)
+        ledger.post_rows(kind, rows, user_id)
+    db.session.commit()
+    return jsonify({'msg': f'{len(ids)} elementos creados', 'ids': ids}), 201
+
+
+def bulk_delete(model, user_id, kind=None):
+    """
+    Elimina los elementos del usuario cuyos ids vienen en {"ids": [...]}.
+    """
+    data = request.get_json(silent=True)
+    ids = data.get('ids') if isinstance(data, dict) else None
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+        return jsonify({'msg': 'Se esperaba {"ids": [enteros]}'}), 400
+    too_large = _check_size(ids)
+    if too_large:
+        return too_large
+
+    rows = db.session.scalars(db.select(model).where(model.id.in_(ids), model.user_id == user_id)).all()
+    found = [row.id for row in rows]
+    if kind:
+        rollups.remove_rows(kind, rows)
+        ledger.reverse_rows(kind, rows, user_id)
+    if found:
+        db.session.execute(db.delete(model).where(model.id.in_(found)))
+    db.session.commit()
+    missing = sorted(set(ids) - set(found))
+    return jsonify({'msg': f'{len(found)} elementos eliminados', 'deleted': found, 'not_found': missing})
@@ -0,0 +1,94 @@
+# ETags débiles y caché de respuestas por usuario y recurso para los GET de listados y resumen.
+import zlib
+
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity
+from app import db, response_cache
+from app.controllers import versions
+from app.replicas import mark_write
+
+WRITE_METHODS = ('POST', 'PUT', 'DELETE')
+
+
+def _etag(user_id, resource, version, vary=''):
+    # La query string forma parte del ETag porque ?fields=, ?limit= o ?from= cambian el contenido
+    query_hash = zlib.crc32(request.query_string + vary.encode()) & 0xffffffff
+    return f'u{user_id}-{resource}-v{version}-{query_hash:08x}'
+
+
+def cache_group(user_id, resource):
+    return f'{user_id}:{resource}'
+
+
+def cached_response(user_id, resource, build, vary=''):
+    """
+    Responde un GET de `resource` (`vary` distingue respuestas que además dependen de otra
+    cosa, p. ej. la fecha del día):
+    - 304 si el If-None-Match del cliente coincide con la versión actual (sin consultar la tabla),
+    - la respuesta cacheada para (usuario, recurso, query string) si se generó con esta versión,
+    - o `build()`, que se guarda en la caché si es un 200.
+    La versión guardada en cada entrada evita servir datos viejos de otro worker o de una
+    lectura que se cruzó con una escritura.
+    """
+    version = versions.current(user_id, resource)
+    response = cached_lookup(user_id, resource, version, vary)
+    if response is None:
+        response = store_response(make_response(build()), user_id, resource, version, vary)
+    return response
+
+
+def _cache_key(user_id, resource, vary):
+    return f'{cache_group(user_id, resource)}:{request.query_string.decode()}:{vary}'
+
+
+def cached_lookup(user_id, resource, version, vary=''):
+    """
+    Primera mitad de `cached_response`: el 304 o la respuesta cacheada, o None si hay que generarla.
+    """
+    etag = _etag(user_id, resource, version, vary)
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        return response
+
+    entry = response_cache.get(_cache_key(user_id, resource, vary), version) if response_cache.enabled else None
+    if entry is None:
+        return None
+    body, headers = entry
+    response = make_response(body)
+    response.mimetype = 'application/json'
+    response.headers.update(headers)
+    response.set_etag(etag, weak=True)
+    return response
+
+
+def store_response(response, user_id, resource, version, vary=''):
+    """
+    Segunda mitad de `cached_response`: guarda un 200 recién generado y le pone el ETag.
+    """
+    if response.status_code == 200:
+        if response_cache.enabled:
+            headers = {k: v for k, v in response.headers.items() if k == 'X-Next-Cursor'}
+            response_cache.set(_cache_key(user_id, resource, vary), version, response.get_data(as_text=True),
+                               headers, cache_group(user_id, resource))
+        response.set_etag(_etag(user_id, resource, version, vary), weak=True)
+    return response
+
+
+def track_writes(blueprint, *resources):
+    """
+    Tras cada POST/PUT/DELETE correcto del blueprint incrementa la versión de `resources`
+    (y de sus dependientes) e invalida sus respuestas cacheadas. Se hace después del commit
+    del handler: un lector concurrente puede ver datos nuevos con la versión vieja, nunca al revés.
+    """
+    @blueprint.after_request
+    def bump_versions(response):
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            user_id = get_jwt_identity()
+            versions.bump(user_id, resources)
+            db.session.commit()
+            response_cache.invalidate(cache_group(user_id, r) for r in versions.affected(resources))
+            # Sus próximas lecturas van a la primaria hasta que la réplica se ponga al día
+            mark_write(user_id)
+        return response
+    return blueprint
@@ -0,0 +1,63 @@
+import csv
+
+from flask import Blueprint, request, jsonify, Response, stream_with_context, current_app
+from app.controllers.export import iter_ledger, EXPORT_FIELDS
+from app.routes.params import parse_date_range
+from app.routes.pagination import serialize_value
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+export_bp = Blueprint('export_bp', __name__)
+
+
+class _Line:
+    # csv.writer escribe en este objeto y devuelve la línea formateada
+    def write(self, value):
+        return value
+
+
+def _csv_chunks(batches):
+    writer = csv.writer(_Line())
+    yield writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        yield ''.join(writer.writerow([serialize_value(v) for v in row]) for row in batch)
+
+
+def _ndjson_chunks(batches):
+    # El proveedor JSON de la app serializa las fechas
+    dumps = current_app.json.dumps
+    for batch in batches:
+        yield ''.join(dumps(dict(zip(EXPORT_FIELDS, row))) + '\n' for row in batch)
+
+
+@export_bp.route('/', methods=['GET'])
+@jwt_required()
+def export_ledger():
+    user_id = get_jwt_identity()
+
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({'msg': 'Formato no válido. Usar csv o ndjson.'}), 400
+    try:
+        date_from, date_to = parse_date_range()
+    except ValueError:
+        return jsonify({'msg': 'Formato de fecha inválido. Usar YYYY-MM-DD.'}), 400
+    account_id = None
+    if request.args.get('account_id'):
+        try:
+            account_id = int(request.args['account_id'])
+        except ValueError:
+            # Ignorarlo exportaría todo el historial en lugar de una cuenta
+            return jsonify({'msg': 'El parámetro account_id debe ser un número'}), 400
+
+    batches = iter_ledger(user_id, date_from, date_to, account_id, current_app.config['EXPORT_BATCH_SIZE'])
+    if export_format == 'csv':
+        chunks, mimetype = _csv_chunks(batches), 'text/csv'
+    else:
+        chunks, mimetype = _ndjson_chunks(batches), 'application/x-ndjson'
+
+    # stream_with_context mantiene la sesión de la BD abierta mientras se envía la respuesta
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=export.{export_format}'},
+    )
@@ -0,0 +1,88 @@
+# Filtros de la query string para los listados (ListQuery): cuenta, categoría, rango de fechas,
+# rango de importes y búsqueda de texto. Cada uno se traduce a un predicado SQL apoyado en un
+# índice: (user_id, fecha), (user_id, account_id, fecha), (user_id, category, fecha) o el de búsqueda.
+from datetime import timedelta
+
+from flask import request
+
+from app import db, search
+from app.models import Loan, Service
+from app.routes.params import parse_date_range
+
+# Columna de importe de cada tabla para min_amount / max_amount
+AMOUNT_COLUMNS = {
+    'accounts': 'balance',
+    'incomes': 'amount',
+    'services': 'price',
+    'loans': 'price',
+    'scheduled_incomes': 'amount',
+    'loan_payments': 'amount',
+    'service_payments': 'amount',
+}
+# Los pagos no tienen cuenta propia: se filtran por la de su préstamo o servicio
+ACCOUNT_PARENTS = {
+    'loan_payments': (Loan, 'loan_id'),
+    'service_payments': (Service, 'service_id'),
+}
+
+
+def _unavailable(param):
+    return ValueError(f'Filtro no disponible en este listado: {param}')
+
+
+def _number(param, convert=float):
+    try:
+        return convert(request.args[param])
+    except ValueError:
+        raise ValueError(f'El parámetro {param} debe ser un número')
+
+
+def apply_filters(stmt, table, user_id, date_field=None):
+    """
+    Añade a `stmt` la condición del usuario y los filtros presentes en la query string:
+    account_id, category, from/to (YYYY-MM-DD, ambos inclusive), min_amount/max_amount y q
+    (todas las palabras, como prefijos, en nombre y descripción). Lanza ValueError si un
+    parámetro es inválido o el listado no tiene ese campo.
+    """
+    args = request.args
+    query_terms = search.terms(args.get('q', ''))
+    stmt = stmt.where(search.owner(table, user_id, query_terms))
+    if args.get('account_id'):
+        account_id = _number('account_id', int)
+        if 'account_id' in table.c:
+            stmt = stmt.where(table.c.account_id == account_id)
+        elif table.name in ACCOUNT_PARENTS:
+            parent, key = ACCOUNT_PARENTS[table.name]
+            stmt = stmt.where(table.c[key].in_(
+                db.select(parent.id).where(parent.user_id == user_id, parent.account_id == account_id)
+            ))
+        else:
+            raise _unavailable('account_id')
+
+    if args.get('category'):
+        if 'category' not in table.c:
+            raise _unavailable('category')
+        stmt = stmt.where(table.c.category == args['category'])
+
+    if args.get('from') or args.get('to'):
+        if date_field is None:
+            raise _unavailable('from/to')
+        try:
+            date_from, date_to = parse_date_range()
+        except ValueError:
+            raise ValueError('Formato de fecha inválido. Usar YYYY-MM-DD.')
+        date_column = table.c[date_field]
+        if date_from:
+            stmt = stmt.where(date_column >= date_from)
+        if date_to:
+            stmt = stmt.where(date_column < date_to + timedelta(days=1))
+
+    amount = table.c[AMOUNT_COLUMNS[table.name]]
+    if args.get('min_amount'):
+        stmt = stmt.where(amount >= _number('min_amount'))
+    if args.get('max_amount'):
+        stmt = stmt.where(amount <= _number('max_amount'))
+
+    if query_terms:
+        stmt = stmt.where(search.predicate(table, query_terms))
+    return stmt
@@ -0,0 +1,27 @@
+from datetime import date
+
+from flask import Blueprint, request, jsonify, current_app
+from app.controllers.forecast import project, GRANULARITIES
+from app.routes.caching import cached_response
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+forecast_bp = Blueprint('forecast_bp', __name__)
+
+@forecast_bp.route('/', methods=['GET'])
+@jwt_required()
+def get_forecast():
+    user_id = get_jwt_identity()
+    # La proyección parte de hoy: la respuesta cacheada vale hasta que cambie la fecha o una tabla de entrada
+    today = date.today()
+    return cached_response(user_id, 'forecast', lambda: _build_forecast(user_id, today), vary=today.isoformat())
+
+def _build_forecast(user_id, today):
+    max_months = current_app.config['FORECAST_MAX_MONTHS']
+    months = request.args.get('months', 12, type=int)
+    if months is None or not 1 <= months <= max_months:
+        return jsonify({'msg': f'El parámetro months debe ser un entero entre 1 y {max_months}'}), 400
+    granularity = request.args.get('granularity', 'month')
+    if granularity not in GRANULARITIES:
+        return jsonify({'msg': f"Granularidad no válida. Usar: {', '.join(GRANULARITIES)}"}), 400
+
+    return jsonify(project(user_id, months, granularity, today))
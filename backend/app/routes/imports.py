@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify, current_app
+from app.controllers.importer import import_records, IMPORT_FIELDS, IMPORT_KINDS
+from app.routes.caching import track_writes
+from app.schemas import INCOME_SCHEMA, SERVICE_PAYMENT_SCHEMA, LOAN_PAYMENT_SCHEMA
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+import_bp = track_writes(Blueprint('import_bp', __name__), 'incomes', 'service_payments', 'loan_payments')
+
+PARSERS = {
+    'incomes': INCOME_SCHEMA.parse_create,
+    'service_payments': SERVICE_PAYMENT_SCHEMA.parse_create,
+    'loan_payments': LOAN_PAYMENT_SCHEMA.parse_create,
+}
+
+
+class _RawInput(io.RawIOBase):
+    """
+    Adapta un stream que solo tiene read() (p. ej. el Body de gunicorn, que Werkzeug entrega
+    tal cual con wsgi.input_terminated) a la interfaz io que necesita TextIOWrapper.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _records(reader, mapping, defaults, default_kind, date_format):
+    """
+    Recorre el CSV fila a fila y genera (línea, kind, registro canónico) aplicando el mapeo
+    de columnas, los valores por defecto y el formato de fecha del banco.
+    """
+    for row in reader:
+        record = {}
+        for field in IMPORT_FIELDS:
+            value = row.get(mapping.get(field, field))
+            record[field] = value.strip() if isinstance(value, str) and value.strip() else defaults.get(field)
+        if date_format and record['date']:
+            try:
+                record['date'] = datetime.strptime(record['date'], date_format).date().isoformat()
+            except ValueError:
+                pass  # lo rechaza la validación del blueprint
+        yield reader.line_num, record['kind'] or default_kind, record
+
+
+@import_bp.route('/', methods=['POST'])
+@jwt_required()
+def import_ledger():
+    user_id = get_jwt_identity()
+
+    # Archivo multipart (campo "file") o cuerpo text/csv; en ambos casos se lee como stream
+    upload = request.files.get('file')
+    if upload:
+        stream = upload.stream
+    elif request.mimetype == 'text/csv':
+        stream = request.stream
+    else:
+        return jsonify({'msg': 'Se esperaba un archivo CSV (campo "file" o cuerpo text/csv)'}), 400
+
+    kind = request.values.get('kind', 'incomes')
+    if kind not in IMPORT_KINDS:
+        return jsonify({'msg': f"Tipo no válido. Usar: {', '.join(IMPORT_KINDS)}"}), 400
+    try:
+        # {"date": "Fecha", "amount": "Monto", ...}: columna del CSV para cada campo canónico
+        mapping = json.loads(request.values.get('mapping') or '{}')
+        if not isinstance(mapping, dict):
+            raise ValueError
+    except ValueError:
+        return jsonify({'msg': 'El mapeo de columnas debe ser un objeto JSON'}), 400
+    defaults = {field: request.values[field] for field in IMPORT_FIELDS if request.values.get(field)}
+
+    if not isinstance(stream, io.IOBase):
+        stream = io.BufferedReader(_RawInput(stream))
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text)
+    records = _records(reader, mapping, defaults, kind, request.values.get('date_format'))
+    report = import_records(records, user_id, PARSERS, current_app.config['IMPORT_BATCH_SIZE'])
+    return jsonify({'msg': 'Importación finalizada', **report})
@@ -1,46 +1,48 @@
 from flask import Blueprint, request, jsonify
 from app.models.income import Income
 from app import db
+from app.schemas import INCOME_SCHEMA
+from app.routes.pagination import list_response
+from app.routes.caching import track_writes
+from app.routes.bulk import bulk_create, bulk_delete
+from app.controllers import rollups
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
 
-incomes_bp = Blueprint('incomes_bp', __name__)
+incomes_bp = track_writes(Blueprint('incomes_bp', __name__), 'incomes')
+
 
 @incomes_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_incomes():
     user_id = get_jwt_identity()
-    incomes = Income.query.filter_by(user_id=user_id).all()
-    return jsonify([{'id': i.id, 'income_name': i.income_name, 'income_date': i.income_date.isoformat(), 'description': i.description, 'category': i.category, 'amount': i.amount, 'account_id': i.account_id} for i in incomes])
+    return list_response(INCOME_SCHEMA, user_id, date_field='income_date')
 
 @incomes_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_income():
     user_id = get_jwt_identity()
-    data = request.get_json()
-    
-    required_fields = ['income_name', 'income_date', 'amount', 'category', 'account_id']
-    if not all(field in data and data[field] not in [None, ''] for field in required_fields):
-        return jsonify({'msg': 'Faltan campos obligatorios'}), 400
-    
-    try:
-        income_date_obj = datetime.fromisoformat(data['income_date']).date()
-    except ValueError:
-        return jsonify({'msg': 'Formato de fecha inválido. Usar YYYY-MM-DD.'}), 400
+    values, error = INCOME_SCHEMA.parse_create(request.get_json(), user_id)
+    if error:
+        return jsonify({'msg': error}), 400
 
-    income = Income(
-        income_name=data['income_name'],
-        income_date=income_date_obj,
-        description=data.get('description'),
-        category=data['category'],
-        amount=data['amount'],
-        user_id=user_id,
-        account_id=data['account_id']
-    )
+    income = Income(**values)
     db.session.add(income)
+    rollups.add_row('incomes', income)
     db.session.commit()
     return jsonify({'msg': 'Ingreso creado', 'id': income.id}), 201
 
+@incomes_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def create_incomes_bulk():
+    user_id = get_jwt_identity()
+    return bulk_create(Income, INCOME_SCHEMA.parse_create, user_id, kind='incomes')
+
+@incomes_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def delete_incomes_bulk():
+    user_id = get_jwt_identity()
+    return bulk_delete(Income, user_id, kind='incomes')
+
 @incomes_bp.route('/<int:income_id>', methods=['PUT'])
 @jwt_required()
 def update_income(income_id):
@@ -48,17 +50,14 @@ def update_income(income_id):
     income = Income.query.filter_by(id=income_id, user_id=user_id).first()
     if not income:
         return jsonify({'msg': 'Ingreso no encontrado'}), 404
-    data = request.get_json()
-    
-    try:
-        if 'income_date' in data and data['income_date']:
-            data['income_date'] = datetime.fromisoformat(data['income_date']).date()
-    except (ValueError, TypeError):
-        return jsonify({'msg': 'Formato de fecha inválido en la actualización.'}), 400
+    values, error = INCOME_SCHEMA.parse_update(request.get_json())
+    if error:
+        return jsonify({'msg': error}), 400
 
-    for field in ['income_name', 'income_date', 'description', 'category', 'amount', 'account_id']:
-        if field in data:
-            setattr(income, field, data[field])
+    rollups.remove_row('incomes', income)
+    for field, value in values.items():
+        setattr(income, field, value)
+    rollups.add_row('incomes', income)
     db.session.commit()
     return jsonify({'msg': 'Ingreso actualizado'})
 
@@ -69,6 +68,7 @@ def delete_income(income_id):
     income = Income.query.filter_by(id=income_id, user_id=user_id).first()
     if not income:
         return jsonify({'msg': 'Ingreso no encontrado'}), 404
+    rollups.remove_row('incomes', income)
     db.session.delete(income)
     db.session.commit()
     return jsonify({'msg': 'Ingreso eliminado'})
\ No newline at end of file
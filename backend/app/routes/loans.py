@@ -1,47 +1,69 @@
 from flask import Blueprint, request, jsonify
 from app.models.loan import Loan
 from app import db
+from app.schemas import LOAN_SCHEMA
+from app.routes.pagination import list_response
+from app.routes.caching import track_writes
+from app.controllers import rollups, amortization
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+from datetime import date
+
+loans_bp = track_writes(Blueprint('loans_bp', __name__), 'loans')
 
-loans_bp = Blueprint('loans_bp', __name__)
 
 @loans_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_loans():
     user_id = get_jwt_identity()
-    loans = Loan.query.filter_by(user_id=user_id).all()
-    return jsonify([{'id': l.id, 'loan_name': l.loan_name, 'holder': l.holder, 'price': l.price, 'description': l.description, 'date': l.date.isoformat() if l.date else None, 'quota': l.quota, 'tea': l.tea, 'remaining_price': l.remaining_price, 'account_id': l.account_id, 'expiration_date': l.expiration_date.isoformat() if l.expiration_date else None} for l in loans])
+    return list_response(LOAN_SCHEMA, user_id, date_field='date')
 
-@loans_bp.route('/', methods=['POST'])
+def _as_of():
+    # Fecha de conciliación con los pagos (?as_of=YYYY-MM-DD, hoy por defecto)
+    value = request.args.get('as_of')
+    return date.fromisoformat(value) if value else None
+
+@loans_bp.route('/<int:loan_id>/schedule', methods=['GET'])
 @jwt_required()
-def create_loan():
+def get_loan_schedule(loan_id):
     user_id = get_jwt_identity()
-    data = request.get_json()
-    
-    required_fields = ['loan_name', 'holder', 'price', 'date', 'remaining_price', 'account_id', 'expiration_date']
-    if not all(field in data and data[field] not in [None, ''] for field in required_fields):
-        return jsonify({'msg': 'Faltan campos obligatorios'}), 400
+    loan = Loan.query.filter_by(id=loan_id, user_id=user_id).first()
+    if not loan:
+        return jsonify({'msg': 'Préstamo no encontrado'}), 404
+    try:
+        as_of = _as_of()
+    except ValueError:
+        return jsonify({'msg': 'Formato de fecha inválido. Usar YYYY-MM-DD.'}), 400
+    return jsonify(amortization.schedules([loan], as_of)[0])
 
+@loans_bp.route('/portfolio', methods=['GET'])
+@jwt_required()
+def get_loans_portfolio():
+    user_id = get_jwt_identity()
     try:
-        date_obj = datetime.fromisoformat(data['date']).date()
-        expiration_date_obj = datetime.fromisoformat(data['expiration_date']).date()
+        as_of = _as_of()
     except ValueError:
         return jsonify({'msg': 'Formato de fecha inválido. Usar YYYY-MM-DD.'}), 400
+    # El cronograma completo de cada préstamo solo con ?schedule=1
+    include_schedule = request.args.get('schedule') == '1'
+    loans = Loan.query.filter_by(user_id=user_id).order_by(Loan.id).all()
+    results = amortization.schedules(loans, as_of, include_schedule)
+    return jsonify({
+        'loans': results,
+        'totals': {
+            field: round(sum(r[field] for r in results), 2)
+            for field in ('payment', 'total_interest', 'paid', 'expected_to_date', 'arrears')
+        },
+    })
 
-    loan = Loan(
-        loan_name=data['loan_name'],
-        holder=data['holder'],
-        price=data['price'],
-        description=data.get('description'),
-        date=date_obj,
-        quota=data.get('quota'),
-        tea=data.get('tea'),
-        remaining_price=data['remaining_price'],
-        user_id=user_id,
-        account_id=data['account_id'],
-        expiration_date=expiration_date_obj
-    )
+@loans_bp.route('/', methods=['POST'])
+@jwt_required()
+def create_loan():
+    user_id = get_jwt_identity()
+    values, error = LOAN_SCHEMA.parse_create(request.get_json(), user_id)
+    if error:
+        return jsonify({'msg': error}), 400
+
+    loan = Loan(**values)
     db.session.add(loan)
     db.session.commit()
     return jsonify({'msg': 'Préstamo creado', 'id': loan.id}), 201
@@ -53,19 +75,15 @@ def update_loan(loan_id):
     loan = Loan.query.filter_by(id=loan_id, user_id=user_id).first()
     if not loan:
         return jsonify({'msg': 'Préstamo no encontrado'}), 404
-    data = request.get_json()
-    
-    try:
-        if 'date' in data and data['date']:
-            data['date'] = datetime.fromisoformat(data['date']).date()
-        if 'expiration_date' in data and data['expiration_date']:
-            data['expiration_date'] = datetime.fromisoformat(data['expiration_date']).date()
-    except (ValueError, TypeError):
-        return jsonify({'msg': 'Formato de fecha inválido en la actualización.'}), 400
+    values, error = LOAN_SCHEMA.parse_update(request.get_json())
+    if error:
+        return jsonify({'msg': error}), 400
 
-    for field in ['loan_name', 'holder', 'price', 'description', 'date', 'quota', 'tea', 'remaining_price', 'account_id', 'expiration_date']:
-        if field in data:
-            setattr(loan, field, data[field])
+    for field, value in values.items():
+        setattr(loan, field, value)
+    # Los pagos del préstamo cuentan con su nombre y cuenta
+    if 'loan_name' in values or 'account_id' in values:
+        rollups.rebuild(user_id, kinds=['loan_payments'])
     db.session.commit()
     return jsonify({'msg': 'Préstamo actualizado'})
 
@@ -77,5 +95,6 @@ def delete_loan(loan_id):
     if not loan:
         return jsonify({'msg': 'Préstamo no encontrado'}), 404
     db.session.delete(loan)
+    rollups.rebuild(user_id, kinds=['loan_payments'])
     db.session.commit()
     return jsonify({'msg': 'Préstamo eliminado'})
\ No newline at end of file
@@ -0,0 +1,31 @@
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from app import response_cache
+
+monitoring_bp = Blueprint('monitoring_bp', __name__)
+
+
+@monitoring_bp.before_request
+def require_monitoring_token():
+    # Claves de la caché y estadísticas de consultas: solo con MONITORING_TOKEN configurado y
+    # enviado como "Authorization: Bearer <token>" (p. ej. bearer_token en el scrape de Prometheus)
+    token = current_app.config.get('MONITORING_TOKEN')
+    if not token:
+        return jsonify({'msg': 'Monitoreo desactivado (configurar MONITORING_TOKEN)'}), 404
+    scheme, _, sent = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(sent.strip().encode(), token.encode()):
+        return jsonify({'msg': 'Token de monitoreo inválido'}), 401
+
+@monitoring_bp.route('/_cache', methods=['GET'])
+def cache_stats():
+    # Contadores del proceso actual (cada worker tiene los suyos)
+    return jsonify(response_cache.stats())
+
+@monitoring_bp.route('/_metrics', methods=['GET'])
+def metrics():
+    # Formato de texto de Prometheus; como en /_cache, son las métricas del worker que responde
+    collector = current_app.extensions.get('metrics')
+    if collector is None:
+        return jsonify({'msg': 'Las métricas están desactivadas (METRICS_ENABLED=0)'}), 404
+    return Response(collector.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,163 @@
+# Helper compartido por todos los blueprints para los listados GET:
+# paginación por cursor (keyset) sobre (campo de orden, id), proyección de campos y filtros.
+import base64
+import json
+from datetime import date, datetime
+
+from flask import request, jsonify, current_app
+from app import db
+from app.routes.caching import cached_response
+from app.routes.filters import apply_filters
+
+
+def serialize_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(sort_value, row_id):
+    payload = json.dumps([serialize_value(sort_value), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort_column=None):
+    """
+    Devuelve (valor del campo de orden, id) a partir de un cursor opaco. Las fechas se
+    convierten según el tipo de `sort_column`. Lanza ValueError si es inválido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        if sort_column is not None and isinstance(sort_column.type, db.DateTime):
+            sort_value = datetime.fromisoformat(sort_value)
+        elif sort_column is not None and isinstance(sort_column.type, db.Date):
+            sort_value = date.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise ValueError('Cursor inválido')
+
+
+def parse_fields(allowed_fields):
+    """
+    Lee `fields=a,b,c` de la query string. Sin parámetro se devuelven todos los campos.
+    """
+    requested = request.args.get('fields')
+    if not requested:
+        return list(allowed_fields)
+    selected = [f.strip() for f in requested.split(',') if f.strip()]
+    unknown = [f for f in selected if f not in allowed_fields]
+    if unknown or not selected:
+        raise ValueError(f"Campos no válidos: {', '.join(unknown)}")
+    return selected
+
+
+def parse_limit():
+    """
+    Lee `limit` de la query string, acotado por PAGINATION_MAX_LIMIT.
+    Sin `limit` ni `cursor` se devuelve el listado completo (compatibilidad con el frontend).
+    """
+    max_limit = current_app.config['PAGINATION_MAX_LIMIT']
+    raw = request.args.get('limit')
+    if raw is None:
+        return max_limit if request.args.get('cursor') else None
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ValueError('El parámetro limit debe ser un entero')
+    if limit < 1:
+        raise ValueError('El parámetro limit debe ser mayor que 0')
+    return min(limit, max_limit)
+
+
+def parse_sort(schema, date_field):
+    """
+    Lee `sort=campo` (ascendente) o `sort=-campo` (descendente) y devuelve (columna, descendente).
+    Sin parámetro: fecha descendente, o id si el modelo no tiene fecha. Solo se admiten campos
+    no nulos, que es lo que necesita el cursor.
+    """
+    table = schema.model.__table__
+    raw = request.args.get('sort')
+    if not raw:
+        return (table.c[date_field], True) if date_field else (table.c.id, False)
+    descending = raw.startswith('-')
+    name = raw[1:] if descending else raw
+    if name not in schema.fields or table.c[name].nullable:
+        raise ValueError(f'Campo de orden no válido: {name}')
+    return table.c[name], descending
+
+
+def list_response(schema, user_id, date_field=None):
+    """
+    Responde un listado del usuario ordenado por (fecha desc, id desc), o por id si el
+    modelo no tiene fecha, salvo otro orden con ?sort=. Admite los filtros de
+    `apply_filters` (cuenta, categoría, fechas, importes y búsqueda ?q=). Solo se
+    seleccionan en SQL las columnas pedidas (más las claves del cursor). Si quedan más
+    filas, el cursor siguiente va en `X-Next-Cursor`.
+    Pasa por `cached_response`: ETag por versión del recurso (304 sin consultar la tabla)
+    y caché de la respuesta serializada.
+    """
+    return cached_response(user_id, schema.model.__tablename__, lambda: _build_list(schema, user_id, date_field))
+
+
+def _build_list(schema, user_id, date_field):
+    try:
+        query = ListQuery(schema, user_id, date_field)
+    except ValueError as e:
+        return jsonify({'msg': str(e)}), 400
+    return query.response(db.session.execute(query.statement).all())
+
+
+class ListQuery:
+    """
+    SELECT de un listado a partir de la query string (fields, limit, cursor, sort y filtros) y su respuesta
+    a partir de las filas. Separados para que el modo ASGI ejecute la misma consulta con el
+    motor asíncrono. Lanza ValueError si algún parámetro es inválido.
+    """
+
+    def __init__(self, schema, user_id, date_field=None):
+        table = schema.model.__table__
+        sort_column, descending = parse_sort(schema, date_field)
+        by_id = sort_column is table.c.id
+        self.schema = schema
+        self.sort_field = None if by_id else sort_column.key
+        self.selected = parse_fields(schema.fields)
+        self.limit = parse_limit()
+        cursor = request.args.get('cursor')
+        cursor_key = decode_cursor(cursor, sort_column) if cursor else None
+
+        # Las columnas pedidas van primero y en orden: el serializador compilado las lee por posición
+        key_columns = [table.c.id] if by_id else [sort_column, table.c.id]
+        columns = [table.c[f] for f in self.selected]
+        columns += [c for c in key_columns if c.key not in self.selected]
+
+        stmt = apply_filters(db.select(*columns), table, user_id, date_field)
+        order = (lambda column: column.desc()) if descending else (lambda column: column)
+        after = (lambda column, value: column < value) if descending else (lambda column, value: column > value)
+        if by_id:
+            stmt = stmt.order_by(order(table.c.id))
+            if cursor_key:
+                stmt = stmt.where(after(table.c.id, cursor_key[1]))
+        else:
+            stmt = stmt.order_by(order(sort_column), order(table.c.id))
+            if cursor_key:
+                cursor_value, cursor_id = cursor_key
+                stmt = stmt.where(db.or_(
+                    after(sort_column, cursor_value),
+                    db.and_(sort_column == cursor_value, after(table.c.id, cursor_id))
+                ))
+        if self.limit:
+            stmt = stmt.limit(self.limit + 1)
+        self.statement = stmt
+
+    def response(self, rows):
+        next_cursor = None
+        if self.limit and len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]._mapping
+            next_cursor = encode_cursor(last[self.sort_field] if self.sort_field else None, last['id'])
+
+        response = jsonify(self.schema.row_serializer(tuple(self.selected))(rows))
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
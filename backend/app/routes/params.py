@@ -0,0 +1,14 @@
+# Lectura de parámetros de query string compartidos por varios blueprints
+from datetime import date
+
+from flask import request
+
+
+def parse_date_range():
+    """
+    Devuelve (from, to) como `date` a partir de ?from=YYYY-MM-DD&to=YYYY-MM-DD (ambos opcionales).
+    Lanza ValueError si alguno tiene un formato inválido.
+    """
+    date_from = date.fromisoformat(request.args['from']) if request.args.get('from') else None
+    date_to = date.fromisoformat(request.args['to']) if request.args.get('to') else None
+    return date_from, date_to
@@ -1,63 +1,50 @@
 from flask import Blueprint, request, jsonify
 from app.models.scheduled_income import ScheduledIncome
 from app import db
+from app.schemas import SCHEDULED_INCOME_SCHEMA
+from app.routes.pagination import list_response
+from app.routes.caching import track_writes
+from app.routes.bulk import bulk_create, bulk_delete
+from app.controllers.ownership import foreign_parents
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
 
-scheduled_incomes_bp = Blueprint('scheduled_incomes_bp', __name__)
+scheduled_incomes_bp = track_writes(Blueprint('scheduled_incomes_bp', __name__), 'scheduled_incomes')
+
 
 @scheduled_incomes_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_scheduled_incomes():
     user_id = get_jwt_identity()
-    incomes = ScheduledIncome.query.filter_by(user_id=user_id).all()
-    return jsonify([
-        {
-            'id': i.id,
-            'income_name': i.income_name,
-            'income_date': i.income_date.isoformat() if i.income_date else None,
-            'description': i.description,
-            'category': i.category,
-            'next_income': i.next_income.isoformat() if i.next_income else None,
-            'amount': i.amount,
-            'received_amount': i.received_amount,
-            'pending_amount': i.pending_amount,
-            'account_id': i.account_id
-        } for i in incomes
-    ])
+    return list_response(SCHEDULED_INCOME_SCHEMA, user_id, date_field='income_date')
 
 @scheduled_incomes_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_scheduled_income():
     user_id = get_jwt_identity()
-    data = request.get_json()
-    
-    required_fields = ['income_name', 'income_date', 'description', 'category', 'next_income', 'amount', 'received_amount', 'pending_amount', 'account_id']
-    if not all(field in data and data[field] not in [None, ''] for field in required_fields):
-        return jsonify({'msg': 'Faltan campos obligatorios'}), 400
-
-    try:
-        income_date_obj = datetime.fromisoformat(data['income_date']).date()
-        next_income_obj = datetime.fromisoformat(data['next_income']).date()
-    except ValueError:
-        return jsonify({'msg': 'Formato de fecha inválido. Usar YYYY-MM-DD.'}), 400
+    values, error = SCHEDULED_INCOME_SCHEMA.parse_create(request.get_json(), user_id)
+    if error:
+        return jsonify({'msg': error}), 400
+    foreign = foreign_parents([values], user_id)
+    if foreign:
+        return jsonify({'msg': foreign[0]}), 404
 
-    income = ScheduledIncome(
-        income_name=data['income_name'],
-        income_date=income_date_obj,
-        description=data['description'],
-        category=data['category'],
-        next_income=next_income_obj,
-        amount=data['amount'],
-        received_amount=data['received_amount'],
-        pending_amount=data['pending_amount'],
-        user_id=user_id,
-        account_id=data['account_id']
-    )
+    income = ScheduledIncome(**values)
     db.session.add(income)
     db.session.commit()
     return jsonify({'msg': 'Ingreso programado creado', 'id': income.id}), 201
 
+@scheduled_incomes_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def create_scheduled_incomes_bulk():
+    user_id = get_jwt_identity()
+    return bulk_create(ScheduledIncome, SCHEDULED_INCOME_SCHEMA.parse_create, user_id)
+
+@scheduled_incomes_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def delete_scheduled_incomes_bulk():
+    user_id = get_jwt_identity()
+    return bulk_delete(ScheduledIncome, user_id)
+
 @scheduled_incomes_bp.route('/<int:income_id>', methods=['PUT'])
 @jwt_required()
 def update_scheduled_income(income_id):
@@ -65,19 +52,15 @@ def update_scheduled_income(income_id):
     income = ScheduledIncome.query.filter_by(id=income_id, user_id=user_id).first()
     if not income:
         return jsonify({'msg': 'Ingreso programado no encontrado'}), 404
-    data = request.get_json()
+    values, error = SCHEDULED_INCOME_SCHEMA.parse_update(request.get_json())
+    if error:
+        return jsonify({'msg': error}), 400
+    foreign = foreign_parents([values], user_id)
+    if foreign:
+        return jsonify({'msg': foreign[0]}), 404
 
-    try:
-        if 'income_date' in data and data['income_date']:
-            data['income_date'] = datetime.fromisoformat(data['income_date']).date()
-        if 'next_income' in data and data['next_income']:
-            data['next_income'] = datetime.fromisoformat(data['next_income']).date()
-    except (ValueError, TypeError):
-        return jsonify({'msg': 'Formato de fecha inválido en la actualización.'}), 400
-    
-    for field in ['income_name', 'income_date', 'description', 'category', 'next_income', 'amount', 'received_amount', 'pending_amount', 'account_id']:
-        if field in data:
-            setattr(income, field, data[field])
+    for field, value in values.items():
+        setattr(income, field, value)
     db.session.commit()
     return jsonify({'msg': 'Ingreso programado actualizado'})
 
@@ -1,52 +1,52 @@
 from flask import Blueprint, request, jsonify
 from app.models.service_payment import ServicePayment
+from app.models.service import Service
 from app import db
+from app.schemas import SERVICE_PAYMENT_SCHEMA
+from app.routes.pagination import list_response
+from app.routes.caching import track_writes
+from app.routes.bulk import bulk_create, bulk_delete
+from app.controllers import rollups, ledger
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
 
-service_payments_bp = Blueprint('service_payments_bp', __name__)
+service_payments_bp = track_writes(Blueprint('service_payments_bp', __name__), 'service_payments')
+
 
 @service_payments_bp.route('/', methods=['GET'])
 @jwt_required()
 def get_service_payments():
     user_id = get_jwt_identity()
-    payments = ServicePayment.query.filter_by(user_id=user_id).all()
-    return jsonify([
-        {
-            'id': p.id,
-            'amount': p.amount,
-            'date': p.date.isoformat() if p.date else None,
-            'description': p.description,
-            'service_id': p.service_id
-        } for p in payments
-    ])
+    return list_response(SERVICE_PAYMENT_SCHEMA, user_id, date_field='date')
 
 @service_payments_bp.route('/', methods=['POST'])
 @jwt_required()
 def create_service_payment():
     user_id = get_jwt_identity()
-    data = request.get_json()
-
-    required_fields = ['amount', 'date', 'service_id']
-    if not all(field in data and data[field] not in [None, ''] for field in required_fields):
-        return jsonify({'msg': 'Faltan campos obligatorios'}), 400
-    
-    try:
-        date_obj = datetime.fromisoformat(data['date']).date()
-    except ValueError:
-        return jsonify({'msg': 'Formato de fecha inválido. Usar YYYY-MM-DD.'}), 400
+    values, error = SERVICE_PAYMENT_SCHEMA.parse_create(request.get_json(), user_id)
+    if error:
+        return jsonify({'msg': error}), 400
+    if not Service.query.filter_by(id=values['service_id'], user_id=user_id).first():
+        return jsonify({'msg': 'Servicio no encontrado'}), 404
 
-    payment = ServicePayment(
-        amount=data['amount'],
-        date=date_obj,
-        description=data.get('description'),
-        service_id=data['service_id'],
-        user_id=user_id
-    )
+    payment = ServicePayment(**values)
     db.session.add(payment)
+    rollups.add_row('service_payments', payment)
+    ledger.post_payment('service_payments', payment, user_id)
     db.session.commit()
     return jsonify({'msg': 'Pago de servicio creado', 'id': payment.id}), 201
 
+@service_payments_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def create_service_payments_bulk():
+    user_id = get_jwt_identity()
+    return bulk_create(ServicePayment, SERVICE_PAYMENT_SCHEMA.parse_create, user_id, kind='service_payments')
+
+@service_payments_bp.route('/bulk', methods=['DELETE'])
+@jwt_required()
+def delete_service_payments_bulk():
+    user_id = get_jwt_identity()
+    return bulk_delete(ServicePayment, user_id, kind='service_payments')
+
 @service_payments_bp.route('/<int:payment_id>', methods=['PUT'])
 @jwt_required()
 def update_service_payment(payment_id):
@@ -54,17 +54,18 @@ def update_service_payment(payment_id):
     payment = ServicePayment.query.filter_by(id=payment_id, user_id=user_id).first()
     if not payment:
         return jsonify({'msg': 'Pago de servicio no encontrado'}), 404
-    data = request.get_json()
-
-    try:
-        if 'date' in data and data['date']:
-            data['date'] = datetime.fromisoformat(data['date']).date()
-    except (ValueError, TypeError):
-        return jsonify({'msg': 'Formato de fecha inválido en la actualización.'}), 400
+    values, error = SERVICE_PAYMENT_SCHEMA.parse_update(request.get_json())
+    if error:
+        return jsonify({'msg': error}), 400
+    if 'service_id' in values and not Service.query.filter_by(id=values['service_id'], user_id=user_id).first():
+        return jsonify({'msg': 'Servicio no encontrado'}), 404
 
-    for field in ['amount', 'date', 'description', 'service_id']:
-        if field in data:
-            setattr(payment, field, data[field])
+    rollups.remove_row('service_payments', payment)
+    ledger.reverse_payment('service_payments', payment, user_id)
+    for field, value in values.items():
+        setattr(payment, field, value)
+    rollups.add_row('service_payments', payment)
+    ledger.post_payment('service_payments', payment, user_id)
     db.session.commit()
     return jsonify({'msg': 'Pago de servicio actualizado'})
 
@@ -75,6 +76,8 @@ def delete_service_payment(payment_id):
     payment = ServicePayment.query.filter_by(id=payment_id, user_id=user_id).first()
     if not payment:
         return jsonify({'msg': 'Pago de servicio no encontrado'}), 404
+    rollups.remove_row('service_payments', payment)
+    ledger.reverse_payment('service_payments', payment, user_id)
     db.session.delete(payment)
     db.session.commit()
     return jsonify({'msg': 'Pago de servicio eliminado'})
\ No newline at end of file
@@ -0,0 +1,26 @@
+from flask import Blueprint, request, jsonify
+from app.controllers.summary import dashboard_summary, KINDS
+from app.routes.params import parse_date_range
+from app.routes.caching import cached_response
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+summary_bp = Blueprint('summary_bp', __name__)
+
+@summary_bp.route('/', methods=['GET'])
+@jwt_required()
+def get_summary():
+    user_id = get_jwt_identity()
+    return cached_response(user_id, 'summary', lambda: _build_summary(user_id))
+
+def _build_summary(user_id):
+    try:
+        date_from, date_to = parse_date_range()
+    except ValueError:
+        return jsonify({'msg': 'Formato de fecha inválido. Usar YYYY-MM-DD.'}), 400
+
+    # ?kinds=incomes,loan_payments limita los bloques calculados
+    kinds = [k for k in request.args.get('kinds', ','.join(KINDS)).split(',') if k]
+    if not kinds or any(k not in KINDS for k in kinds):
+        return jsonify({'msg': f"Tipos no válidos. Usar: {', '.join(KINDS)}"}), 400
+
+    return jsonify(dashboard_summary(user_id, date_from, date_to, kinds))
@@ -0,0 +1,35 @@
+# Hilo opcional que ejecuta el procesador de ingresos programados cada
+# SCHEDULED_PROCESSOR_INTERVAL segundos dentro del proceso web. Es seguro tener uno por worker:
+# los lotes se reservan en la BD, así que dos hilos nunca procesan la misma fila.
+import logging
+import threading
+
+from app import db
+
+logger = logging.getLogger(__name__)
+
+
+def start_scheduler(app):
+    interval = app.config.get('SCHEDULED_PROCESSOR_INTERVAL', 0)
+    if interval <= 0:
+        return None
+    stop = threading.Event()
+
+    def run():
+        from app.controllers.scheduled import process_due
+
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    stats = process_due(None, app.config['SCHEDULED_BATCH_SIZE'], app.config['SCHEDULED_LEASE_SECONDS'])
+                    if stats['incomes']:
+                        logger.info('Ingresos programados procesados: %s', stats)
+                except Exception:
+                    logger.exception('Error procesando ingresos programados')
+                finally:
+                    db.session.remove()
+
+    thread = threading.Thread(target=run, name='scheduled-incomes', daemon=True)
+    thread.start()
+    app.extensions['scheduler_stop'] = stop
+    return thread
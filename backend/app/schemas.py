@@ -0,0 +1,218 @@
+# Esquemas declarativos de los modelos expuestos por la API.
+# Cada esquema se compila al importar el módulo: los tipos salen de las columnas del modelo,
+# la validación queda en closures con todo precalculado y la serialización se genera como
+# código Python (una comprensión de dicts sin llamadas por campo).
+from datetime import datetime
+from functools import lru_cache
+from math import isfinite
+
+from app import db
+from app.models import Account, Income, Loan, LoanPayment, ScheduledIncome, Service, ServicePayment
+
+MSG_MISSING = 'Faltan campos obligatorios'
+MSG_DATE_CREATE = 'Formato de fecha inválido. Usar YYYY-MM-DD.'
+MSG_DATE_UPDATE = 'Formato de fecha inválido en la actualización.'
+
+
+class InvalidDate(ValueError):
+    pass
+
+
+def _parse_datetime(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise InvalidDate(value)
+
+
+def _parse_date(value):
+    try:
+        return datetime.fromisoformat(value).date()
+    except (ValueError, TypeError):
+        raise InvalidDate(value)
+
+
+def _parse_number(value, field, integer=False):
+    if isinstance(value, bool):
+        raise ValueError(f'Valor numérico inválido en {field}')
+    if isinstance(value, int):
+        return value
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        raise ValueError(f'Valor numérico inválido en {field}')
+    # 'inf', 'nan' (y Infinity/NaN en el JSON) no caben en las columnas
+    if not isfinite(number):
+        raise ValueError(f'Valor numérico inválido en {field}')
+    if number.is_integer():
+        return int(number)
+    # En columnas enteras no se redondea (igual que en la importación)
+    if integer:
+        raise ValueError(f'Valor numérico inválido en {field}: debe ser entero')
+    return number
+
+
+def _column_kind(column):
+    # DateTime hereda de Date en SQLAlchemy: se comprueba primero
+    if isinstance(column.type, db.DateTime):
+        return 'datetime'
+    if isinstance(column.type, db.Date):
+        return 'date'
+    if isinstance(column.type, db.Integer):
+        return 'integer'
+    if isinstance(column.type, (db.Float, db.Numeric)):
+        return 'number'
+    return 'text'
+
+
+DATE_PARSERS = {'datetime': _parse_datetime, 'date': _parse_date}
+
+
+class Schema:
+    """
+    Esquema de un modelo:
+    - `fields`: campos que devuelve la API, en orden (todos columnas del modelo),
+    - `writable`: campos que acepta POST/PUT,
+    - `required`: obligatorios en el alta (no pueden faltar, ser None ni ''),
+    - `non_negative`: numéricos que no admiten valores negativos.
+    Las fechas se convierten según la columna: Date -> date, DateTime -> datetime; en las
+    columnas Integer solo se aceptan valores enteros (2.0 sí, 2.5 no).
+    """
+
+    def __init__(self, model, fields, writable, required, missing_msg=MSG_MISSING, non_negative=()):
+        self.model = model
+        self.fields = list(fields)
+        self.writable = tuple(writable)
+        self.required = tuple(required)
+        self.non_negative = tuple(non_negative)
+        self.missing_msg = missing_msg
+        columns = model.__table__.c
+        self.kinds = {name: _column_kind(columns[name]) for name in set(self.fields) | set(self.writable)}
+        self._dates = tuple(
+            (name, DATE_PARSERS[self.kinds[name]]) for name in self.writable if self.kinds[name] in DATE_PARSERS
+        )
+        # (campo, si es entero) de los campos numéricos
+        self._numbers = tuple(
+            (name, self.kinds[name] == 'integer') for name in self.writable if self.kinds[name] in ('integer', 'number')
+        )
+        self.parse_create = self._compile_parser(create=True)
+        self.parse_update = self._compile_parser(create=False)
+
+    def _compile_parser(self, create):
+        writable, required, dates, numbers = self.writable, self.required, self._dates, self._numbers
+        non_negative = self.non_negative
+        missing_msg = self.missing_msg
+        date_msg = MSG_DATE_CREATE if create else MSG_DATE_UPDATE
+
+        def parse(data, user_id=None):
+            """
+            Valida un alta (todos los obligatorios) o una actualización (solo los campos
+            presentes). Devuelve (valores, None) o (None, mensaje de error).
+            """
+            if not isinstance(data, dict):
+                return None, missing_msg
+            if create:
+                if not all(field in data and data[field] not in (None, '') for field in required):
+                    return None, missing_msg
+                values = {field: data.get(field) for field in writable}
+            else:
+                if any(field in data and data[field] in (None, '') for field in required):
+                    return None, missing_msg
+                values = {field: data[field] for field in writable if field in data}
+            for field, integer in numbers:
+                value = values.get(field)
+                # Camino rápido: el JSON ya trae números en casi todas las peticiones
+                if value.__class__ is int or value.__class__ is float and not integer and isfinite(value):
+                    continue
+                if value in (None, ''):
+                    if field in values:
+                        values[field] = None
+                    continue
+                try:
+                    values[field] = _parse_number(value, field, integer)
+                except ValueError as e:
+                    return None, str(e)
+            for field in non_negative:
+                value = values.get(field)
+                if value is not None and value < 0:
+                    return None, f'El campo {field} no puede ser negativo'
+            for field, convert in dates:
+                value = values.get(field)
+                if value not in (None, ''):
+                    try:
+                        values[field] = convert(value)
+                    except InvalidDate:
+                        return None, date_msg
+                elif field in values:
+                    values[field] = None
+            if create:
+                values['user_id'] = user_id
+            return values, None
+
+        return parse
+
+    @lru_cache(maxsize=None)
+    def row_serializer(self, fields):
+        """
+        Devuelve una función compilada que convierte una lista de filas (tuplas con las
+        columnas `fields` en ese orden) en una lista de dicts. Las fechas quedan como
+        date/datetime: las serializa el proveedor JSON de la app.
+        """
+        items = ', '.join(f'{name!r}: row[{index}]' for index, name in enumerate(fields))
+        source = 'def serialize_rows(rows):\n    return [{' + items + '} for row in rows]\n'
+        namespace = {}
+        exec(compile(source, f'<schema {self.model.__tablename__}>', 'exec'), namespace)
+        return namespace['serialize_rows']
+
+
+ACCOUNT_SCHEMA = Schema(
+    Account,
+    fields=['id', 'account_name', 'card', 'balance'],
+    writable=['account_name', 'card', 'balance'],
+    required=['account_name', 'card', 'balance'],
+    missing_msg='Faltan datos',
+)
+
+INCOME_SCHEMA = Schema(
+    Income,
+    fields=['id', 'income_name', 'income_date', 'description', 'category', 'amount', 'account_id'],
+    writable=['income_name', 'income_date', 'description', 'category', 'amount', 'account_id'],
+    required=['income_name', 'income_date', 'amount', 'category', 'account_id'],
+)
+
+LOAN_SCHEMA = Schema(
+    Loan,
+    fields=['id', 'loan_name', 'holder', 'price', 'description', 'date', 'quota', 'tea', 'remaining_price', 'account_id', 'expiration_date'],
+    writable=['loan_name', 'holder', 'price', 'description', 'date', 'quota', 'tea', 'remaining_price', 'account_id', 'expiration_date'],
+    required=['loan_name', 'holder', 'price', 'date', 'remaining_price', 'account_id', 'expiration_date'],
+    # Con una TEA de -100 o menos la tasa mensual sería -1 o compleja
+    non_negative=['tea'],
+)
+
+SERVICE_SCHEMA = Schema(
+    Service,
+    fields=['id', 'service_name', 'description', 'date', 'category', 'price', 'remaining_price', 'account_id', 'expiration_date'],
+    writable=['service_name', 'description', 'date', 'category', 'price', 'remaining_price', 'account_id', 'expiration_date'],
+    required=['service_name', 'date', 'category', 'price', 'remaining_price', 'account_id', 'expiration_date'],
+)
+
+LOAN_PAYMENT_SCHEMA = Schema(
+    LoanPayment,
+    fields=['id', 'amount', 'date', 'description', 'loan_id'],
+    writable=['amount', 'date', 'description', 'loan_id'],
+    required=['amount', 'date', 'loan_id'],
+)
+
+SERVICE_PAYMENT_SCHEMA = Schema(
+    ServicePayment,
+    fields=['id', 'amount', 'date', 'description', 'service_id'],
+    writable=['amount', 'date', 'description', 'service_id'],
+    required=['amount', 'date', 'service_id'],
+)
+
+SCHEDULED_INCOME_SCHEMA = Schema(
+    ScheduledIncome,
+    fields=['id', 'income_name', 'income_date', 'description', 'category', 'next_income', 'amount', 'received_amount', 'pending_amount', 'account_id', 'installment_amount', 'interval_months'],
+    writable=['income_name', 'income_date', 'description', 'category', 'next_income', 'amount', 'received_amount', 'pending_amount', 'account_id', 'installment_amount', 'interval_months'],
+    required=['income_name', 'income_date', 'description', 'category', 'next_income', 'amount', 'received_amount', 'pending_amount', 'account_id'],
+)
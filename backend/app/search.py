@@ -0,0 +1,138 @@
+# Búsqueda de texto (?q=) en los listados.
+# SQLite: una tabla FTS5 de contenido externo por tabla (<tabla>_fts) que mantienen tres triggers,
+# así que cualquier escritura (API, bulk, import, seed) queda indexada. PostgreSQL: índice GIN
+# sobre to_tsvector('simple', ...) de las mismas columnas. Se crean en la migración y, con
+# db.create_all(), al crear cada tabla. En otras BD la búsqueda cae a LIKE.
+# Las migraciones que recreen una de estas tablas en modo batch (SQLite) deben volver a crear
+# sus triggers con create_search_index.
+import re
+
+from sqlalchemy import event, text
+
+from app import db
+from app import models  # noqa: F401  (tablas en db.metadata)
+
+# Tabla -> columnas indexadas para la búsqueda
+SEARCH_COLUMNS = {
+    'accounts': ('account_name', 'card'),
+    'incomes': ('income_name', 'description'),
+    'services': ('service_name', 'description'),
+    'loans': ('loan_name', 'description'),
+    'scheduled_incomes': ('income_name', 'description'),
+    'loan_payments': ('description',),
+    'service_payments': ('description',),
+}
+# Sin stemming: los términos se buscan como prefijos ('alq' encuentra 'alquiler')
+TS_CONFIG = 'simple'
+MAX_TERMS = 8
+
+
+def terms(query):
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+
+def _tsvector(table, columns):
+    document = " || ' ' || ".join(f"coalesce({table}.{column}, '')" for column in columns)
+    return f"to_tsvector('{TS_CONFIG}', {document})"
+
+
+def search_ddl(dialect, table):
+    columns = SEARCH_COLUMNS[table]
+    if dialect == 'sqlite':
+        names = ', '.join(columns)
+        new = ', '.join(f'new.{c}' for c in columns)
+        old = ', '.join(f'old.{c}' for c in columns)
+        delete = f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) VALUES ('delete', old.id, {old});"
+        insert = f'INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new});'
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5({names}, content='{table}', "
+            f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            f'CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END',
+            # Indexa las filas que ya existían
+            f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')",
+        ]
+    if dialect == 'postgresql':
+        return [f'CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING gin ({_tsvector(table, columns)})']
+    return []
+
+
+def drop_search_ddl(dialect, table):
+    if dialect == 'sqlite':
+        return [f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}' for suffix in ('ai', 'ad', 'au')] + \
+               [f'DROP TABLE IF EXISTS {table}_fts']
+    if dialect == 'postgresql':
+        return [f'DROP INDEX IF EXISTS ix_{table}_search']
+    return []
+
+
+def create_search_index(connection, table):
+    for statement in search_ddl(connection.dialect.name, table):
+        connection.exec_driver_sql(statement)
+
+
+def drop_search_index(connection, table):
+    for statement in drop_search_ddl(connection.dialect.name, table):
+        connection.exec_driver_sql(statement)
+
+
+def predicate(table, query_terms):
+    """
+    Condición WHERE para las filas de `table` que contienen todos los términos (como prefijos).
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in query_terms)
+        return table.c.id.in_(
+            text(f'SELECT rowid FROM {table.name}_fts WHERE {table.name}_fts MATCH :search_match')
+            .bindparams(search_match=match).columns(rowid=db.Integer)
+        )
+    if dialect == 'postgresql':
+        # La expresión es la misma del índice para que el planificador lo use
+        tsquery = ' & '.join(f'{term}:*' for term in query_terms)
+        return text(f"{_tsvector(table.name, SEARCH_COLUMNS[table.name])} @@ to_tsquery('{TS_CONFIG}', :search_query)") \
+            .bindparams(search_query=tsquery)
+    return db.and_(*(
+        db.or_(*(table.c[column].ilike(f'%{term}%') for column in SEARCH_COLUMNS[table.name]))
+        for term in query_terms
+    ))
+
+
+def owner(table, user_id, query_terms):
+    """
+    Condición user_id = ? del listado. En SQLite, con búsqueda, se escribe sin índice
+    (user_id + 0): así el planificador parte de las filas que devuelve el FTS en lugar de
+    recorrer todas las del usuario comprobando cada una (27 ms -> 2 ms con 500k filas).
+    La identidad del JWT es un string: la expresión no tiene la afinidad de la columna y
+    SQLite no convertiría '1' a 1, así que se pasa como entero.
+    """
+    if query_terms and db.engine.dialect.name == 'sqlite':
+        return (table.c.user_id + 0) == int(user_id)
+    return table.c.user_id == user_id
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Para Alembic: las tablas FTS5 (y sus tablas internas) y los índices GIN no están en los
+    modelos; autogenerate no debe proponer borrarlos.
+    """
+    if type_ == 'table' and re.search(r'_fts(_\w+)?$', name):
+        return False
+    if type_ == 'index' and name and name.endswith('_search'):
+        return False
+    return True
+
+
+def _create_with_table(target, connection, **kw):
+    create_search_index(connection, target.name)
+
+
+def _drop_with_table(target, connection, **kw):
+    drop_search_index(connection, target.name)
+
+
+# Con db.create_all() (benchmarks, BD nuevas sin migrar) el índice se crea junto a la tabla
+for _table in SEARCH_COLUMNS:
+    event.listen(db.metadata.tables[_table], 'after_create', _create_with_table)
+    event.listen(db.metadata.tables[_table], 'before_drop', _drop_with_table)
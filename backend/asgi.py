@@ -0,0 +1,7 @@
+# Punto de entrada ASGI (listados asíncronos, ver app/asgi.py):
+#
+#     GUNICORN_ASGI=1 gunicorn -c gunicorn.conf.py
+from app.asgi import AsyncReadApp
+from server import app as flask_app
+
+app = AsyncReadApp(flask_app)
@@ -0,0 +1 @@
+# Scripts de benchmark del backend. Ejecutar desde backend/: python -m benchmarks.<script>
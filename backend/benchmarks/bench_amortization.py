@@ -0,0 +1,63 @@
+"""
+Benchmark del motor de amortización: cálculo vectorizado con NumPy frente al cálculo en Python.
+
+Genera préstamos sintéticos en memoria (no usa la BD) y mide el cálculo del portafolio
+con y sin el cronograma completo.
+
+    python -m benchmarks.bench_amortization --loans 5000
+"""
+import argparse
+import json
+import random
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.controllers import amortization
+from benchmarks.common import measure
+
+
+def make_loans(count, seed_value=42):
+    rng = random.Random(seed_value)
+    loans = []
+    for i in range(1, count + 1):
+        start = date(2015, 1, 1) + timedelta(days=rng.randrange(3650))
+        quota = rng.choice([12, 24, 36, 60, 120, 240])
+        loans.append(SimpleNamespace(
+            id=i, loan_name=f'Préstamo {i}', price=rng.randrange(100_000, 50_000_000), date=start,
+            quota=quota, tea=rng.choice([0, 8.5, 25, 45.9, 120]), expiration_date=start + timedelta(days=quota * 31),
+        ))
+    paid = {loan.id: loan.price * rng.random() for loan in loans}
+    return loans, paid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--loans', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='salida en JSON')
+    args = parser.parse_args()
+
+    if amortization.np is None:
+        parser.error('NumPy no está instalado: no hay nada que comparar')
+    loans, paid = make_loans(args.loans)
+    as_of = date(2025, 1, 1)
+    periods = sum(amortization.installments(loan) for loan in loans)
+
+    results = {}
+    for include_schedule in (False, True):
+        for name, compute in (('python', amortization._compute_python), ('numpy', amortization._compute_numpy)):
+            key = f'{name}_{"schedule" if include_schedule else "summary"}'
+            stats = measure(lambda: compute(loans, paid, as_of, include_schedule), args.repeat)
+            stats['periods_per_second'] = round(periods / (stats['p50_ms'] / 1000))
+            results[key] = stats
+
+    if args.json:
+        print(json.dumps({'loans': args.loans, 'periods': periods, 'results': results}, indent=2))
+        return
+    print(f'{args.loans} préstamos, {periods} cuotas')
+    for name, stats in results.items():
+        print(f'{name:18} p50 {stats["p50_ms"]:>10} ms  {stats["periods_per_second"]:>12} cuotas/s')
+
+
+if __name__ == '__main__':
+    main()
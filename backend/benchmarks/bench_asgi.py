@@ -0,0 +1,72 @@
+"""
+Listados en modo síncrono (gunicorn gthread, server:app) frente al modo ASGI (worker 'asgi'
+de gunicorn, asgi:app, motor asíncrono) con distinto número de conexiones concurrentes.
+
+Siembra una BD temporal y, para cada número de conexiones, levanta gunicorn en cada modo con
+los mismos workers y pool de conexiones y lanza un cliente HTTP keep-alive por conexión contra
+los GET de listados (los que atiende la ruta asíncrona), sin caché de respuestas.
+
+    python -m benchmarks.bench_asgi --connections 8,32,128 --workers 1 --threads 4 --duration 10
+
+Con --database-url se mide otra BD (ya sembrada con --skip-seed, por ejemplo un PostgreSQL,
+que en modo ASGI usa asyncpg).
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from flask_jwt_extended import create_access_token
+
+from benchmarks.common import make_app, seed
+from benchmarks.load_test import run_setting
+
+ENDPOINTS = ['/api/incomes/?limit=50', '/api/loan_payments/?limit=50', '/api/service_payments/?limit=50',
+             '/api/accounts/', '/api/loans/', '/api/incomes/?q=ingr&limit=50']
+MODES = {
+    'sync': {'GUNICORN_ASGI': '0'},
+    'asgi': {'GUNICORN_ASGI': '1'},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--connections', default='8,32,128', help='conexiones concurrentes, separadas por coma')
+    parser.add_argument('--modes', default='sync,asgi')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=4, help='hilos por worker en modo síncrono')
+    parser.add_argument('--pool', type=int, default=5, help='DB_POOL_SIZE (ambos modos)')
+    parser.add_argument('--duration', type=float, default=10, help='segundos por medición')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--database-url', help='por defecto un SQLite temporal')
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--json', action='store_true', help='salida en JSON')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'asgi.db')
+    app = make_app(database_url)
+    with app.app_context():
+        if not args.skip_seed:
+            seed(args.users, args.rows)
+        tokens = [create_access_token(identity=str(u)) for u in range(1, args.users + 1)]
+
+    setting = {'workers': args.workers, 'threads': args.threads, 'pool': args.pool}
+    results = []
+    for connections in (int(c) for c in args.connections.split(',')):
+        for mode in args.modes.split(','):
+            result = run_setting(database_url, setting, tokens, connections, args.duration, False,
+                                 endpoints=ENDPOINTS, env=MODES[mode])
+            results.append({'mode': mode, 'connections': connections, **result})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['mode']:5} {r['connections']:>4} conexiones: {r['requests_per_second']:>8} req/s  "
+              f"p50 {r['p50_ms']} ms  p95 {r['p95_ms']} ms  p99 {r['p99_ms']} ms  "
+              f"errores {r['errors']}  RSS {r['server_peak_rss_mb']} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark de los índices (user_id, fecha) y de FK.
+
+Siembra una BD grande, muestra el plan y la latencia de las consultas típicas de la API
+sin los índices y después de crearlos.
+
+    python -m benchmarks.bench_indexes --users 200 --rows 2000
+"""
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from app import db
+from benchmarks.common import make_app, seed, measure
+
+
+def queries(user_id):
+    from app.models import Income, LoanPayment, ServicePayment, ScheduledIncome
+
+    return {
+        'incomes_page': db.select(Income.id, Income.income_date, Income.amount)
+            .where(Income.user_id == user_id)
+            .order_by(Income.income_date.desc(), Income.id.desc()).limit(50),
+        'incomes_full': db.select(Income).where(Income.user_id == user_id),
+        'loan_payments_page': db.select(LoanPayment.id, LoanPayment.date, LoanPayment.amount)
+            .where(LoanPayment.user_id == user_id)
+            .order_by(LoanPayment.date.desc(), LoanPayment.id.desc()).limit(50),
+        'payments_by_loan': db.select(db.func.sum(LoanPayment.amount)).where(LoanPayment.loan_id == user_id * 5),
+        'payments_by_service': db.select(db.func.sum(ServicePayment.amount)).where(ServicePayment.service_id == user_id * 5),
+        'scheduled_due': db.select(ScheduledIncome.id).where(ScheduledIncome.next_income <= datetime(2015, 3, 1)),
+    }
+
+
+def explain(stmt):
+    engine = db.engine
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN QUERY PLAN ' if engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    with engine.connect() as conn:
+        return [' '.join(str(col) for col in row) for row in conn.exec_driver_sql(prefix + sql)]
+
+
+def run_phase(user_id, repeat):
+    results = {}
+    for name, stmt in queries(user_id).items():
+        results[name] = {
+            'plan': explain(stmt),
+            **measure(lambda: db.session.execute(stmt).all(), repeat),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=2000, help='ingresos y pagos de cada tipo por usuario')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--database-url', help='por defecto un SQLite temporal')
+    parser.add_argument('--json', action='store_true', help='salida en JSON')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+    app = make_app(database_url)
+    with app.app_context():
+        seed(args.users, args.rows)
+        indexes = [index for table in db.metadata.sorted_tables for index in table.indexes]
+        user_id = args.users // 2
+
+        for index in indexes:
+            index.drop(db.engine)
+        before = run_phase(user_id, args.repeat)
+        for index in indexes:
+            index.create(db.engine)
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql('ANALYZE')
+        after = run_phase(user_id, args.repeat)
+
+    if args.json:
+        print(json.dumps({'before': before, 'after': after}, indent=2))
+        return
+    for name in before:
+        print(f'== {name}: p50 {before[name]["p50_ms"]} ms -> {after[name]["p50_ms"]} ms')
+        print('   sin índices: ' + ' | '.join(before[name]['plan']))
+        print('   con índices: ' + ' | '.join(after[name]['plan']))
+
+
+if __name__ == '__main__':
+    main()
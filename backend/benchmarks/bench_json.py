@@ -0,0 +1,57 @@
+"""
+Benchmark de los proveedores JSON (JSON_PROVIDER=std frente a orjson) sobre los listados.
+
+Siembra una BD, levanta la app con cada proveedor (sin caché de respuestas, para medir la
+serialización en cada petición) y mide los GET completos de los listados con el cliente de pruebas.
+
+    python -m benchmarks.bench_json --rows 20000
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from flask_jwt_extended import create_access_token
+
+from app.json_provider import orjson
+from benchmarks.common import make_app, seed, measure
+
+ENDPOINTS = ['/api/incomes/', '/api/loan_payments/', '/api/service_payments/', '/api/summary/']
+
+
+def run_provider(database_url, provider, repeat):
+    app = make_app(database_url, JSON_PROVIDER=provider, RESPONSE_CACHE_BACKEND='none')
+    with app.app_context():
+        headers = {'Authorization': 'Bearer ' + create_access_token(identity='1')}
+    client = app.test_client()
+    results = {}
+    for url in ENDPOINTS:
+        size = len(client.get(url, headers=headers).data)
+        results[url] = {'bytes': size, **measure(lambda: client.get(url, headers=headers), repeat)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='ingresos y pagos de cada tipo del usuario medido')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='salida en JSON')
+    args = parser.parse_args()
+
+    database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+    with make_app(database_url).app_context():
+        seed(1, args.rows)
+
+    providers = ['std'] + (['orjson'] if orjson is not None else [])
+    results = {provider: run_provider(database_url, provider, args.repeat) for provider in providers}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for url in ENDPOINTS:
+        line = '  '.join(f'{p}: p50 {results[p][url]["p50_ms"]} ms' for p in providers)
+        print(f'{url:26} {line}')
+
+
+if __name__ == '__main__':
+    main()
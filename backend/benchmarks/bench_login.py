@@ -0,0 +1,76 @@
+"""
+Benchmark de ráfagas de login: logins por segundo según los hilos del pool de hash
+(PASSWORD_HASH_WORKERS) y el método/factor de trabajo (PASSWORD_HASH_METHOD).
+
+Crea usuarios con contraseña en una BD temporal y lanza --clients hilos que hacen login
+concurrentemente con el cliente de pruebas (cada hilo simula un hilo de worker).
+
+    python -m benchmarks.bench_login --clients 16 --logins 20 --workers 1,4,8
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from app import db
+from app.models import User
+from benchmarks.common import make_app, percentiles
+
+
+def run(method, workers, clients, logins):
+    database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'login.db')
+    app = make_app(database_url, PASSWORD_HASH_METHOD=method, PASSWORD_HASH_WORKERS=workers,
+                   PASSWORD_HASH_MAX_PENDING=clients, PASSWORD_HASH_QUEUE_TIMEOUT=60,
+                   RATE_LIMIT_BACKEND='none')
+    with app.app_context():
+        for i in range(clients):
+            user = User(username=f'user{i}', email=f'user{i}@bench.local')
+            user.set_password('password')
+            db.session.add(user)
+        db.session.commit()
+
+    latencies, errors = [], []
+
+    def client_loop(i):
+        client = app.test_client()
+        for _ in range(logins):
+            t0 = time.perf_counter()
+            response = client.post('/api/auth/login', json={'email': f'user{i}@bench.local', 'password': 'password'})
+            latencies.append((time.perf_counter() - t0) * 1000)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+
+    threads = [threading.Thread(target=client_loop, args=(i,)) for i in range(clients)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    return {'method': method, 'workers': workers, 'logins_per_second': round(len(latencies) / elapsed, 1),
+            'errors': len(errors), **percentiles(latencies)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16, help='hilos concurrentes')
+    parser.add_argument('--logins', type=int, default=10, help='logins por hilo')
+    parser.add_argument('--workers', default=f'1,{os.cpu_count() or 1}', help='hilos del pool de hash, separados por coma')
+    parser.add_argument('--methods', default='scrypt,pbkdf2:sha256:600000', help='métodos de werkzeug separados por coma')
+    parser.add_argument('--json', action='store_true', help='salida en JSON')
+    args = parser.parse_args()
+
+    results = [run(method, int(workers), args.clients, args.logins)
+               for method in args.methods.split(',') for workers in args.workers.split(',')]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['method']:24} pool {r['workers']:>3}: {r['logins_per_second']:>8} logins/s  "
+              f"p50 {r['p50_ms']} ms  p99 {r['p99_ms']} ms  errores {r['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark de validación y serialización: esquemas compilados frente al camino anterior.
+
+Compara, sobre los ingresos de un usuario:
+- serialización: instancias ORM + comprensión con un helper por campo, frente a tuplas de
+  columnas + el serializador compilado del esquema,
+- validación: el parse_* manual que tenía cada blueprint, frente a `parse_create` del esquema.
+
+    python -m benchmarks.bench_serialization --rows 50000
+"""
+import argparse
+import json
+import os
+import tempfile
+from datetime import date, datetime
+
+from app import db
+from app.schemas import INCOME_SCHEMA
+from benchmarks.common import make_app, seed, measure
+
+
+def serialize_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def orm_path(fields):
+    from app.models import Income
+
+    incomes = Income.query.filter_by(user_id=1).all()
+    return [{f: serialize_value(getattr(income, f)) for f in fields} for income in incomes]
+
+
+def compiled_path(fields):
+    table = INCOME_SCHEMA.model.__table__
+    rows = db.session.execute(db.select(*[table.c[f] for f in fields]).where(table.c.user_id == 1)).all()
+    return INCOME_SCHEMA.row_serializer(tuple(fields))(rows)
+
+
+def manual_parse(data, user_id):
+    # Validación previa a los esquemas (la de incomes.py)
+    required_fields = ['income_name', 'income_date', 'amount', 'category', 'account_id']
+    if not isinstance(data, dict) or not all(field in data and data[field] not in [None, ''] for field in required_fields):
+        return None, 'Faltan campos obligatorios'
+    try:
+        income_date_obj = datetime.fromisoformat(data['income_date']).date()
+    except (ValueError, TypeError):
+        return None, 'Formato de fecha inválido. Usar YYYY-MM-DD.'
+    return {
+        'income_name': data['income_name'],
+        'income_date': income_date_obj,
+        'description': data.get('description'),
+        'category': data['category'],
+        'amount': data['amount'],
+        'user_id': user_id,
+        'account_id': data['account_id']
+    }, None
+
+
+def rows_per_second(fn, count, repeat):
+    stats = measure(fn, repeat)
+    stats['rows_per_second'] = round(count / (stats['p50_ms'] / 1000)) if stats['p50_ms'] else None
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help='ingresos del usuario medido')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='salida en JSON')
+    args = parser.parse_args()
+
+    app = make_app('sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db'))
+    fields = INCOME_SCHEMA.fields
+    payloads = [{'income_name': 'Ingreso', 'income_date': f'2024-01-{1 + i % 28:02d}', 'amount': 1000 + i,
+                 'category': 'Sueldo', 'account_id': 1} for i in range(args.rows)]
+    with app.app_context():
+        seed(1, args.rows)
+        assert app.json.dumps(orm_path(fields)) == app.json.dumps(compiled_path(fields))
+        results = {
+            'serialize_orm': rows_per_second(lambda: (orm_path(fields), db.session.expunge_all()), args.rows, args.repeat),
+            'serialize_compiled': rows_per_second(lambda: compiled_path(fields), args.rows, args.repeat),
+            'parse_manual': rows_per_second(lambda: [manual_parse(p, 1) for p in payloads], args.rows, args.repeat),
+            'parse_schema': rows_per_second(lambda: [INCOME_SCHEMA.parse_create(p, 1) for p in payloads], args.rows, args.repeat),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, stats in results.items():
+        print(f'{name:20} p50 {stats["p50_ms"]:>9} ms  {stats["rows_per_second"]:>10} filas/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+# Utilidades compartidas por los benchmarks: app contra una BD temporal, datos sintéticos y medición.
+import os
+import random
+import re
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from app import create_app, db
+from config import Config
+
+
+def make_app(database_uri, **config):
+    """
+    Crea la app contra `database_uri` con las tablas creadas. `config` sobreescribe otras claves.
+    """
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_uri
+
+    for key, value in config.items():
+        setattr(BenchConfig, key, value)
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def _chunks(rows, size=5000):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def bulk_insert(model, rows):
+    for chunk in _chunks(rows):
+        db.session.execute(db.insert(model), chunk)
+
+
+def seed(users, rows_per_user, seed_value=42):
+    """
+    Inserta `users` usuarios con una cuenta, `rows_per_user` ingresos y, por cada préstamo
+    y servicio, pagos hasta completar `rows_per_user` pagos de cada tipo. Determinista.
+    Debe llamarse dentro de un app_context.
+    """
+    from app.models import User, Account, Income, Loan, Service, LoanPayment, ServicePayment, ScheduledIncome
+
+    rng = random.Random(seed_value)
+    start = datetime(2015, 1, 1)
+    span = 10 * 365
+    parents_per_user = 5
+
+    bulk_insert(User, [{'id': u, 'username': f'user{u}', 'email': f'user{u}@bench.local'} for u in range(1, users + 1)])
+    bulk_insert(Account, [{'id': u, 'account_name': 'Efectivo', 'card': 'N/A', 'balance': 0, 'user_id': u} for u in range(1, users + 1)])
+
+    loans, services, scheduled = [], [], []
+    for u in range(1, users + 1):
+        for p in range(parents_per_user):
+            parent_id = (u - 1) * parents_per_user + p + 1
+            day = start + timedelta(days=rng.randrange(span))
+            loans.append({'id': parent_id, 'loan_name': f'Préstamo {p}', 'holder': 'Banco', 'price': 1_000_000,
+                          'date': day.date(), 'quota': 24, 'tea': 0.25, 'remaining_price': 1_000_000,
+                          'user_id': u, 'account_id': u, 'expiration_date': (day + timedelta(days=730)).date()})
+            services.append({'id': parent_id, 'service_name': f'Servicio {p}', 'date': day.date(), 'category': 'Hogar',
+                             'price': 50_000, 'remaining_price': 50_000, 'user_id': u, 'account_id': u,
+                             'expiration_date': (day + timedelta(days=365)).date()})
+            scheduled.append({'income_name': f'Sueldo {p}', 'income_date': day, 'description': '', 'category': 'Sueldo',
+                              'next_income': day + timedelta(days=30), 'amount': 800_000, 'received_amount': 0,
+                              'pending_amount': 800_000, 'user_id': u, 'account_id': u})
+    bulk_insert(Loan, loans)
+    bulk_insert(Service, services)
+    bulk_insert(ScheduledIncome, scheduled)
+
+    def dated():
+        return start + timedelta(days=rng.randrange(span), seconds=rng.randrange(86400))
+
+    incomes, loan_payments, service_payments = [], [], []
+    for u in range(1, users + 1):
+        first_parent = (u - 1) * parents_per_user + 1
+        for _ in range(rows_per_user):
+            incomes.append({'income_name': 'Ingreso', 'income_date': dated(), 'category': rng.choice(['Sueldo', 'Venta', 'Otros']),
+                            'amount': rng.randrange(1_000, 500_000), 'user_id': u, 'account_id': u})
+            loan_payments.append({'amount': rng.randrange(1_000, 100_000), 'date': dated(), 'user_id': u,
+                                  'loan_id': first_parent + rng.randrange(parents_per_user)})
+            service_payments.append({'amount': rng.randrange(1_000, 50_000), 'date': dated(), 'user_id': u,
+                                     'service_id': first_parent + rng.randrange(parents_per_user)})
+            # Lotes acotados también con millones de filas por usuario
+            if len(incomes) >= 50_000:
+                bulk_insert(Income, incomes)
+                bulk_insert(LoanPayment, loan_payments)
+                bulk_insert(ServicePayment, service_payments)
+                incomes, loan_payments, service_payments = [], [], []
+    bulk_insert(Income, incomes)
+    bulk_insert(LoanPayment, loan_payments)
+    bulk_insert(ServicePayment, service_payments)
+    db.session.commit()
+
+
+def percentiles(samples):
+    """
+    p50, p95, p99 y máximo (ms) de una lista de latencias en milisegundos.
+    """
+    samples = sorted(samples)
+    if not samples:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+
+    def at(q):
+        return round(samples[min(len(samples) - 1, int(len(samples) * q))], 3)
+
+    return {
+        'p50_ms': round(statistics.median(samples), 3),
+        'p95_ms': at(0.95),
+        'p99_ms': at(0.99),
+        'max_ms': round(samples[-1], 3),
+    }
+
+
+def measure(fn, repeat=20):
+    """
+    Ejecuta `fn` `repeat` veces y devuelve latencias en milisegundos (p50, p95, p99, max).
+    """
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return percentiles(samples)
+
+
+def reset_peak_rss():
+    """
+    Reinicia el pico de memoria residente del proceso (Linux >= 4.0) para medir solo lo que
+    viene después (p. ej. sin la siembra). En otros sistemas no hace nada.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_mb(pid='self'):
+    """
+    Pico de memoria residente (VmHWM) de `pid` en MB, o None si no se puede leer.
+    """
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            return round(int(re.search(r'VmHWM:\s+(\d+)', f.read()).group(1)) / 1024, 1)
+    except (OSError, AttributeError):
+        pass
+    if pid != 'self':
+        return None
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(maxrss / (1024 * 1024 if os.uname().sysname == 'Darwin' else 1024), 1)
+
+
+def process_tree_peak_rss_mb(pid):
+    """
+    Suma de los picos de memoria de `pid` y sus hijos directos (master y workers de gunicorn).
+    """
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            children = f.read().split()
+    except OSError:
+        children = []
+    peaks = [peak_rss_mb(p) for p in [pid, *children]]
+    peaks = [p for p in peaks if p is not None]
+    return round(sum(peaks), 1) if peaks else None
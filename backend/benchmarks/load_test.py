@@ -0,0 +1,167 @@
+"""
+Prueba de carga de los listados sobre gunicorn con distintas combinaciones de workers,
+hilos y tamaño de pool.
+
+Siembra una BD temporal, levanta gunicorn (gunicorn.conf.py) con cada configuración y
+lanza clientes HTTP concurrentes contra los GET de listados durante unos segundos.
+
+    python -m benchmarks.load_test --settings 1x1:5,2x4:5,4x4:10 --clients 16 --duration 10
+
+Cada configuración es WORKERS x HILOS : DB_POOL_SIZE. Con --database-url se usa otra BD
+(ya sembrada con --skip-seed, por ejemplo un PostgreSQL).
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from flask_jwt_extended import create_access_token
+
+from benchmarks.common import make_app, percentiles, process_tree_peak_rss_mb, seed
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ['/api/incomes/?limit=50', '/api/loan_payments/?limit=50', '/api/service_payments/?limit=50',
+             '/api/accounts/', '/api/summary/']
+
+
+def parse_settings(value):
+    settings = []
+    for item in value.split(','):
+        shape, _, pool = item.partition(':')
+        workers, _, threads = shape.partition('x')
+        settings.append({'workers': int(workers), 'threads': int(threads or 1), 'pool': int(pool or 5)})
+    return settings
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port, timeout=30):
+    # Espera una respuesta HTTP (no solo el socket del master): así no se mide el arranque de los workers
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+        try:
+            conn.request('GET', '/api/_cache')
+            conn.getresponse().read()
+            return
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.2)
+        finally:
+            conn.close()
+    raise RuntimeError('gunicorn no respondió a tiempo')
+
+
+def start_server(database_url, setting, port, cache, **extra_env):
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        PORT=str(port),
+        WEB_CONCURRENCY=str(setting['workers']),
+        GUNICORN_THREADS=str(setting['threads']),
+        DB_POOL_SIZE=str(setting['pool']),
+        GUNICORN_ACCESS_LOG=os.devnull,
+        GUNICORN_LOG_LEVEL='warning',
+        RESPONSE_CACHE_BACKEND='memory' if cache else 'none',
+        **extra_env,
+    )
+    return subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'], cwd=BACKEND_DIR, env=env)
+
+
+def client_loop(port, tokens, duration, latencies, errors, seed_value, endpoints=ENDPOINTS):
+    rng = random.Random(seed_value)
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        headers = {'Authorization': 'Bearer ' + rng.choice(tokens)}
+        t0 = time.perf_counter()
+        try:
+            conn.request('GET', rng.choice(endpoints), headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException):
+            errors.append('conexión')
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append((time.perf_counter() - t0) * 1000)
+    conn.close()
+
+
+def run_setting(database_url, setting, tokens, clients, duration, cache, endpoints=ENDPOINTS, env=None):
+    port = free_port()
+    server = start_server(database_url, setting, port, cache, **(env or {}))
+    try:
+        wait_ready(port)
+        latencies, errors = [], []
+        threads = [
+            threading.Thread(target=client_loop, args=(port, tokens, duration, latencies, errors, i, endpoints))
+            for i in range(clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        server_rss = process_tree_peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    stats = percentiles(latencies)
+    return {
+        **setting,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_second': round(len(latencies) / duration, 1),
+        'p50_ms': stats['p50_ms'] and round(stats['p50_ms'], 2),
+        'p95_ms': stats['p95_ms'] and round(stats['p95_ms'], 2),
+        'p99_ms': stats['p99_ms'] and round(stats['p99_ms'], 2),
+        'server_peak_rss_mb': server_rss,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='1x1:5,2x4:5,4x4:10', help='WORKERSxHILOS:POOL separados por coma')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10, help='segundos por configuración')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--cache', action='store_true', help='con la caché de respuestas en memoria')
+    parser.add_argument('--database-url', help='por defecto un SQLite temporal')
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--json', action='store_true', help='salida en JSON')
+    args = parser.parse_args()
+
+    database_url = args.database_url or 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load.db')
+    app = make_app(database_url)
+    with app.app_context():
+        if not args.skip_seed:
+            seed(args.users, args.rows)
+        tokens = [create_access_token(identity=str(u)) for u in range(1, args.users + 1)]
+
+    results = [run_setting(database_url, s, tokens, args.clients, args.duration, args.cache)
+               for s in parse_settings(args.settings)]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for r in results:
+        print(f"{r['workers']} workers x {r['threads']} hilos, pool {r['pool']}: {r['requests_per_second']} req/s, "
+              f"p50 {r['p50_ms']} ms, p95 {r['p95_ms']} ms, p99 {r['p99_ms']} ms, errores {r['errors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,292 @@
+"""
+Suite de benchmarks de la API: CRUD de cada blueprint a distintas escalas con salida JSON.
+
+Por cada escala (filas por usuario de ingresos y de cada tipo de pago) siembra una BD nueva,
+crea la app con create_app y recorre con el cliente de pruebas el alta, listado, edición y
+borrado de cada recurso, más los GET de resumen, proyección, portafolio, exportación y búsqueda.
+Al final comprueba que borrar un padre invalida los listados en caché de sus hijos.
+Con --http además levanta gunicorn y mide los listados con clientes HTTP concurrentes
+(benchmarks/load_test.py).
+
+    python -m benchmarks.suite --scales 1k,100k --output bench.json
+    python -m benchmarks.suite --scales 1k,100k,1m --http --compare bench.json
+
+Cada operación reporta p50/p95/p99, operaciones por segundo y errores; cada escala el pico
+de memoria residente de las peticiones (sin contar la siembra). --compare marca las
+operaciones cuyo p95 empeoró más de --max-regression frente a un JSON anterior y termina
+con código 1. --database-url admite {scale} para usar una BD por escala (p. ej. PostgreSQL
+local: postgresql://localhost/bench_{scale}); las BD deben existir vacías.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import sqlalchemy
+from flask_jwt_extended import create_access_token
+
+from app import db
+from benchmarks import load_test
+from benchmarks.common import make_app, peak_rss_mb, percentiles, reset_peak_rss, seed
+
+# Cuenta, préstamos y servicios del usuario 1 creados por common.seed
+ACCOUNT_ID, LOAN_ID, SERVICE_ID = 1, 1, 1
+
+RESOURCES = {
+    'accounts': (
+        lambda i: {'account_name': f'Bench {i}', 'card': 'N/A', 'balance': 1000},
+        {'balance': 2000},
+    ),
+    'incomes': (
+        lambda i: {'income_name': f'Bench {i}', 'income_date': '2024-05-01T10:00:00', 'amount': 1000,
+                   'category': 'Otros', 'account_id': ACCOUNT_ID},
+        {'amount': 2000},
+    ),
+    'loans': (
+        lambda i: {'loan_name': f'Bench {i}', 'holder': 'Banco', 'price': 100000, 'date': '2024-01-15', 'quota': 12,
+                   'tea': 20, 'remaining_price': 100000, 'account_id': ACCOUNT_ID, 'expiration_date': '2025-01-15'},
+        {'holder': 'Otro banco'},
+    ),
+    'services': (
+        lambda i: {'service_name': f'Bench {i}', 'date': '2024-01-15', 'category': 'Hogar', 'price': 5000,
+                   'remaining_price': 5000, 'account_id': ACCOUNT_ID, 'expiration_date': '2024-12-31'},
+        {'category': 'Otros'},
+    ),
+    'loan_payments': (
+        lambda i: {'amount': 100, 'date': '2024-05-01T10:00:00', 'loan_id': LOAN_ID},
+        {'amount': 150},
+    ),
+    'service_payments': (
+        lambda i: {'amount': 100, 'date': '2024-05-01T10:00:00', 'service_id': SERVICE_ID},
+        {'amount': 150},
+    ),
+    'scheduled_incomes': (
+        lambda i: {'income_name': f'Bench {i}', 'income_date': '2024-05-01T10:00:00', 'description': 'Bench',
+                   'category': 'Sueldo', 'next_income': '2030-01-01T10:00:00', 'amount': 1000,
+                   'received_amount': 0, 'pending_amount': 1000, 'account_id': ACCOUNT_ID},
+        {'description': 'editado'},
+    ),
+}
+
+READS = {
+    'summary': '/api/summary/',
+    'forecast': '/api/forecast/?months=24',
+    'loans.portfolio': '/api/loans/portfolio',
+    'export.month': '/api/export/?format=ndjson&from=2024-01-01&to=2024-01-31',
+}
+
+# Búsquedas que deben devolver filas del usuario sembrado (common.seed: ingresos 'Ingreso'):
+# un listado vacío cuenta como error aunque la respuesta sea 200
+SEARCHES = {
+    'incomes.search': '/api/incomes/?q=ingr&limit=50',
+    'incomes.search_filtered': '/api/incomes/?q=ingreso&category=Sueldo&limit=50',
+}
+
+# Borrado de un padre -> listados de hijos que borra en cascada. Todo lo de common.seed cuelga
+# de la cuenta 1, así que tras borrarla esos listados quedan vacíos
+CASCADES = [
+    ('/api/loans/1', ('loan_payments',)),
+    ('/api/services/1', ('service_payments',)),
+    ('/api/accounts/1', ('incomes', 'loans', 'services', 'loan_payments', 'service_payments', 'scheduled_incomes')),
+]
+
+HTTP_ENDPOINTS = [f'/api/{name}/?limit=50' for name in RESOURCES] + ['/api/summary/']
+
+
+def parse_scale(value):
+    value = value.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+
+    def call(self, name, expected, method, url, non_empty=False, **kwargs):
+        t0 = time.perf_counter()
+        response = method(url, **kwargs)
+        response.get_data()
+        self.samples.setdefault(name, []).append((time.perf_counter() - t0) * 1000)
+        if response.status_code != expected or non_empty and not response.get_json():
+            self.errors[name] = self.errors.get(name, 0) + 1
+        return response
+
+    def results(self):
+        results = {}
+        for name, samples in self.samples.items():
+            stats = percentiles(samples)
+            stats['ops_per_second'] = round(len(samples) / (sum(samples) / 1000), 1) if sum(samples) else None
+            stats['count'] = len(samples)
+            stats['errors'] = self.errors.get(name, 0)
+            results[name] = stats
+        return results
+
+
+def run_crud(client, headers, recorder, repeat):
+    for name, (payload, update) in RESOURCES.items():
+        url = f'/api/{name}/'
+        for i in range(repeat):
+            response = recorder.call(f'{name}.create', 201, client.post, url, json=payload(i), headers=headers)
+            item_id = (response.get_json() or {}).get('id')
+            recorder.call(f'{name}.list', 200, client.get, url + '?limit=50', headers=headers)
+            if item_id is None:
+                continue
+            recorder.call(f'{name}.update', 200, client.put, f'{url}{item_id}', json=update, headers=headers)
+            recorder.call(f'{name}.delete', 200, client.delete, f'{url}{item_id}', headers=headers)
+    for name, url in READS.items():
+        for _ in range(repeat):
+            recorder.call(name, 200, client.get, url, headers=headers)
+    for name, url in SEARCHES.items():
+        for _ in range(repeat):
+            recorder.call(name, 200, client.get, url, non_empty=True, headers=headers)
+
+
+def run_scale(rows, args):
+    if args.database_url:
+        database_url = args.database_url.format(scale=rows)
+    else:
+        database_url = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), f'suite_{rows}.db')
+    app = make_app(database_url, RESPONSE_CACHE_BACKEND='memory' if args.cache else 'none')
+
+    t0 = time.perf_counter()
+    with app.app_context():
+        seed(args.users, rows)
+        dialect = db.engine.dialect.name
+        tokens = [create_access_token(identity=str(u)) for u in range(1, args.users + 1)]
+        db.session.remove()
+    seed_seconds = time.perf_counter() - t0
+
+    gc.collect()
+    reset_peak_rss()
+    recorder = Recorder()
+    client = app.test_client()
+    t0 = time.perf_counter()
+    run_crud(client, {'Authorization': 'Bearer ' + tokens[0]}, recorder, args.repeat)
+    result = {
+        'rows_per_user': rows,
+        'users': args.users,
+        'database': dialect,
+        'seed_seconds': round(seed_seconds, 2),
+        'run_seconds': round(time.perf_counter() - t0, 2),
+        'peak_rss_mb': peak_rss_mb(),
+        'operations': recorder.results(),
+    }
+    if args.http:
+        setting = load_test.parse_settings(args.http_setting)[0]
+        result['http'] = load_test.run_setting(database_url, setting, tokens, args.clients, args.duration,
+                                               args.cache, HTTP_ENDPOINTS)
+    return result
+
+
+def check_cascades():
+    """
+    Con la caché de respuestas en memoria: lista los hijos de cada padre de CASCADES, borra el padre
+    y los vuelve a listar. Devuelve los listados que siguen mostrando filas borradas en cascada.
+    """
+    app = make_app('sqlite:///' + os.path.join(tempfile.mkdtemp(), 'cascade.db'), RESPONSE_CACHE_BACKEND='memory')
+    with app.app_context():
+        seed(1, 50)
+        headers = {'Authorization': 'Bearer ' + create_access_token(identity='1')}
+        db.session.remove()
+    client = app.test_client()
+    stale = []
+    for parent_url, children in CASCADES:
+        before = {name: client.get(f'/api/{name}/', headers=headers).get_json() for name in children}
+        client.delete(parent_url, headers=headers)
+        for name in children:
+            after = client.get(f'/api/{name}/', headers=headers).get_json()
+            with app.app_context():
+                count = db.session.scalar(db.text(f'SELECT count(*) FROM {name} WHERE user_id = 1'))
+            if len(after) != count:
+                stale.append({'deleted': parent_url, 'list': name, 'before': len(before[name]),
+                              'listed': len(after), 'in_db': count})
+    return stale
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline, max_ratio):
+    """
+    Compara el p95 de cada operación con el de `baseline` (misma escala). Devuelve las regresiones.
+    """
+    previous = {scale['rows_per_user']: scale for scale in baseline.get('scales', [])}
+    regressions = []
+    for scale in current['scales']:
+        before = previous.get(scale['rows_per_user'])
+        if before is None:
+            continue
+        for name, stats in scale['operations'].items():
+            old = before['operations'].get(name, {}).get('p95_ms')
+            if not old or stats['p95_ms'] is None:
+                continue
+            ratio = stats['p95_ms'] / old
+            marker = '!' if ratio > max_ratio else ' '
+            print(f"{marker} {scale['rows_per_user']:>9} {name:28} p95 {old:>9} -> {stats['p95_ms']:>9} ms  x{ratio:.2f}")
+            if ratio > max_ratio:
+                regressions.append((scale['rows_per_user'], name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1k,100k', help='filas por usuario separadas por coma (1k, 100k, 1m)')
+    parser.add_argument('--users', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=30, help='iteraciones por operación')
+    parser.add_argument('--cache', action='store_true', help='con la caché de respuestas en memoria')
+    parser.add_argument('--database-url', help='por defecto un SQLite temporal por escala; admite {scale}')
+    parser.add_argument('--http', action='store_true', help='además, prueba de carga HTTP sobre gunicorn')
+    parser.add_argument('--http-setting', default='2x4:5', help='WORKERSxHILOS:POOL de gunicorn')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5, help='segundos de la prueba HTTP por escala')
+    parser.add_argument('--output', help='archivo JSON de salida (por defecto, stdout)')
+    parser.add_argument('--compare', help='JSON de una ejecución anterior')
+    parser.add_argument('--max-regression', type=float, default=1.25, help='razón de p95 tolerada en --compare')
+    args = parser.parse_args()
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+            'args': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        },
+        'scales': [run_scale(parse_scale(scale), args) for scale in args.scales.split(',')],
+        'stale_after_cascade': check_cascades(),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    elif not args.compare:
+        print(text)
+
+    if report['stale_after_cascade']:
+        print(f"Listados con filas borradas en cascada: {report['stale_after_cascade']}", file=sys.stderr)
+        sys.exit(1)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        if regressions:
+            print(f'{len(regressions)} operaciones con p95 peor que x{args.max_regression}', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,90 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_secret_key')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///finance.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Pool de conexiones por proceso (con gunicorn: conexiones máximas = workers x (pool + overflow))
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1') == '1',
+    }
+    # Réplica de lectura opcional: los GET leen de DATABASE_REPLICA_URL y las escrituras van a la primaria
+    SQLALCHEMY_BINDS = {'replica': os.environ['DATABASE_REPLICA_URL']} if os.environ.get('DATABASE_REPLICA_URL') else {}
+    # Segundos tras una escritura en los que el mismo usuario sigue leyendo de la primaria
+    REPLICA_READ_YOUR_WRITES_SECONDS = float(os.environ.get('REPLICA_READ_YOUR_WRITES_SECONDS', 5))
+    # Modo ASGI (asgi.py): URL del motor asíncrono de los listados (por defecto la de DATABASE_URL
+    # con aiosqlite o asyncpg) e hilos por worker para las peticiones que atiende la app síncrona
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URL')
+    ASGI_SYNC_THREADS = int(os.environ.get('ASGI_SYNC_THREADS', 4))
+    # Pragmas de SQLite al abrir cada conexión: WAL (lectores concurrentes con un escritor)
+    # y espera de hasta SQLITE_BUSY_TIMEOUT ms cuando la BD está bloqueada
+    SQLITE_WAL = os.environ.get('SQLITE_WAL', '1') == '1'
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt_secret_key')
+    # Caché en memoria de los usuarios autenticados (segundos y entradas) y cada cuántos segundos
+    # cada worker lee los tokens revocados por /api/auth/logout
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 10000))
+    TOKEN_REVOCATION_SYNC_SECONDS = int(os.environ.get('TOKEN_REVOCATION_SYNC_SECONDS', 5))
+    # Tamaño máximo de página de los listados (?limit=)
+    PAGINATION_MAX_LIMIT = int(os.environ.get('PAGINATION_MAX_LIMIT', 500))
+    # /api/summary lee de monthly_rollups (requiere `flask rebuild-rollups` tras migrar)
+    SUMMARY_USE_ROLLUPS = os.environ.get('SUMMARY_USE_ROLLUPS', '1') == '1'
+    # Máximo de elementos por petición en los endpoints /bulk
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 1000))
+    # Filas leídas por lote (yield_per) en /api/export
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+    # Filas por lote (y por commit) en /api/import
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+    # Caché de respuestas de listados y resumen: memory | redis | none
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_URL = os.environ.get('RESPONSE_CACHE_URL')
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 2048))
+    # Tope de memoria de la caché en memoria y tamaño máximo de una respuesta cacheable
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRY_BYTES', 1024 * 1024))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+    # Serializador JSON de las respuestas: auto (orjson si está instalado) | orjson | std
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'auto')
+    # Procesador de ingresos programados: filas por transacción, duración de la reserva de cada
+    # lote y cada cuántos segundos lo ejecuta el hilo interno (0 = solo `flask process-scheduled`)
+    SCHEDULED_BATCH_SIZE = int(os.environ.get('SCHEDULED_BATCH_SIZE', 500))
+    SCHEDULED_LEASE_SECONDS = int(os.environ.get('SCHEDULED_LEASE_SECONDS', 300))
+    SCHEDULED_PROCESSOR_INTERVAL = int(os.environ.get('SCHEDULED_PROCESSOR_INTERVAL', 0))
+    # Métricas por endpoint en /api/_metrics; se marca como N+1 una petición que ejecuta la
+    # misma sentencia SQL más de METRICS_N_PLUS_ONE_THRESHOLD veces
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    # /api/_metrics y /api/_cache exigen "Authorization: Bearer <MONITORING_TOKEN>"; sin token, 404
+    MONITORING_TOKEN = os.environ.get('MONITORING_TOKEN')
+    METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get('METRICS_N_PLUS_ONE_THRESHOLD', 10))
+    # Horizonte máximo de /api/forecast (?months=)
+    FORECAST_MAX_MONTHS = int(os.environ.get('FORECAST_MAX_MONTHS', 60))
+
+    # Hash de contraseñas: método y factor de trabajo de werkzeug (los hashes viejos se rehacen
+    # en el siguiente login), hilos del pool (por defecto, núcleos) y cola máxima antes de un 503
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_HASH_WORKERS = int(os.environ['PASSWORD_HASH_WORKERS']) if os.environ.get('PASSWORD_HASH_WORKERS') else None
+    PASSWORD_HASH_MAX_PENDING = int(os.environ['PASSWORD_HASH_MAX_PENDING']) if os.environ.get('PASSWORD_HASH_MAX_PENDING') else None
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5))
+    # Límite de intentos en login/registro (token bucket por IP y por email): memory | redis | none.
+    # Con varios workers, 'redis' comparte los contadores (RATE_LIMIT_URL o RESPONSE_CACHE_URL).
+    # Las reglas son 'N/periodo' (second, minute, hour, day, o p. ej. '10/15minute').
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_URL = os.environ.get('RATE_LIMIT_URL')
+    # Proxies delante del backend: la IP del cliente se toma de X-Forwarded-For
+    RATE_LIMIT_PROXY_HOPS = int(os.environ.get('RATE_LIMIT_PROXY_HOPS', 0))
+    RATE_LIMITS = {
+        'login': {
+            'ip': os.environ.get('RATE_LIMIT_LOGIN_IP', '20/minute'),
+            'email': os.environ.get('RATE_LIMIT_LOGIN_EMAIL', '5/minute'),
+        },
+        'register': {
+            'ip': os.environ.get('RATE_LIMIT_REGISTER_IP', '5/minute'),
+        },
+    }
+    # Certificados de Google desde un archivo local en lugar de descargarlos (pruebas)
+    GOOGLE_CERTS_FILE = os.environ.get('GOOGLE_CERTS_FILE')
 
     # --- INICIO DE LA CORRECCIÓN ---
     # Credenciales de Google OAuth
@@ -0,0 +1,47 @@
+# Configuración de producción para gunicorn:
+#
+#     gunicorn -c gunicorn.conf.py
+#
+# Todo se ajusta por variables de entorno. Cada worker tiene su propio pool de conexiones
+# (DB_POOL_SIZE + DB_MAX_OVERFLOW), así que conviene que workers x threads no supere lo que
+# admite la base de datos.
+import multiprocessing
+import os
+
+# GUNICORN_ASGI=1: worker asyncio de gunicorn con asgi:app (listados con el motor asíncrono;
+# el resto de la API en un pool de ASGI_SYNC_THREADS hilos por worker)
+asgi = os.environ.get('GUNICORN_ASGI', '0') == '1'
+wsgi_app = 'asgi:app' if asgi else 'server:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Con más de un hilo por worker se usa gthread (las peticiones esperan sobre todo a la BD)
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+if asgi:
+    worker_class = 'asgi'
+    threads = 1
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Reinicia los workers de a poco para acotar el crecimiento de memoria
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '0') == '1'
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # Con preload_app el motor se creó en el proceso maestro: cada worker descarta las
+    # conexiones heredadas y abre las suyas
+    if server.cfg.preload_app:
+        from app import db
+        from server import app
+
+        with app.app_context():
+            db.engine.dispose(close=False)
@@ -0,0 +1,52 @@
+"""user date indexes
+
+Revision ID: 3f9a2c7d1e84
+Revises: 186c2e82fd53
+Create Date: 2026-10-17 10:12:41.503218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a2c7d1e84'
+down_revision = '186c2e82fd53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Índices compuestos (user_id, fecha) para los listados por usuario
+    # e índices de las FK usadas en los joins pago -> préstamo/servicio
+    op.create_index('ix_accounts_user_id', 'accounts', ['user_id'], unique=False)
+    op.create_index('ix_incomes_user_id_income_date', 'incomes', ['user_id', 'income_date'], unique=False)
+    op.create_index('ix_incomes_account_id', 'incomes', ['account_id'], unique=False)
+    op.create_index('ix_loans_user_id_date', 'loans', ['user_id', 'date'], unique=False)
+    op.create_index('ix_loans_account_id', 'loans', ['account_id'], unique=False)
+    op.create_index('ix_scheduled_incomes_user_id_income_date', 'scheduled_incomes', ['user_id', 'income_date'], unique=False)
+    op.create_index('ix_scheduled_incomes_next_income', 'scheduled_incomes', ['next_income'], unique=False)
+    op.create_index('ix_scheduled_incomes_account_id', 'scheduled_incomes', ['account_id'], unique=False)
+    op.create_index('ix_services_user_id_date', 'services', ['user_id', 'date'], unique=False)
+    op.create_index('ix_services_account_id', 'services', ['account_id'], unique=False)
+    op.create_index('ix_loan_payments_user_id_date', 'loan_payments', ['user_id', 'date'], unique=False)
+    op.create_index('ix_loan_payments_loan_id', 'loan_payments', ['loan_id'], unique=False)
+    op.create_index('ix_service_payments_user_id_date', 'service_payments', ['user_id', 'date'], unique=False)
+    op.create_index('ix_service_payments_service_id', 'service_payments', ['service_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_service_payments_service_id', table_name='service_payments')
+    op.drop_index('ix_service_payments_user_id_date', table_name='service_payments')
+    op.drop_index('ix_loan_payments_loan_id', table_name='loan_payments')
+    op.drop_index('ix_loan_payments_user_id_date', table_name='loan_payments')
+    op.drop_index('ix_services_account_id', table_name='services')
+    op.drop_index('ix_services_user_id_date', table_name='services')
+    op.drop_index('ix_scheduled_incomes_account_id', table_name='scheduled_incomes')
+    op.drop_index('ix_scheduled_incomes_next_income', table_name='scheduled_incomes')
+    op.drop_index('ix_scheduled_incomes_user_id_income_date', table_name='scheduled_incomes')
+    op.drop_index('ix_loans_account_id', table_name='loans')
+    op.drop_index('ix_loans_user_id_date', table_name='loans')
+    op.drop_index('ix_incomes_account_id', table_name='incomes')
+    op.drop_index('ix_incomes_user_id_income_date', table_name='incomes')
+    op.drop_index('ix_accounts_user_id', table_name='accounts')
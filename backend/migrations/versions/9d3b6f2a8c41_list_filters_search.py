@@ -0,0 +1,82 @@
+"""list filters and search
+
+Revision ID: 9d3b6f2a8c41
+Revises: 5a9c3e1f7b20
+Create Date: 2026-10-18 11:42:07.318265
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3b6f2a8c41'
+down_revision = '5a9c3e1f7b20'
+branch_labels = None
+depends_on = None
+
+# Tabla -> columnas de la búsqueda ?q= (copia de app/search.py al crear esta revisión)
+SEARCH_COLUMNS = {
+    'accounts': ('account_name', 'card'),
+    'incomes': ('income_name', 'description'),
+    'services': ('service_name', 'description'),
+    'loans': ('loan_name', 'description'),
+    'scheduled_incomes': ('income_name', 'description'),
+    'loan_payments': ('description',),
+    'service_payments': ('description',),
+}
+
+
+def _create_search(dialect, table, columns):
+    names = ', '.join(columns)
+    if dialect == 'sqlite':
+        new = ', '.join(f'new.{c}' for c in columns)
+        old = ', '.join(f'old.{c}' for c in columns)
+        delete = f"INSERT INTO {table}_fts({table}_fts, rowid, {names}) VALUES ('delete', old.id, {old});"
+        insert = f'INSERT INTO {table}_fts(rowid, {names}) VALUES (new.id, {new});'
+        op.execute(f"CREATE VIRTUAL TABLE {table}_fts USING fts5({names}, content='{table}', "
+                   f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')")
+        op.execute(f'CREATE TRIGGER {table}_fts_ai AFTER INSERT ON {table} BEGIN {insert} END')
+        op.execute(f'CREATE TRIGGER {table}_fts_ad AFTER DELETE ON {table} BEGIN {delete} END')
+        op.execute(f'CREATE TRIGGER {table}_fts_au AFTER UPDATE OF {names} ON {table} BEGIN {delete} {insert} END')
+        op.execute(f"INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        document = " || ' ' || ".join(f"coalesce({table}.{c}, '')" for c in columns)
+        op.execute(f"CREATE INDEX ix_{table}_search ON {table} USING gin (to_tsvector('simple', {document}))")
+
+
+def _drop_search(dialect, table):
+    if dialect == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}')
+        op.execute(f'DROP TABLE IF EXISTS {table}_fts')
+    elif dialect == 'postgresql':
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_search')
+
+
+def upgrade():
+    # Índices para los filtros ?account_id= y ?category= de los listados (ordenados por fecha)
+    with op.batch_alter_table('incomes', schema=None) as batch_op:
+        batch_op.create_index('ix_incomes_user_id_account_id_income_date', ['user_id', 'account_id', 'income_date'], unique=False)
+        batch_op.create_index('ix_incomes_user_id_category_income_date', ['user_id', 'category', 'income_date'], unique=False)
+
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.create_index('ix_services_user_id_category_date', ['user_id', 'category', 'date'], unique=False)
+
+    # Búsqueda de texto: FTS5 en SQLite, GIN sobre tsvector en PostgreSQL
+    dialect = op.get_bind().dialect.name
+    for table, columns in SEARCH_COLUMNS.items():
+        _create_search(dialect, table, columns)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for table in SEARCH_COLUMNS:
+        _drop_search(dialect, table)
+
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_index('ix_services_user_id_category_date')
+
+    with op.batch_alter_table('incomes', schema=None) as batch_op:
+        batch_op.drop_index('ix_incomes_user_id_category_income_date')
+        batch_op.drop_index('ix_incomes_user_id_account_id_income_date')
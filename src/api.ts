@@ -35,6 +35,21 @@ async function request(endpoint: string, options: RequestInit = {}) {
   return res.json();
 }
 
+// Filtros de los listados (se aplican en el servidor); sort: 'campo' o '-campo'
+export type ListFilters = {
+  account_id?: number; category?: string; from?: string; to?: string;
+  min_amount?: number; max_amount?: number; sort?: string; q?: string;
+};
+
+function withFilters(endpoint: string, filters?: ListFilters) {
+  const params = new URLSearchParams();
+  Object.entries(filters || {}).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') params.append(key, String(value));
+  });
+  const query = params.toString();
+  return query ? `${endpoint}?${query}` : endpoint;
+}
+
 type AccountPayload = { account_name: string; card: string; balance: number };
 type IncomePayload = { income_name: string; income_date: string; description: string; category: string; amount: number; account_id: number };
 type ServicePayload = { service_name: string; description: string; date: string; category: string; price: number; remaining_price: number; account_id: number; expiration_date: string };
@@ -60,9 +75,12 @@ export const api = {
   async me() {
     return request('/auth/me');
   },
+  async logout() {
+    return request('/auth/logout', { method: 'POST' });
+  },
   
   // --- Accounts ---
-  async getAccounts() { return request('/accounts/'); },
+  async getAccounts(filters?: ListFilters) { return request(withFilters('/accounts/', filters)); },
   async createAccount(account: AccountPayload) {
     return request('/accounts/', { method: 'POST', body: JSON.stringify(account) });
   },
@@ -74,7 +92,7 @@ export const api = {
   },
 
   // --- Incomes ---
-  async getIncomes() { return request('/incomes/'); },
+  async getIncomes(filters?: ListFilters) { return request(withFilters('/incomes/', filters)); },
   async createIncome(income: IncomePayload) {
     return request('/incomes/', { method: 'POST', body: JSON.stringify(income) });
   },
@@ -86,7 +104,7 @@ export const api = {
   },
   
   // --- Services ---
-  async getServices() { return request('/services/'); },
+  async getServices(filters?: ListFilters) { return request(withFilters('/services/', filters)); },
   async createService(service: ServicePayload) {
     return request('/services/', { method: 'POST', body: JSON.stringify(service) });
   },
@@ -98,7 +116,7 @@ export const api = {
   },
 
   // --- Loans ---
-  async getLoans() { return request('/loans/'); },
+  async getLoans(filters?: ListFilters) { return request(withFilters('/loans/', filters)); },
   async createLoan(loan: LoanPayload) {
     return request('/loans/', { method: 'POST', body: JSON.stringify(loan) });
   },
@@ -110,7 +128,7 @@ export const api = {
   },
   
   // --- Loan Payments ---
-  async getLoanPayments() { return request('/loan_payments/'); },
+  async getLoanPayments(filters?: ListFilters) { return request(withFilters('/loan_payments/', filters)); },
   async createLoanPayment(payment: PaymentPayload & { loan_id: number }) {
     return request('/loan_payments/', { method: 'POST', body: JSON.stringify(payment) });
   },
@@ -122,7 +140,7 @@ export const api = {
   },
 
   // --- Service Payments ---
-  async getServicePayments() { return request('/service_payments/'); },
+  async getServicePayments(filters?: ListFilters) { return request(withFilters('/service_payments/', filters)); },
   async createServicePayment(payment: PaymentPayload & { service_id: number }) {
     return request('/service_payments/', { method: 'POST', body: JSON.stringify(payment) });
   },
@@ -134,7 +152,7 @@ export const api = {
   },
 
   // --- Scheduled Incomes ---
-  async getScheduledIncomes() { return request('/scheduled_incomes/'); },
+  async getScheduledIncomes(filters?: ListFilters) { return request(withFilters('/scheduled_incomes/', filters)); },
   async createScheduledIncome(income: ScheduledIncomePayload) {
     return request('/scheduled_incomes/', { method: 'POST', body: JSON.stringify(income) });
   },
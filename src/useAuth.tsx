@@ -72,6 +72,8 @@ export const AuthProvider: React.FC<{ children: React.ReactNode }> = ({ children
   };
 
   const logout = () => {
+    // Revoca el token en el backend; la sesión local se cierra aunque la petición falle
+    api.logout().catch(() => {});
     removeToken();
     setUser(null);
     setToken(null);